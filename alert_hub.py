@@ -0,0 +1,280 @@
+"""
+In-process publish/subscribe hub for outbreak alert changes.
+
+Published events go into a bounded ring buffer under one shared Condition.
+A subscriber holds nothing but the id of the last event it has seen: it
+waits on the Condition, then reads whatever is newer from the buffer, so an
+idle connection costs one waiting thread (or greenlet under gevent) and no
+per-subscriber queue. Clients resume with Last-Event-ID; if the events they
+missed have already left the buffer, or the id comes from another process
+or an earlier run, they receive a single 'reset' event and should refetch.
+
+Each process has its own hub. AlertEventRelay carries events between
+processes through a database table, so subscribers of every worker see the
+changes committed by any of them; event ids stay per process, and a client
+that reconnects to another worker gets a 'reset'. Under a threaded server
+each open stream also holds a request thread, so max_subscribers caps them
+per process and leaves threads for ordinary requests.
+"""
+
+import json
+import os
+import threading
+import time
+from collections import deque
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete, func, insert, select
+
+
+class SubscriberLimitReached(Exception):
+    """Raised when the hub already has max_subscribers open streams."""
+
+    def __init__(self, retry_after):
+        super().__init__(f"Too many alert streams open, retry after {retry_after}s")
+        self.retry_after = retry_after
+
+
+class Subscription:
+    """Iterator over one subscriber's events; close() gives its slot back."""
+
+    def __init__(self, hub, events):
+        self._hub = hub
+        self._events = events
+        self._closed = False
+
+    def __iter__(self):
+        return self._events
+
+    def close(self):
+        """Release the subscriber slot (safe to call more than once)."""
+        with self._hub._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._hub.subscribers -= 1
+        self._events.close()
+
+
+class AlertHub:
+    """Ring-buffered event hub with cursor-based subscribers."""
+
+    def __init__(self, buffer_size=1000, max_subscribers=None):
+        self.max_subscribers = max_subscribers
+        self._events = deque(maxlen=buffer_size)
+        self._cond = threading.Condition()
+        self._seq = 0
+        self._pid = None
+        self.epoch = None
+        self.published = 0
+        self.subscribers = 0
+
+    def _check_process(self):
+        # Call with the Condition held. Set lazily and per process: the app is
+        # preloaded in the gunicorn master, so forked workers would otherwise share
+        # one epoch and accept each other's event ids
+        if self._pid != os.getpid():
+            self._pid = os.getpid()
+            # Distinguishes ids from other processes and earlier runs
+            self.epoch = f"{self._pid:x}{int(time.time()):x}"
+            # Events inherited from the parent were never sent from this process
+            self._events.clear()
+
+    def _format_id(self, seq):
+        return f"{self.epoch}-{seq}"
+
+    def parse_id(self, event_id):
+        """Sequence number of an event id from this hub, or None."""
+        with self._cond:
+            self._check_process()
+        epoch, _, seq = (event_id or '').partition('-')
+        if epoch != self.epoch or not seq.isdigit():
+            return None
+        return int(seq)
+
+    def publish(self, event_type, data, region=None):
+        """Record an event and wake every subscriber; returns its id."""
+        with self._cond:
+            self._check_process()
+            self._seq += 1
+            self._events.append((self._seq, event_type, data, region))
+            self.published += 1
+            self._cond.notify_all()
+            return self._format_id(self._seq)
+
+    def _since(self, seq, regions):
+        if self._events and seq < self._events[0][0] - 1:
+            return None
+        return [
+            (self._format_id(s), event_type, data)
+            for s, event_type, data, region in self._events
+            if s > seq and (regions is None or region is None or region in regions)
+        ]
+
+    def subscribe(self, last_event_id=None, regions=None, heartbeat=15, max_seconds=None):
+        """Register a subscriber and return its Subscription.
+
+        Iterating it yields (event_id, event_type, data) tuples, or None as a
+        heartbeat. regions limits delivery to events published for those
+        regions (events without a region always pass). Iteration ends after
+        max_seconds; EventSource clients reconnect with Last-Event-ID. The
+        caller must close() the subscription when the connection ends.
+        Raises SubscriberLimitReached when max_subscribers streams are open.
+        """
+        reset = False
+        with self._cond:
+            self._check_process()
+            if self.max_subscribers and self.subscribers >= self.max_subscribers:
+                raise SubscriberLimitReached(max(1, int(heartbeat)))
+            seq = self._seq
+            if last_event_id:
+                resumed = self.parse_id(last_event_id)
+                if resumed is not None and resumed <= self._seq and self._since(resumed, regions) is not None:
+                    seq = resumed
+                else:
+                    reset = True
+            self.subscribers += 1
+
+        deadline = time.monotonic() + max_seconds if max_seconds else None
+        return Subscription(self, self._listen(seq, reset, regions, heartbeat, deadline))
+
+    def _listen(self, seq, reset, regions, heartbeat, deadline):
+        if reset:
+            yield (self._format_id(seq), 'reset', {'reason': 'missed events are no longer available'})
+        while True:
+            with self._cond:
+                if self._seq == seq:
+                    timeout = heartbeat
+                    if deadline is not None:
+                        timeout = min(timeout, max(deadline - time.monotonic(), 0))
+                    self._cond.wait(timeout)
+                events = self._since(seq, regions)
+                latest = self._seq
+
+            if events is None:
+                # Fell behind by more than the buffer holds
+                yield (self._format_id(latest), 'reset', {'reason': 'subscriber fell behind'})
+                events = []
+            seq = latest
+            if events:
+                for event in events:
+                    yield event
+            elif deadline is None or time.monotonic() < deadline:
+                yield None
+            if deadline is not None and time.monotonic() >= deadline:
+                return
+
+    def stats(self):
+        with self._cond:
+            self._check_process()
+            return {
+                'epoch': self.epoch,
+                'subscribers': self.subscribers,
+                'max_subscribers': self.max_subscribers,
+                'published': self.published,
+                'buffered': len(self._events),
+                'buffer_size': self._events.maxlen,
+                'last_event_id': self._format_id(self._seq) if self._seq else None,
+            }
+
+
+class AlertEventRelay:
+    """Delivers alert events committed by any worker process to this process's hub.
+
+    Writers record() events on the connection of the transaction that changes
+    the alerts, so they are only seen once it commits. Each process runs one
+    polling thread, started on first use, that publishes the rows it has not
+    seen yet to its hub. Ids can commit out of order when several transactions
+    insert at once, so the last `lookback` ids are checked again on every poll.
+
+    The table needs the columns id (increasing, never reused), event_type,
+    data (JSON text), region and created_at. get_engine is called for each
+    poll; rows older than retention seconds are deleted.
+    """
+
+    def __init__(self, hub, table, get_engine, poll_interval=1.0, retention=3600, lookback=100):
+        self.hub = hub
+        self.table = table
+        self.get_engine = get_engine
+        self.poll_interval = poll_interval
+        self.retention = retention
+        self.lookback = lookback
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._pid = None
+        self._last_id = 0
+        self._seen = set()
+        self._last_purge = 0.0
+        self.relayed = 0
+        self.errors = 0
+
+    def record(self, connection, events):
+        """Insert (event_type, data, region) events in the caller's transaction."""
+        now = datetime.utcnow()
+        connection.execute(insert(self.table), [
+            {'event_type': event_type, 'data': json.dumps(data), 'region': region, 'created_at': now}
+            for event_type, data, region in events
+        ])
+
+    def wake(self):
+        """Poll now rather than at the next interval (after a commit in this process)."""
+        self._wake.set()
+
+    def start(self):
+        """Start this process's polling thread unless it is already running."""
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            # Relay only what is committed from now on
+            with self.get_engine().connect() as connection:
+                self._last_id = connection.execute(select(func.max(self.table.c.id))).scalar() or 0
+                self._seen = set(connection.execute(
+                    select(self.table.c.id).where(self.table.c.id > self._last_id - self.lookback)
+                ).scalars())
+            self._pid = os.getpid()
+            threading.Thread(target=self._run, name='alert-relay', daemon=True).start()
+
+    def _run(self):
+        while True:
+            self._wake.wait(self.poll_interval)
+            self._wake.clear()
+            try:
+                self.poll()
+            except Exception as e:
+                self.errors += 1
+                print(f"⚠️ Alert relay poll failed: {e}")
+
+    def poll(self):
+        """Publish the events committed since the last poll; returns how many."""
+        floor = max(self._last_id - self.lookback, 0)
+        with self.get_engine().begin() as connection:
+            ids = connection.execute(select(self.table.c.id).where(self.table.c.id > floor)).scalars()
+            new_ids = set(ids) - self._seen
+            rows = []
+            if new_ids:
+                rows = connection.execute(
+                    select(self.table).where(self.table.c.id.in_(new_ids)).order_by(self.table.c.id)
+                ).all()
+            if time.monotonic() - self._last_purge > 60:
+                self._last_purge = time.monotonic()
+                connection.execute(delete(self.table).where(
+                    self.table.c.created_at < datetime.utcnow() - timedelta(seconds=self.retention)
+                ))
+
+        for row in rows:
+            self.hub.publish(row.event_type, json.loads(row.data), row.region)
+        self._seen |= new_ids
+        if new_ids:
+            self._last_id = max(self._last_id, max(new_ids))
+        self._seen = {event_id for event_id in self._seen if event_id > self._last_id - self.lookback}
+        self.relayed += len(rows)
+        return len(rows)
+
+    def stats(self):
+        return {
+            'running': self._pid == os.getpid(),
+            'last_id': self._last_id,
+            'relayed': self.relayed,
+            'errors': self.errors,
+            'poll_interval': self.poll_interval,
+        }
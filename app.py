@@ -1,51 +1,165 @@
-from flask import Flask, request, jsonify
+from flask import (
+    Flask, Blueprint, Response, current_app, request, jsonify, send_file, stream_with_context
+)
+from flask.config import Config
 from flask_cors import CORS
 from flask_sqlalchemy import SQLAlchemy
-from flask_migrate import Migrate
-from flask_jwt_extended import JWTManager, create_access_token, jwt_required, get_jwt_identity
-from flask_bcrypt import Bcrypt
+from flask_jwt_extended import (
+    JWTManager, create_access_token, jwt_required, get_jwt_identity, verify_jwt_in_request,
+    current_user
+)
+from sqlalchemy import event, inspect, or_
+from sqlalchemy.orm import Session
 from werkzeug.utils import secure_filename
 import os
-import pandas as pd
 import json
+import math
+import functools
 from datetime import datetime, timedelta
-import google.generativeai as genai
 from dotenv import load_dotenv
-import sqlite3
-import xlsxwriter
-from io import BytesIO
-import base64
+import threading
+import time
+from collections import namedtuple
+from symptom_engine import SymptomIndex, build_catalog, symptom_names
+from retrieval import DiseaseRetriever
+from caching import TTLCache, ResponseCache, normalize_message
+from bounded_executor import BoundedExecutor, ExecutorSaturated
+from background_jobs import DatabaseJobStore
+from circuit_breaker import CircuitBreaker
+from llm_backends import create_llm_backend
+from write_behind import WriteBehindQueue
+from password_hashing import hash_password, check_password, needs_rehash
+from exports import (
+    EXPORT_FORMATS, generate_csv, generate_ndjson, build_xlsx_tempfile, iter_file, remove_file,
+    write_export_file, artifact_path, cleanup_artifacts
+)
+from serializers import (
+    JSON_MIMETYPE, DISEASE_FIELDS, VACCINATION_FIELDS, ALERT_FIELDS, PROFILE_FIELDS,
+    LOGIN_USER_FIELDS, dumps, columns, rows_to_dicts
+)
+from search import DiseaseSearch
+from regions import (
+    NATIONWIDE_REGION, SEVERITY_LEVELS, alias_rows, location_candidates, severities_at_least
+)
+from alert_hub import AlertHub, AlertEventRelay, SubscriberLimitReached
+from db_config import (
+    ReplicaRoutingSession, apply_database_config, install_sqlite_pragmas, reads_from_replica,
+    database_stats
+)
+from seeding import (
+    SeedError, SeedSpec, detect_format, iter_file_records, iter_records, load_records, sync_records,
+    text_stream
+)
+from pagination import InvalidQuery, encode_cursor, decode_cursor, parse_limit, parse_fields
+import concurrent.futures
 
 # Load environment variables
 load_dotenv()
 
-app = Flask(__name__)
-app.config['SECRET_KEY'] = os.getenv('JWT_SECRET_KEY', 'dev-secret-key')
-app.config['SQLALCHEMY_DATABASE_URI'] = os.getenv('DATABASE_URL', 'sqlite:///health_chatbot.db')
-app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
-app.config['JWT_SECRET_KEY'] = os.getenv('JWT_SECRET_KEY', 'dev-secret-key')
-app.config['JWT_ACCESS_TOKEN_EXPIRES'] = timedelta(hours=1)
-app.config['MAX_CONTENT_LENGTH'] = int(os.getenv('MAX_CONTENT_LENGTH', 16777216))
-app.config['UPLOAD_FOLDER'] = os.getenv('UPLOAD_FOLDER', 'uploads')
-
-# Initialize extensions
-db = SQLAlchemy(app)
-migrate = Migrate(app, db)
-jwt = JWTManager(app)
-bcrypt = Bcrypt(app)
-CORS(app)
-
-# Configure Gemini AI
-try:
-    genai.configure(api_key=os.getenv('GEMINI_API_KEY'))
-    model = genai.GenerativeModel('gemini-1.5-flash')
-    print("✅ Gemini AI configured successfully")
-except Exception as e:
-    print(f"❌ Error configuring Gemini AI: {e}")
-    model = None
-
-# Create upload directory
-os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
+# Settings from the environment; create_app() copies them into the Flask app
+config = Config(os.path.dirname(os.path.abspath(__file__)))
+config['SECRET_KEY'] = os.getenv('JWT_SECRET_KEY', 'dev-secret-key')
+config['SQLALCHEMY_DATABASE_URI'] = os.getenv('DATABASE_URL', 'sqlite:///health_chatbot.db')
+config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+config['DATABASE_REPLICA_URL'] = os.getenv('DATABASE_REPLICA_URL')
+config['DB_POOL_SIZE'] = int(os.getenv('DB_POOL_SIZE', 10))
+config['DB_MAX_OVERFLOW'] = int(os.getenv('DB_MAX_OVERFLOW', 20))
+config['DB_POOL_TIMEOUT'] = float(os.getenv('DB_POOL_TIMEOUT', 10))
+config['DB_POOL_RECYCLE'] = int(os.getenv('DB_POOL_RECYCLE', 1800))
+config['DB_POOL_PRE_PING'] = os.getenv('DB_POOL_PRE_PING', 'true').lower() == 'true'
+config['SQLITE_JOURNAL_MODE'] = os.getenv('SQLITE_JOURNAL_MODE', 'wal')
+config['SQLITE_SYNCHRONOUS'] = os.getenv('SQLITE_SYNCHRONOUS', 'normal')
+config['SQLITE_BUSY_TIMEOUT_MS'] = int(os.getenv('SQLITE_BUSY_TIMEOUT_MS', 5000))
+config['SQLITE_MMAP_SIZE'] = int(os.getenv('SQLITE_MMAP_SIZE', 256 * 1024 * 1024))
+config['SQLITE_CACHE_SIZE'] = int(os.getenv('SQLITE_CACHE_SIZE', -16000))
+config['JWT_SECRET_KEY'] = os.getenv('JWT_SECRET_KEY', 'dev-secret-key')
+config['JWT_ACCESS_TOKEN_EXPIRES'] = timedelta(hours=1)
+# Accounts allowed to use the admin write endpoints (comma-separated emails)
+config['ADMIN_EMAILS'] = {email.strip().lower() for email in os.getenv('ADMIN_EMAILS', '').split(',') if email.strip()}
+config['MAX_CONTENT_LENGTH'] = int(os.getenv('MAX_CONTENT_LENGTH', 16777216))
+config['UPLOAD_FOLDER'] = os.getenv('UPLOAD_FOLDER', 'uploads')
+config['SYMPTOM_DIRECT_MIN_MATCHES'] = int(os.getenv('SYMPTOM_DIRECT_MIN_MATCHES', 2))
+config['PROMPT_TOP_K'] = int(os.getenv('PROMPT_TOP_K', 4))
+config['PROMPT_MAX_CHARS'] = int(os.getenv('PROMPT_MAX_CHARS', 6000))
+config['CHAT_CACHE_SIZE'] = int(os.getenv('CHAT_CACHE_SIZE', 1024))
+config['CHAT_CACHE_TTL'] = int(os.getenv('CHAT_CACHE_TTL', 3600))
+config['USER_CACHE_SIZE'] = int(os.getenv('USER_CACHE_SIZE', 4096))
+config['USER_CACHE_TTL'] = int(os.getenv('USER_CACHE_TTL', 60))
+config['REFERENCE_CACHE_SIZE'] = int(os.getenv('REFERENCE_CACHE_SIZE', 256))
+config['REFERENCE_CACHE_TTL'] = int(os.getenv('REFERENCE_CACHE_TTL', 60))
+config['LLM_MAX_CONCURRENCY'] = int(os.getenv('LLM_MAX_CONCURRENCY', 8))
+config['LLM_MAX_QUEUE'] = int(os.getenv('LLM_MAX_QUEUE', 16))
+config['LLM_TIMEOUT'] = float(os.getenv('LLM_TIMEOUT', 30))
+config['CHAT_JOB_TTL'] = int(os.getenv('CHAT_JOB_TTL', 600))
+config['CHAT_JOB_TIMEOUT'] = int(os.getenv('CHAT_JOB_TIMEOUT', 120))
+config['LLM_LATENCY_BUDGET'] = float(os.getenv('LLM_LATENCY_BUDGET', 0))
+config['LLM_BREAKER_WINDOW'] = int(os.getenv('LLM_BREAKER_WINDOW', 60))
+config['LLM_BREAKER_MIN_CALLS'] = int(os.getenv('LLM_BREAKER_MIN_CALLS', 5))
+config['LLM_BREAKER_FAILURE_RATE'] = float(os.getenv('LLM_BREAKER_FAILURE_RATE', 0.5))
+config['LLM_BREAKER_SLOW_CALL'] = float(os.getenv('LLM_BREAKER_SLOW_CALL', 10))
+config['LLM_BREAKER_OPEN_SECONDS'] = int(os.getenv('LLM_BREAKER_OPEN_SECONDS', 30))
+config['LLM_BACKEND'] = os.getenv('LLM_BACKEND', 'gemini')
+config['GEMINI_API_KEY'] = os.getenv('GEMINI_API_KEY')
+config['GEMINI_MODEL'] = os.getenv('GEMINI_MODEL', 'gemini-1.5-flash')
+config['LLM_HTTP_URL'] = os.getenv('LLM_HTTP_URL', 'http://127.0.0.1:8085/')
+config['LLM_STUB_LATENCY_MS'] = float(os.getenv('LLM_STUB_LATENCY_MS', 800))
+config['LLM_STUB_LATENCY_SIGMA'] = float(os.getenv('LLM_STUB_LATENCY_SIGMA', 0.5))
+config['LLM_STUB_TOKENS_PER_SECOND'] = float(os.getenv('LLM_STUB_TOKENS_PER_SECOND', 50))
+config['LLM_STUB_RESPONSE_TOKENS'] = int(os.getenv('LLM_STUB_RESPONSE_TOKENS', 120))
+config['LLM_STUB_ERROR_RATE'] = float(os.getenv('LLM_STUB_ERROR_RATE', 0))
+config['LLM_STUB_SEED'] = int(os.getenv('LLM_STUB_SEED', 0))
+config['CHAT_WRITE_BEHIND'] = os.getenv('CHAT_WRITE_BEHIND', 'false').lower() == 'true'
+config['CHAT_WRITE_BATCH_SIZE'] = int(os.getenv('CHAT_WRITE_BATCH_SIZE', 100))
+config['CHAT_WRITE_FLUSH_INTERVAL'] = float(os.getenv('CHAT_WRITE_FLUSH_INTERVAL', 0.5))
+config['CHAT_WRITE_MAX_PENDING'] = int(os.getenv('CHAT_WRITE_MAX_PENDING', 10000))
+config['EXPORT_CHUNK_ROWS'] = int(os.getenv('EXPORT_CHUNK_ROWS', 1000))
+config['EXPORT_WORKERS'] = int(os.getenv('EXPORT_WORKERS', 2))
+config['EXPORT_MAX_QUEUE'] = int(os.getenv('EXPORT_MAX_QUEUE', 20))
+config['EXPORT_ARTIFACT_MAX_AGE'] = int(os.getenv('EXPORT_ARTIFACT_MAX_AGE', 86400))
+config['EXPORT_ARTIFACT_MAX_BYTES'] = int(os.getenv('EXPORT_ARTIFACT_MAX_BYTES', 500 * 1024 * 1024))
+config['EXPORT_JOB_TIMEOUT'] = int(os.getenv('EXPORT_JOB_TIMEOUT', 1800))
+config['BCRYPT_LOG_ROUNDS'] = int(os.getenv('BCRYPT_LOG_ROUNDS', 12))
+# Per process: every gunicorn worker has its own pool, so keep this small
+config['PASSWORD_HASH_WORKERS'] = int(os.getenv('PASSWORD_HASH_WORKERS', 1))
+config['PASSWORD_HASH_MAX_QUEUE'] = int(os.getenv('PASSWORD_HASH_MAX_QUEUE', 64))
+config['PASSWORD_HASH_TIMEOUT'] = float(os.getenv('PASSWORD_HASH_TIMEOUT', 10))
+config['ALERT_STREAM_BUFFER'] = int(os.getenv('ALERT_STREAM_BUFFER', 1000))
+config['ALERT_STREAM_HEARTBEAT'] = float(os.getenv('ALERT_STREAM_HEARTBEAT', 15))
+config['ALERT_STREAM_MAX_SECONDS'] = float(os.getenv('ALERT_STREAM_MAX_SECONDS', 300))
+# Open streams per worker process; `run.py serve` defaults it from the worker class
+config['ALERT_STREAM_MAX_SUBSCRIBERS'] = int(os.getenv('ALERT_STREAM_MAX_SUBSCRIBERS', 16))
+config['ALERT_EVENT_POLL_INTERVAL'] = float(os.getenv('ALERT_EVENT_POLL_INTERVAL', 1))
+config['ALERT_EVENT_RETENTION'] = int(os.getenv('ALERT_EVENT_RETENTION', 3600))
+config['SEED_BATCH_SIZE'] = int(os.getenv('SEED_BATCH_SIZE', 1000))
+
+# Extensions, bound to the app in create_app()
+db = SQLAlchemy(session_options={'class_': ReplicaRoutingSession})
+jwt = JWTManager()
+
+# All HTTP routes
+api = Blueprint('api', __name__)
+
+# LLM backend (Gemini unless LLM_BACKEND says otherwise), configured per app on first
+# use: the Gemini SDK takes most of the import time and grpc must not be set up before fork
+llm_backend_lock = threading.Lock()
+
+def get_llm_backend():
+    """Return the current app's LLM backend, or None if it could not be configured."""
+    extensions = current_app.extensions
+    if 'llm_backend' not in extensions:
+        with llm_backend_lock:
+            if 'llm_backend' not in extensions:
+                extensions['llm_backend'] = create_llm_backend(current_app.config)
+    return extensions['llm_backend']
+
+# Full-text disease search; the index is created on first use
+disease_search = DiseaseSearch()
+
+# Caches, worker pools, breaker, alert hub and job stores are shared by the whole
+# process; init_services() sizes them from the settings of the app being created
+chat_cache = user_cache = reference_cache = None
+llm_executor = llm_breaker = export_executor = password_executor = None
+alert_hub = alert_relay = chat_jobs = export_jobs = chat_writer = None
 
 # Database Models
 class User(db.Model):
@@ -70,15 +184,33 @@ class ChatHistory(db.Model):
     timestamp = db.Column(db.DateTime, default=datetime.utcnow)
     language = db.Column(db.String(10), default='en')
 
+    __table_args__ = (
+        db.Index('ix_chat_history_user_timestamp', 'user_id', 'timestamp'),
+    )
+
 class Disease(db.Model):
     id = db.Column(db.Integer, primary_key=True)
-    name = db.Column(db.String(200), nullable=False)
+    # Indexed: seeding looks diseases up by name (their natural key)
+    name = db.Column(db.String(200), nullable=False, index=True)
     symptoms = db.Column(db.Text, nullable=False)
     prevention = db.Column(db.Text, nullable=False)
     treatment = db.Column(db.Text)
     severity = db.Column(db.String(20))
     category = db.Column(db.String(50))
 
+# Normalized symptoms; Disease.symptoms keeps the display text
+disease_symptom = db.Table(
+    'disease_symptom',
+    db.Column('disease_id', db.Integer, db.ForeignKey('disease.id', ondelete='CASCADE'), primary_key=True),
+    db.Column('symptom_id', db.Integer, db.ForeignKey('symptom.id', ondelete='CASCADE'), primary_key=True),
+    # The primary key serves disease -> symptoms; this serves symptom -> diseases
+    db.Index('ix_disease_symptom_symptom', 'symptom_id', 'disease_id')
+)
+
+class Symptom(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(200), nullable=False, unique=True, index=True)
+
 class VaccinationSchedule(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     age_group = db.Column(db.String(50), nullable=False)
@@ -87,6 +219,11 @@ class VaccinationSchedule(db.Model):
     is_mandatory = db.Column(db.Boolean, default=False)
     country = db.Column(db.String(50), default='India')
 
+    __table_args__ = (
+        # Natural key used by seeding
+        db.Index('ix_vaccination_schedule_key', 'age_group', 'vaccine_name', 'country'),
+    )
+
 class OutbreakAlert(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     disease_name = db.Column(db.String(100), nullable=False)
@@ -95,160 +232,634 @@ class OutbreakAlert(db.Model):
     description = db.Column(db.Text)
     alert_date = db.Column(db.DateTime, default=datetime.utcnow)
     is_active = db.Column(db.Boolean, default=True)
+    # Normalized region of location, set on save (see resolve_region)
+    region_key = db.Column(db.String(100))
+
+    __table_args__ = (
+        db.Index('ix_outbreak_alert_active_region_date', 'is_active', 'region_key', 'alert_date'),
+        db.Index('ix_outbreak_alert_active_date', 'is_active', 'alert_date'),
+        db.Index('ix_outbreak_alert_location', 'location'),
+        # Natural key used by seeding
+        db.Index('ix_outbreak_alert_disease_location', 'disease_name', 'location'),
+    )
+
+class BackgroundJob(db.Model):
+    """Async job state, shared by all worker processes (see DatabaseJobStore)."""
+    id = db.Column(db.String(32), primary_key=True)
+    owner = db.Column(db.Integer, nullable=False)
+    kind = db.Column(db.String(20), nullable=False)
+    status = db.Column(db.String(20), nullable=False)
+    meta = db.Column(db.Text)
+    result = db.Column(db.Text)
+    error = db.Column(db.Text)
+    created_at = db.Column(db.DateTime, nullable=False)
+    finished_at = db.Column(db.DateTime)
+
+    __table_args__ = (
+        # Each store purges and counts only its own kind of job
+        db.Index('ix_background_job_kind_finished', 'kind', 'finished_at'),
+    )
+
+class AlertEvent(db.Model):
+    """Committed alert changes, relayed to the alert streams of every worker (see AlertEventRelay)."""
+    id = db.Column(db.Integer, primary_key=True)
+    event_type = db.Column(db.String(30), nullable=False)
+    data = db.Column(db.Text, nullable=False)
+    region = db.Column(db.String(100))
+    created_at = db.Column(db.DateTime, nullable=False, index=True)
+
+    # Pollers track the last id they saw, so SQLite must not reuse ids
+    __table_args__ = {'sqlite_autoincrement': True}
+
+class Region(db.Model):
+    """Alias (city, state, abbreviation) -> region key lookup."""
+    id = db.Column(db.Integer, primary_key=True)
+    alias = db.Column(db.String(100), nullable=False, unique=True, index=True)
+    region_key = db.Column(db.String(100), nullable=False, index=True)
+
+def resolve_region(connection, location):
+    """Region key for a free-text location; unknown places keep their own name."""
+    candidates = location_candidates(location)
+    if not candidates:
+        return None
+    found = dict(connection.execute(
+        db.select(Region.alias, Region.region_key).where(Region.alias.in_(candidates))
+    ).all())
+    for candidate in candidates:
+        if candidate in found:
+            return found[candidate]
+    return candidates[0]
+
+@event.listens_for(OutbreakAlert, 'before_insert')
+@event.listens_for(OutbreakAlert, 'before_update')
+def set_alert_region(mapper, connection, target):
+    if target.region_key is None or inspect(target).attrs.location.history.has_changes():
+        target.region_key = resolve_region(connection, target.location)
+
+# Read-only copy of a user row, cached between requests
+UserSnapshot = namedtuple('UserSnapshot', PROFILE_FIELDS)
+
+@jwt.user_lookup_loader
+def load_current_user(jwt_header, jwt_data):
+    """Resolve the token's user from the user cache, reading the database on a miss."""
+    user_id = jwt_data['sub']
+    user = user_cache.get(user_id)
+    if user is None:
+        row = db.session.query(*columns(User, PROFILE_FIELDS)).filter(User.id == user_id).first()
+        if row is None:
+            return None
+        user = UserSnapshot(*row)
+        user_cache.set(user_id, user)
+    return user
+
+@jwt.user_lookup_error_loader
+def current_user_not_found(jwt_header, jwt_data):
+    return jsonify({'error': 'User not found'}), 404
+
+def admin_required(view):
+    """Require a logged-in user whose email is listed in ADMIN_EMAILS."""
+    @functools.wraps(view)
+    @jwt_required()
+    def wrapper(*args, **kwargs):
+        if (current_user.email or '').lower() not in current_app.config['ADMIN_EMAILS']:
+            return jsonify({'error': 'Admin access required'}), 403
+        return view(*args, **kwargs)
+    return wrapper
+
+# Reference-data cache namespaces invalidated when each model changes
+REFERENCE_CACHE_NAMESPACES = {
+    Disease: 'diseases',
+    Symptom: 'diseases',
+    VaccinationSchedule: 'vaccination',
+    OutbreakAlert: 'alerts',
+}
+
+@event.listens_for(Session, 'before_flush')
+def track_reference_changes(session, flush_context, instances):
+    changed = session.info.setdefault('reference_changes', set())
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        namespace = REFERENCE_CACHE_NAMESPACES.get(type(obj))
+        if namespace:
+            changed.add(namespace)
+
+@event.listens_for(Session, 'do_orm_execute')
+def track_reference_bulk_changes(orm_execute_state):
+    # Query.delete() / update() bypass the flush
+    if orm_execute_state.is_delete or orm_execute_state.is_update:
+        mapper = orm_execute_state.bind_mapper
+        namespace = REFERENCE_CACHE_NAMESPACES.get(mapper.class_) if mapper else None
+        if namespace:
+            orm_execute_state.session.info.setdefault('reference_changes', set()).add(namespace)
+
+@event.listens_for(Session, 'after_commit')
+def invalidate_reference_cache(session):
+    changed = session.info.pop('reference_changes', None)
+    if changed:
+        reference_cache.invalidate(*changed)
 
-# Comprehensive Disease-Symptom Dataset
-disease_data = {
-    "Common Cold": {
-        "symptoms": ["runny nose", "sneezing", "cough", "sore throat", "mild fever", "congestion"],
-        "prevention": ["wash hands frequently", "avoid close contact with sick people", "cover mouth when coughing", "avoid touching face"],
-        "treatment": "rest, fluids, over-the-counter medications, steam inhalation",
-        "severity": "mild",
-        "category": "respiratory"
-    },
-    "Flu (Influenza)": {
-        "symptoms": ["high fever", "body aches", "fatigue", "cough", "headache", "chills", "sore throat"],
-        "prevention": ["annual flu vaccination", "good hygiene", "avoid touching face", "stay home when sick"],
-        "treatment": "antiviral medications, rest, fluids, fever reducers",
-        "severity": "moderate",
-        "category": "respiratory"
-    },
-    "Diabetes": {
-        "symptoms": ["increased thirst", "frequent urination", "fatigue", "blurred vision", "slow healing wounds", "weight loss"],
-        "prevention": ["maintain healthy weight", "regular exercise", "balanced diet", "limit sugar intake"],
-        "treatment": "insulin therapy, medication, lifestyle changes, blood sugar monitoring",
-        "severity": "chronic",
-        "category": "metabolic"
-    },
-    "Thyroid Disorders": {
-        "symptoms": ["unexpected weight changes", "fatigue or excessive energy", "constipation or diarrhea", "dry skin", "brittle nails", "hair loss", "mood changes", "sensitivity to cold or heat", "neck swelling"],
-        "prevention": ["regular check-ups", "iodine-rich diet", "avoid excessive stress", "limit processed foods"],
-        "treatment": "hormone replacement therapy, medication, regular monitoring, dietary changes",
-        "severity": "chronic",
-        "category": "endocrine"
-    },
-    "Hypertension (High Blood Pressure)": {
-        "symptoms": ["often no symptoms", "headaches", "shortness of breath", "nosebleeds", "dizziness"],
-        "prevention": ["reduce salt intake", "regular exercise", "maintain healthy weight", "limit alcohol", "quit smoking"],
-        "treatment": "medication, lifestyle changes, regular monitoring",
-        "severity": "chronic",
-        "category": "cardiovascular"
-    },
-    "Malaria": {
-        "symptoms": ["high fever", "chills", "sweating", "headache", "nausea", "vomiting", "muscle pain"],
-        "prevention": ["use mosquito nets", "apply insect repellent", "eliminate standing water", "wear long sleeves"],
-        "treatment": "antimalarial medications, rest, fluids, hospital care if severe",
-        "severity": "moderate to severe",
-        "category": "infectious"
-    },
-    "Tuberculosis (TB)": {
-        "symptoms": ["persistent cough", "chest pain", "coughing up blood", "fatigue", "weight loss", "night sweats", "fever"],
-        "prevention": ["BCG vaccination", "good ventilation", "avoid close contact with infected persons", "cover mouth when coughing"],
-        "treatment": "antibiotic treatment for 6-9 months, rest, proper nutrition",
-        "severity": "moderate to severe",
-        "category": "infectious"
-    },
-    "Pneumonia": {
-        "symptoms": ["cough with phlegm", "fever", "chills", "shortness of breath", "chest pain", "fatigue"],
-        "prevention": ["pneumonia vaccination", "flu vaccination", "good hygiene", "avoid smoking", "proper nutrition"],
-        "treatment": "antibiotics, rest, fluids, oxygen therapy if needed",
-        "severity": "moderate to severe",
-        "category": "respiratory"
-    },
-    "Dengue Fever": {
-        "symptoms": ["high fever", "severe headache", "pain behind eyes", "muscle and joint pain", "rash", "nausea", "vomiting"],
-        "prevention": ["eliminate standing water", "use mosquito nets", "apply repellent", "wear protective clothing"],
-        "treatment": "rest, fluids, pain relievers (avoid aspirin), hospital care if severe",
-        "severity": "moderate to severe",
-        "category": "infectious"
-    },
-    "Chikungunya": {
-        "symptoms": ["fever", "severe joint pain", "muscle pain", "headache", "rash", "fatigue"],
-        "prevention": ["eliminate standing water", "use mosquito nets", "apply repellent", "wear long sleeves"],
-        "treatment": "rest, fluids, pain relievers, physical therapy for joint pain",
-        "severity": "moderate",
-        "category": "infectious"
-    },
-    "Jaundice": {
-        "symptoms": ["yellow skin and eyes", "dark urine", "pale stools", "fatigue", "abdominal pain", "nausea"],
-        "prevention": ["hepatitis vaccination", "avoid contaminated water", "good hygiene", "safe food handling"],
-        "treatment": "rest, fluids, avoid alcohol, treat underlying cause",
-        "severity": "moderate to severe",
-        "category": "hepatic"
-    },
-    "Anemia": {
-        "symptoms": ["fatigue", "weakness", "pale skin", "shortness of breath", "dizziness", "cold hands and feet"],
-        "prevention": ["iron-rich diet", "vitamin B12 and folate", "regular check-ups", "avoid blood loss"],
-        "treatment": "iron supplements, dietary changes, treat underlying cause",
-        "severity": "mild to moderate",
-        "category": "hematologic"
-    },
-    "Asthma": {
-        "symptoms": ["wheezing", "shortness of breath", "chest tightness", "coughing", "difficulty breathing"],
-        "prevention": ["avoid triggers", "use inhalers as prescribed", "avoid smoking", "manage stress"],
-        "treatment": "inhalers, medications, avoid triggers, emergency care if severe",
-        "severity": "chronic",
-        "category": "respiratory"
-    },
-    "Heart Disease": {
-        "symptoms": ["chest pain", "shortness of breath", "fatigue", "irregular heartbeat", "swelling in legs"],
-        "prevention": ["healthy diet", "regular exercise", "avoid smoking", "manage stress", "control blood pressure"],
-        "treatment": "medication, lifestyle changes, surgery if needed, cardiac rehabilitation",
-        "severity": "moderate to severe",
-        "category": "cardiovascular"
-    },
-    "Kidney Disease": {
-        "symptoms": ["fatigue", "swelling in legs", "changes in urination", "nausea", "loss of appetite", "muscle cramps"],
-        "prevention": ["control diabetes and blood pressure", "avoid excessive salt", "stay hydrated", "avoid NSAIDs"],
-        "treatment": "medication, dietary changes, dialysis if severe, kidney transplant",
-        "severity": "chronic",
-        "category": "renal"
-    },
-    "Arthritis": {
-        "symptoms": ["joint pain", "stiffness", "swelling", "reduced range of motion", "fatigue"],
-        "prevention": ["maintain healthy weight", "regular exercise", "protect joints", "avoid repetitive stress"],
-        "treatment": "pain relievers, physical therapy, exercise, joint protection",
-        "severity": "chronic",
-        "category": "musculoskeletal"
-    },
-    "Migraine": {
-        "symptoms": ["severe headache", "nausea", "vomiting", "sensitivity to light and sound", "visual disturbances"],
-        "prevention": ["identify triggers", "regular sleep", "stress management", "avoid certain foods"],
-        "treatment": "pain relievers, rest in dark room, preventive medications",
-        "severity": "moderate to severe",
-        "category": "neurological"
-    },
-    "Depression": {
-        "symptoms": ["persistent sadness", "loss of interest", "fatigue", "sleep problems", "appetite changes", "difficulty concentrating"],
-        "prevention": ["regular exercise", "social connections", "stress management", "healthy lifestyle"],
-        "treatment": "therapy, medication, lifestyle changes, support groups",
-        "severity": "moderate to severe",
-        "category": "mental health"
-    },
-    "Anxiety": {
-        "symptoms": ["excessive worry", "restlessness", "fatigue", "difficulty concentrating", "irritability", "sleep problems"],
-        "prevention": ["stress management", "regular exercise", "adequate sleep", "avoid caffeine"],
-        "treatment": "therapy, medication, relaxation techniques, lifestyle changes",
-        "severity": "mild to severe",
-        "category": "mental health"
-    },
-    "Skin Infections": {
-        "symptoms": ["redness", "swelling", "pain", "warmth", "pus", "fever"],
-        "prevention": ["good hygiene", "keep wounds clean", "avoid sharing personal items", "proper wound care"],
-        "treatment": "antibiotics, wound care, rest, elevation if on limbs",
-        "severity": "mild to moderate",
-        "category": "dermatological"
-    },
-    "Food Poisoning": {
-        "symptoms": ["nausea", "vomiting", "diarrhea", "stomach cramps", "fever", "dehydration"],
-        "prevention": ["proper food handling", "cook food thoroughly", "avoid contaminated water", "good hygiene"],
-        "treatment": "rest, fluids, oral rehydration, avoid solid foods initially",
-        "severity": "mild to moderate",
-        "category": "gastrointestinal"
+@event.listens_for(Session, 'after_rollback')
+def discard_reference_changes(session):
+    session.info.pop('reference_changes', None)
+
+def alert_to_dict(alert):
+    return {
+        'id': alert.id,
+        'disease_name': alert.disease_name,
+        'location': alert.location,
+        'severity': alert.severity,
+        'description': alert.description,
+        'alert_date': alert.alert_date.isoformat() if alert.alert_date else None,
+        'is_active': alert.is_active
     }
+
+@event.listens_for(Session, 'after_flush')
+def record_alert_events(session, flush_context):
+    # Written in the same transaction, so only committed changes are relayed
+    events = []
+    for obj in session.new:
+        if isinstance(obj, OutbreakAlert):
+            events.append(('alert.created', alert_to_dict(obj), obj.region_key))
+    for obj in session.dirty:
+        if isinstance(obj, OutbreakAlert) and session.is_modified(obj):
+            deactivated = inspect(obj).attrs.is_active.history.has_changes() and not obj.is_active
+            event_type = 'alert.deactivated' if deactivated else 'alert.updated'
+            events.append((event_type, alert_to_dict(obj), obj.region_key))
+    for obj in session.deleted:
+        if isinstance(obj, OutbreakAlert):
+            events.append(('alert.deleted', {'id': obj.id}, obj.region_key))
+    if events:
+        alert_relay.record(session.connection(), events)
+        session.info['alert_events'] = True
+
+@event.listens_for(Session, 'after_commit')
+def publish_alert_events(session):
+    # Deliver to this process's streams now; other workers pick it up on their next poll
+    if session.info.pop('alert_events', None):
+        alert_relay.wake()
+
+@event.listens_for(Session, 'after_rollback')
+def discard_alert_events(session):
+    session.info.pop('alert_events', None)
+
+# Seed files for a fresh database; larger catalogs are loaded with `python run.py seed`
+SEED_DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+SEED_FILES = {
+    'diseases': 'diseases.json',
+    'vaccinations': 'vaccination_schedules.json',
+    'alerts': 'outbreak_alerts.json',
 }
 
+def load_disease_data():
+    """Read the disease seed file into a name -> record dict."""
+    return {
+        record.pop('name'): record
+        for record in iter_file_records(os.path.join(SEED_DATA_DIR, SEED_FILES['diseases']))
+    }
+
+# Comprehensive Disease-Symptom Dataset (built into the symptom index; reloaded on reseed)
+disease_data = load_disease_data()
+
+# Catalog indexes (built on first use, rebuilt when the catalog is reseeded)
+symptom_index = None
+disease_retriever = None
+
+def refresh_catalog_indexes():
+    """Rebuild the symptom index and prompt retriever from disease_data and the Disease table."""
+    global symptom_index, disease_retriever
+    try:
+        rows = db.session.query(
+            Disease.name, Disease.symptoms, Disease.prevention,
+            Disease.treatment, Disease.severity, Disease.category
+        ).all()
+    except Exception as e:
+        print(f"⚠️ Catalog indexes built without Disease table: {e}")
+        db.session.rollback()
+        rows = []
+    catalog = build_catalog(disease_data, rows)
+    disease_retriever = DiseaseRetriever(catalog)
+    symptom_index = SymptomIndex(catalog)
+    return symptom_index
+
+def get_symptom_index():
+    """Return the current symptom index, building it if needed."""
+    if symptom_index is None:
+        refresh_catalog_indexes()
+    return symptom_index
+
+def get_disease_retriever():
+    """Return the current prompt retriever, building it if needed."""
+    if disease_retriever is None:
+        refresh_catalog_indexes()
+    return disease_retriever
+
+def build_symptom_response(message, matches):
+    """Format symptom engine matches as a chat answer."""
+    lines = [
+        "## 🏥 Possible Conditions",
+        "",
+        f"**Your Question:** \"{message}\"",
+        "",
+        "### 📋 Conditions Matching Your Symptoms",
+    ]
+    for match in matches:
+        matched = ", ".join(match['matched_symptoms']) or "related symptoms"
+        lines.append(f"• **{match['disease']}** ({match['severity']}) - matches: {matched}")
+
+    top = matches[0]
+    lines += ["", f"### 💡 Prevention Tips for {top['disease']}"]
+    lines += [f"• {tip.capitalize()}" for tip in top['prevention']]
+    if top['treatment']:
+        lines += ["", "### 💊 Common Treatment", f"• {top['treatment'].capitalize()}"]
+
+    lines += [
+        "",
+        "### 🚨 When to Seek Medical Help",
+        "• Symptoms last more than 2-3 days or get worse",
+        "• Difficulty breathing, confusion or severe pain",
+        "• High fever (above 101°F/38.3°C)",
+        "",
+        "### 📞 Next Steps",
+        "• Visit your nearest health clinic for a proper diagnosis",
+        "• Ask about telehealth options if travel is difficult",
+        "",
+        "**Note:** This list is based on symptom matching only and is not a diagnosis. "
+        "Always consult a healthcare provider.",
+    ]
+    return "\n".join(lines)
+
+# Bump whenever the prompt template changes so cached responses are not reused
+PROMPT_VERSION = 2
+
+# Prompt for the LLM; the static instructions are built once, only the catalog
+# snippets relevant to each message are filled in per request
+CHAT_PROMPT_TEMPLATE = """You are a helpful health assistant for rural and semi-urban populations.
+User's preferred language: {language}
+
+IMPORTANT FORMATTING RULES:
+- Always answer in clear, structured bullet points
+- Use emojis for visual appeal and easy reading
+- Avoid long paragraphs - break information into digestible points
+- Use headers and subheaders for organization
+- Include actionable steps and clear next steps
+- Make information culturally appropriate for rural/semi-urban areas
+
+RESPONSE FORMAT:
+## 🏥 [Main Topic]
+**Your Question:** [Brief summary]
+
+### 📋 [Section 1]
+• [Bullet point 1]
+• [Bullet point 2]
+• [Bullet point 3]
+
+### 💡 [Section 2]
+• [Actionable advice 1]
+• [Actionable advice 2]
+
+### ⚠️ [Important Notes]
+• [Warning or important info]
+
+### 📞 [Next Steps]
+• [What to do next]
+
+Relevant disease information: {diseases}
+
+Likely conditions from symptom matching: {likely}
+
+User message: {message}"""
+
+def build_chat_prompt(message, language, matches):
+    """Build the LLM prompt, keeping it within PROMPT_MAX_CHARS."""
+    max_chars = current_app.config['PROMPT_MAX_CHARS']
+    message = message[:max_chars // 2]
+    likely = ", ".join(
+        f"{m['disease']} ({', '.join(m['matched_symptoms'])})" for m in matches
+    ) or "none"
+    base_size = len(CHAT_PROMPT_TEMPLATE) + len(language) + len(likely) + len(message)
+    diseases = get_disease_retriever().build_context(
+        message,
+        top_k=current_app.config['PROMPT_TOP_K'],
+        max_chars=max(max_chars - base_size, 2),
+        priority_names=[m['disease'] for m in matches]
+    )
+    return CHAT_PROMPT_TEMPLATE.format(
+        language=language, diseases=diseases, likely=likely, message=message
+    )
+
+def is_english(language):
+    """Whether a language code ('en', 'en-IN', 'English') asks for English answers."""
+    language = (language or 'en').strip().lower()
+    return language == 'english' or language.split('-')[0].split('_')[0] == 'en'
+
+def is_direct_symptom_answer(matches, language):
+    """Whether the symptom engine can answer without the LLM.
+
+    The engine's answers are English only; other languages still go to the LLM
+    with the ranking in the prompt.
+    """
+    min_matches = current_app.config['SYMPTOM_DIRECT_MIN_MATCHES']
+    return (
+        is_english(language) and bool(matches) and min_matches > 0
+        and len(matches[0]['matched_symptoms']) >= min_matches
+    )
+
+def build_fallback_response(message, degraded=False):
+    """Canned guidance served when the LLM is unavailable or failing."""
+    if not degraded:
+        return f"""## 🏥 Health Assistant Response
+
+**Your Question:** "{message}"
+
+### ⚠️ Current Status
+• AI service temporarily unavailable
+• Providing general health guidance
+
+### 💡 General Health Tips
+• **Always consult** healthcare professionals for serious concerns
+• **Maintain good hygiene** and regular exercise
+• **Eat a balanced diet** with fresh fruits and vegetables
+• **Get adequate sleep** (7-9 hours daily)
+• **Stay hydrated** (8-10 glasses of water daily)
+
+### 🚨 When to Seek Medical Help
+• Persistent or severe symptoms
+• Difficulty breathing
+• High fever (above 101°F/38.3°C)
+• Severe pain or discomfort
+• Any emergency symptoms
+
+### 📞 Next Steps
+• Contact your nearest health clinic
+• Ask about telehealth options if travel is difficult
+• Don't delay seeking professional medical advice
+
+**Note:** This is general guidance only. Always consult a healthcare provider for proper diagnosis and treatment."""
+
+    return f"""## 🏥 Health Assistant Response
+
+**Your Question:** "{message}"
+
+### ⚠️ Current Status
+• AI service experiencing technical difficulties
+• Providing general health guidance
+
+### 💡 General Health Guidelines
+• **Always consult** healthcare professionals for medical concerns
+• **Maintain good hygiene** practices (handwashing, clean environment)
+• **Follow a balanced diet** with local, fresh foods
+• **Exercise regularly** (30 minutes daily if possible)
+• **Get sufficient rest** and manage stress
+
+### 🚨 When to Seek Immediate Help
+• Severe symptoms or pain
+• Difficulty breathing
+• High fever or persistent illness
+• Any emergency health situation
+
+### 📞 Next Steps
+• Contact your nearest health center
+• Ask about telehealth options if available
+• Don't delay seeking professional medical advice
+
+**Note:** This is general guidance only. Always consult a healthcare provider for proper diagnosis and treatment."""
+
+def plan_chat_answer(message, language):
+    """Decide how a chat message is answered.
+
+    Returns a dict with the answer 'response' when it can be produced locally
+    (symptom engine, cache or fallback), otherwise 'response' is None and
+    'context' holds the LLM prompt to send to 'backend'.
+    """
+    # Rank likely conditions locally first
+    matches = get_symptom_index().rank(message, top_k=3)
+    cache_key = (normalize_message(message), language, PROMPT_VERSION)
+    backend = get_llm_backend()
+    plan = {
+        'response': None, 'source': 'llm', 'context': None, 'backend': backend,
+        'cache_key': cache_key, 'matches': matches
+    }
+    
+    if is_direct_symptom_answer(matches, language) or (backend is None and matches):
+        # Clear symptom description: answer from the local engine, no LLM round-trip
+        plan.update(response=build_symptom_response(message, matches), source='symptom_engine')
+    elif backend is None:
+        # Fallback response when the LLM is not available
+        plan.update(response=build_fallback_response(message), source='fallback')
+    else:
+        cached_response = chat_cache.get(cache_key)
+        if cached_response is not None:
+            plan.update(response=cached_response, source='cache')
+        elif not llm_breaker.allow():
+            # The LLM is failing: answer locally without waiting on upstream
+            response, source = local_fallback_answer(message, matches)
+            plan.update(response=response, source=source)
+        else:
+            # Create context for the LLM with only the relevant catalog entries
+            plan['context'] = build_chat_prompt(message, language, matches)
+    return plan
+
+def local_fallback_answer(message, matches):
+    """Best answer available without the LLM: symptom matches or the canned guidance."""
+    if matches:
+        return build_symptom_response(message, matches), 'symptom_engine'
+    return build_fallback_response(message, degraded=True), 'fallback'
+
+def get_latency_budget(data):
+    """Per-request LLM latency budget in seconds, or None when unlimited.
+    
+    Raises InvalidQuery unless latency_budget_ms is absent or a positive number.
+    """
+    budget_ms = data.get('latency_budget_ms')
+    if budget_ms is None:
+        budget = current_app.config['LLM_LATENCY_BUDGET']
+    else:
+        try:
+            budget = math.nan if isinstance(budget_ms, bool) else float(budget_ms) / 1000
+        except (TypeError, ValueError):
+            budget = math.nan
+        if not (math.isfinite(budget) and budget > 0):
+            raise InvalidQuery('latency_budget_ms must be a positive number of milliseconds')
+    return min(budget, llm_executor.timeout) if budget > 0 else None
+
+def write_chat_batch(flask_app, rows):
+    """Group-commit queued ChatHistory rows in a single transaction."""
+    with flask_app.app_context():
+        try:
+            db.session.execute(db.insert(ChatHistory), rows)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+
+def save_chat_record(user_id, message, response, language):
+    """Persist one chat exchange to ChatHistory (queued when write-behind is on)."""
+    if chat_writer is not None and chat_writer.put({
+        'user_id': user_id,
+        'message': message,
+        'response': response,
+        'language': language,
+        'timestamp': datetime.utcnow()
+    }):
+        return
+    
+    chat_record = ChatHistory(
+        user_id=user_id,
+        message=message,
+        response=response,
+        language=language
+    )
+    db.session.add(chat_record)
+    db.session.commit()
+
+def record_llm_outcome(success, start, abandoned=None):
+    """Report a finished upstream call to the breaker, unless its caller already did."""
+    if abandoned is None or not abandoned.is_set():
+        llm_breaker.record(success, time.monotonic() - start)
+
+def record_llm_timeout(start, abandoned):
+    """The caller stopped waiting: count the call as failed now, not when upstream returns."""
+    abandoned.set()
+    llm_breaker.record(False, time.monotonic() - start)
+
+def generate_llm_text(backend, context, abandoned=None):
+    """Blocking LLM call; runs on the LLM pool and reports to the breaker."""
+    start = time.monotonic()
+    try:
+        text = backend.generate(context)
+    except Exception:
+        record_llm_outcome(False, start, abandoned)
+        raise
+    record_llm_outcome(True, start, abandoned)
+    return text
+
+def generate_llm_chunks(backend, context, abandoned=None):
+    """Streaming LLM call yielding text chunks; runs on the LLM pool."""
+    start = time.monotonic()
+    try:
+        for text in backend.stream(context):
+            yield text
+    except Exception:
+        record_llm_outcome(False, start, abandoned)
+        raise
+    record_llm_outcome(True, start, abandoned)
+
+def too_many_requests(error):
+    """429 response telling the client when to retry."""
+    response = jsonify({
+        'error': 'Server is busy. Please try again shortly.',
+        'retry_after': error.retry_after
+    })
+    response.headers['Retry-After'] = str(error.retry_after)
+    return response, 429
+
+def run_chat_job(flask_app, job_id, user_id, message, language, plan):
+    """Produce an async chat answer on the LLM pool and store it on the job."""
+    source = 'llm'
+    try:
+        bot_response = generate_llm_text(plan['backend'], plan['context'])
+        chat_cache.set(plan['cache_key'], bot_response)
+    except Exception as gemini_error:
+        print(f"LLM API error: {gemini_error}")
+        bot_response, source = local_fallback_answer(message, plan['matches'])
+    
+    with flask_app.app_context():
+        try:
+            save_chat_record(user_id, message, bot_response, language)
+            chat_jobs.complete(job_id, {
+                'response': bot_response,
+                'source': source,
+                'cached': False,
+                'timestamp': datetime.utcnow().isoformat()
+            })
+        except Exception as e:
+            print(f"Chat job error: {e}")
+            db.session.rollback()
+            chat_jobs.fail(job_id, 'Internal server error. Please try again.')
+
+def start_chat_job(user_id, message, language, plan):
+    """Answer a chat message asynchronously, returning 202 with a job id."""
+    job_id = chat_jobs.create(user_id)
+    if job_id is None:
+        return too_many_requests(ExecutorSaturated(llm_executor.retry_after(), llm_executor.name))
+    
+    if plan['response'] is not None:
+        # Answered locally, so the job is finished straight away
+        save_chat_record(user_id, message, plan['response'], language)
+        chat_jobs.complete(job_id, {
+            'response': plan['response'],
+            'source': plan['source'],
+            'cached': plan['source'] == 'cache',
+            'timestamp': datetime.utcnow().isoformat()
+        })
+    else:
+        try:
+            llm_executor.submit(
+                run_chat_job, current_app._get_current_object(), job_id, user_id, message, language, plan
+            )
+        except ExecutorSaturated as e:
+            chat_jobs.fail(job_id, str(e))
+            return too_many_requests(e)
+    
+    job = chat_jobs.get(job_id, user_id)
+    return jsonify({
+        'job_id': job_id,
+        'status': job['status'],
+        'status_url': f'/api/chat/jobs/{job_id}'
+    }), 202
+
+def sse_event(event, data):
+    """Format one Server-Sent Event with a JSON payload."""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+def iter_text_chunks(text, lines_per_chunk=2):
+    """Split a prepared answer into line-based chunks for streaming."""
+    lines = text.splitlines(keepends=True)
+    for i in range(0, len(lines), lines_per_chunk):
+        yield ''.join(lines[i:i + lines_per_chunk])
+
+# Set once the process starts draining; /readyz then reports not ready
+shutting_down = threading.Event()
+
+def begin_shutdown():
+    """Report not ready from now on; called when the worker is told to stop (SIGTERM)."""
+    shutting_down.set()
+
+def shutdown_background_work():
+    """Stop reporting ready and flush queued chat history before the process exits."""
+    begin_shutdown()
+    if chat_writer:
+        chat_writer.stop()
+
 # Routes
-@app.route('/')
+@api.route('/healthz', methods=['GET'])
+def healthz():
+    """Liveness: the process is up and serving requests (no dependencies checked)."""
+    return jsonify({'status': 'ok'}), 200
+
+@api.route('/readyz', methods=['GET'])
+def readyz():
+    """Readiness: the database answers and the catalog indexes are loaded."""
+    checks = {}
+    try:
+        db.session.execute(db.text('SELECT 1'))
+        checks['database'] = 'ok'
+    except Exception as e:
+        db.session.rollback()
+        checks['database'] = f'error: {e}'
+    checks['catalog'] = 'ok' if get_symptom_index() is not None else 'missing'
+    # Informational: chat falls back to local answers without a backend. Configuring
+    # it here lets the readiness probe warm the worker before it takes traffic
+    backend = get_llm_backend()
+    checks['llm_backend'] = backend.name if backend else 'unavailable'
+    
+    ready = not shutting_down.is_set() and checks['database'] == 'ok' and checks['catalog'] == 'ok'
+    return jsonify({
+        'status': 'ready' if ready else 'not_ready',
+        'shutting_down': shutting_down.is_set(),
+        'checks': checks
+    }), 200 if ready else 503
+
+@api.route('/')
 def home():
     return jsonify({
         'message': 'HealthBot API is running!',
@@ -258,27 +869,39 @@ def home():
             'register': '/api/register',
             'login': '/api/login',
             'chat': '/api/chat',
+            'chat_stream': '/api/chat/stream',
+            'chat_history': '/api/chat/history',
+            'symptom_check': '/api/symptom-check',
             'diseases': '/api/diseases',
+            'disease_search': '/api/diseases/search',
+            'diseases_by_symptoms': '/api/diseases/by-symptoms',
             'vaccination_schedule': '/api/vaccination-schedule',
             'outbreak_alerts': '/api/outbreak-alerts',
-            'user_profile': '/api/user/profile'
+            'outbreak_alerts_stream': '/api/outbreak-alerts/stream',
+            'user_profile': '/api/user/profile',
+            'liveness': '/healthz',
+            'readiness': '/readyz'
         }
     })
 
-@app.route('/api/register', methods=['POST'])
+@api.route('/api/register', methods=['POST'])
 def register():
     try:
         data = request.get_json()
         
-        # Check if user already exists
-        if User.query.filter_by(email=data['email']).first():
+        # Check if user already exists (email and username in one query)
+        taken = db.session.query(User.email, User.username).filter(
+            or_(User.email == data['email'], User.username == data['username'])
+        ).limit(2).all()
+        if any(row.email == data['email'] for row in taken):
             return jsonify({'error': 'Email already registered'}), 400
-        
-        if User.query.filter_by(username=data['username']).first():
+        if taken:
             return jsonify({'error': 'Username already taken'}), 400
         
         # Create new user
-        password_hash = bcrypt.generate_password_hash(data['password']).decode('utf-8')
+        password_hash = password_executor.call(
+            hash_password, data['password'], current_app.config['BCRYPT_LOG_ROUNDS']
+        )
         user = User(
             username=data['username'],
             email=data['email'],
@@ -308,316 +931,756 @@ def register():
             }
         }), 201
         
+    except ExecutorSaturated as e:
+        return too_many_requests(e)
+    except concurrent.futures.TimeoutError:
+        return jsonify({'error': 'Server is busy. Please try again.'}), 503
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
-@app.route('/api/login', methods=['POST'])
+@api.route('/api/login', methods=['POST'])
 def login():
     try:
         data = request.get_json()
-        user = User.query.filter_by(email=data['email']).first()
+        user = db.session.query(
+            User.password_hash, *columns(User, LOGIN_USER_FIELDS)
+        ).filter(User.email == data['email']).first()
         
-        if user and bcrypt.check_password_hash(user.password_hash, data['password']):
+        if user and password_executor.call(check_password, data['password'], user.password_hash):
+            rounds = current_app.config['BCRYPT_LOG_ROUNDS']
+            if needs_rehash(user.password_hash, rounds):
+                # Upgrade (or downgrade) the stored hash to the configured cost
+                new_hash = password_executor.call(hash_password, data['password'], rounds)
+                User.query.filter_by(id=user.id).update({'password_hash': new_hash})
+                db.session.commit()
+            
             access_token = create_access_token(identity=user.id)
-            return jsonify({
+            return json_response({
                 'message': 'Login successful',
                 'access_token': access_token,
-                'user': {
-                    'id': user.id,
-                    'username': user.username,
-                    'email': user.email,
-                    'full_name': user.full_name,
-                    'preferred_language': user.preferred_language
-                }
-            }), 200
+                'user': dict(zip(LOGIN_USER_FIELDS, user[1:]))
+            })
         else:
             return jsonify({'error': 'Invalid credentials'}), 401
             
+    except ExecutorSaturated as e:
+        return too_many_requests(e)
+    except concurrent.futures.TimeoutError:
+        return jsonify({'error': 'Server is busy. Please try again.'}), 503
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
-@app.route('/api/chat', methods=['POST'])
+@api.route('/api/chat', methods=['POST'])
 @jwt_required()
 def chat():
     try:
         data = request.get_json()
-        user_id = get_jwt_identity()
-        user = User.query.get(user_id)
-        
-        if not user:
-            return jsonify({'error': 'User not found'}), 404
+        user_id = current_user.id
         
         message = data['message']
-        language = data.get('language', user.preferred_language)
+        language = data.get('language', current_user.preferred_language)
+        budget = get_latency_budget(data)
         
-        # Check if Gemini model is available
-        if model is None:
-            # Fallback response when Gemini is not available
-            bot_response = f"""## 🏥 Health Assistant Response
-
-**Your Question:** "{message}"
-
-### ⚠️ Current Status
-• AI service temporarily unavailable
-• Providing general health guidance
-
-### 💡 General Health Tips
-• **Always consult** healthcare professionals for serious concerns
-• **Maintain good hygiene** and regular exercise
-• **Eat a balanced diet** with fresh fruits and vegetables
-• **Get adequate sleep** (7-9 hours daily)
-• **Stay hydrated** (8-10 glasses of water daily)
-
-### 🚨 When to Seek Medical Help
-• Persistent or severe symptoms
-• Difficulty breathing
-• High fever (above 101°F/38.3°C)
-• Severe pain or discomfort
-• Any emergency symptoms
-
-### 📞 Next Steps
-• Contact your nearest health clinic
-• Ask about telehealth options if travel is difficult
-• Don't delay seeking professional medical advice
-
-**Note:** This is general guidance only. Always consult a healthcare provider for proper diagnosis and treatment."""
-        else:
-            try:
-                # Create context for Gemini with specific formatting instructions
-                context = f"""You are a helpful health assistant for rural and semi-urban populations. 
-        User's preferred language: {language}
-        
-IMPORTANT FORMATTING RULES:
-- Always answer in clear, structured bullet points
-- Use emojis for visual appeal and easy reading
-- Avoid long paragraphs - break information into digestible points
-- Use headers and subheaders for organization
-- Include actionable steps and clear next steps
-- Make information culturally appropriate for rural/semi-urban areas
-
-RESPONSE FORMAT:
-## 🏥 [Main Topic]
-**Your Question:** [Brief summary]
-
-### 📋 [Section 1]
-• [Bullet point 1]
-• [Bullet point 2]
-• [Bullet point 3]
-
-### 💡 [Section 2]
-• [Actionable advice 1]
-• [Actionable advice 2]
-
-### ⚠️ [Important Notes]
-• [Warning or important info]
-
-### 📞 [Next Steps]
-• [What to do next]
+        plan = plan_chat_answer(message, language)
         
-        Available disease information: {json.dumps(disease_data, indent=2)}
+        if data.get('async') or request.args.get('async') == '1':
+            return start_chat_job(user_id, message, language, plan)
         
-User message: {message}"""
+        bot_response = plan['response']
+        source = plan['source']
         
-                # Generate response using Gemini
-                response = model.generate_content(context)
-                bot_response = response.text
+        if bot_response is None:
+            abandoned = threading.Event()
+            start = time.monotonic()
+            try:
+                # Generate response using the LLM on the bounded LLM pool
+                bot_response = llm_executor.call(
+                    generate_llm_text, plan['backend'], plan['context'], abandoned, timeout=budget
+                )
+                chat_cache.set(plan['cache_key'], bot_response)
                 
+            except ExecutorSaturated as e:
+                return too_many_requests(e)
+            except concurrent.futures.TimeoutError:
+                # Deadline or latency budget exceeded; the late result is dropped
+                print(f"LLM API timeout after {budget or llm_executor.timeout}s")
+                record_llm_timeout(start, abandoned)
+                bot_response, source = local_fallback_answer(message, plan['matches'])
             except Exception as gemini_error:
-                print(f"Gemini API error: {gemini_error}")
+                print(f"LLM API error: {gemini_error}")
                 # Fallback response with proper formatting
-                bot_response = f"""## 🏥 Health Assistant Response
-
-**Your Question:** "{message}"
-
-### ⚠️ Current Status
-• AI service experiencing technical difficulties
-• Providing general health guidance
-
-### 💡 General Health Guidelines
-• **Always consult** healthcare professionals for medical concerns
-• **Maintain good hygiene** practices (handwashing, clean environment)
-• **Follow a balanced diet** with local, fresh foods
-• **Exercise regularly** (30 minutes daily if possible)
-• **Get sufficient rest** and manage stress
-
-### 🚨 When to Seek Immediate Help
-• Severe symptoms or pain
-• Difficulty breathing
-• High fever or persistent illness
-• Any emergency health situation
-
-### 📞 Next Steps
-• Contact your nearest health center
-• Ask about telehealth options if available
-• Don't delay seeking professional medical advice
-
-**Note:** This is general guidance only. Always consult a healthcare provider for proper diagnosis and treatment."""
+                bot_response, source = local_fallback_answer(message, plan['matches'])
         
         # Save chat history
-        chat_record = ChatHistory(
-            user_id=user_id,
-            message=message,
-            response=bot_response,
-            language=language
-        )
-        db.session.add(chat_record)
-        db.session.commit()
+        save_chat_record(user_id, message, bot_response, language)
         
         return jsonify({
             'response': bot_response,
+            'source': source,
+            'cached': source == 'cache',
             'timestamp': datetime.utcnow().isoformat()
         }), 200
         
+    except InvalidQuery as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         print(f"Chat error: {e}")
         return jsonify({'error': 'Internal server error. Please try again.'}), 500
 
-@app.route('/api/diseases', methods=['GET'])
+CHAT_HISTORY_FIELDS = ('id', 'message', 'response', 'language', 'timestamp')
+
+@api.route('/api/chat/history', methods=['GET'])
+@jwt_required()
+@reads_from_replica
+def get_chat_history():
+    """Page through the user's chat history, newest first, using a cursor.
+    
+    Read from the replica when one is configured. Replica lag can hide a
+    message sent a moment ago; that is accepted here, since the chat page
+    keeps the current conversation itself.
+    """
+    try:
+        user_id = get_jwt_identity()
+        limit = parse_limit(request.args.get('limit'))
+        fields = parse_fields(request.args.get('fields'), CHAT_HISTORY_FIELDS)
+        
+        # id and timestamp are always read: they form the cursor
+        columns = [ChatHistory.id, ChatHistory.timestamp] + [
+            getattr(ChatHistory, f) for f in fields if f not in ('id', 'timestamp')
+        ]
+        query = db.session.query(*columns).filter(ChatHistory.user_id == user_id)
+        
+        since = request.args.get('since')
+        until = request.args.get('until')
+        language = request.args.get('language')
+        try:
+            if since:
+                query = query.filter(ChatHistory.timestamp >= datetime.fromisoformat(since))
+            if until:
+                query = query.filter(ChatHistory.timestamp < datetime.fromisoformat(until))
+        except ValueError:
+            raise InvalidQuery('since and until must be ISO 8601 dates')
+        if language:
+            query = query.filter(ChatHistory.language == language)
+        
+        cursor = request.args.get('cursor')
+        if cursor:
+            values = decode_cursor(cursor)
+            try:
+                last_timestamp, last_id = datetime.fromisoformat(values[0]), int(values[1])
+            except (IndexError, TypeError, ValueError):
+                raise InvalidQuery('Invalid cursor')
+            query = query.filter(
+                ChatHistory.timestamp <= last_timestamp,
+                db.tuple_(ChatHistory.timestamp, ChatHistory.id) < (last_timestamp, last_id)
+            )
+        
+        rows = query.order_by(
+            ChatHistory.timestamp.desc(), ChatHistory.id.desc()
+        ).limit(limit + 1).all()
+        
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        messages = [{field: getattr(row, field) for field in fields} for row in rows]
+        
+        next_cursor = None
+        if has_more:
+            last = rows[-1]
+            next_cursor = encode_cursor([last.timestamp.isoformat(), last.id])
+        
+        return json_response({
+            'messages': messages,
+            'next_cursor': next_cursor,
+            'has_more': has_more
+        })
+        
+    except InvalidQuery as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@api.route('/api/chat/jobs/<job_id>', methods=['GET'])
+@jwt_required()
+def get_chat_job(job_id):
+    """Return the status, and result once finished, of an async chat job."""
+    try:
+        job = chat_jobs.get(job_id, get_jwt_identity())
+        
+        if not job:
+            return jsonify({'error': 'Job not found'}), 404
+        
+        payload = {'job_id': job['id'], 'status': job['status']}
+        if job['status'] == 'completed':
+            payload.update(job['result'])
+        elif job['status'] == 'failed':
+            payload['error'] = job['error']
+        
+        return jsonify(payload), 200
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@api.route('/api/chat/stream', methods=['POST'])
+@jwt_required()
+def chat_stream():
+    """Stream the chat answer as Server-Sent Events."""
+    try:
+        data = request.get_json()
+        user_id = current_user.id
+        
+        message = data['message']
+        language = data.get('language', current_user.preferred_language)
+        budget = get_latency_budget(data)
+        plan = plan_chat_answer(message, language)
+        
+        upstream = None
+        abandoned = threading.Event()
+        start = time.monotonic()
+        if plan['response'] is None:
+            upstream = llm_executor.stream(
+                generate_llm_chunks, plan['backend'], plan['context'], abandoned,
+                first_item_timeout=budget
+            )
+        
+    except InvalidQuery as e:
+        return jsonify({'error': str(e)}), 400
+    except ExecutorSaturated as e:
+        return too_many_requests(e)
+    except Exception as e:
+        print(f"Chat stream error: {e}")
+        return jsonify({'error': 'Internal server error. Please try again.'}), 500
+    
+    def generate():
+        source = plan['source']
+        # Flush headers and a first event before any upstream work
+        yield sse_event('meta', {'source': source})
+        
+        parts = []
+        if plan['response'] is not None:
+            for chunk in iter_text_chunks(plan['response']):
+                parts.append(chunk)
+                yield sse_event('chunk', {'text': chunk})
+        else:
+            try:
+                for text in upstream:
+                    parts.append(text)
+                    yield sse_event('chunk', {'text': text})
+                chat_cache.set(plan['cache_key'], ''.join(parts))
+            except Exception as gemini_error:
+                print(f"LLM API stream error: {gemini_error!r}")
+                if isinstance(gemini_error, concurrent.futures.TimeoutError):
+                    record_llm_timeout(start, abandoned)
+                fallback, source = local_fallback_answer(message, plan['matches'])
+                if parts:
+                    # Discard the partial answer on the client before the fallback
+                    parts = []
+                    yield sse_event('reset', {'source': source})
+                for chunk in iter_text_chunks(fallback):
+                    parts.append(chunk)
+                    yield sse_event('chunk', {'text': chunk})
+        
+        bot_response = ''.join(parts)
+        try:
+            save_chat_record(user_id, message, bot_response, language)
+        except Exception as e:
+            print(f"Chat stream error: {e}")
+            db.session.rollback()
+            yield sse_event('error', {'error': 'Failed to save chat history'})
+        
+        yield sse_event('done', {
+            'source': source,
+            'timestamp': datetime.utcnow().isoformat()
+        })
+    
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+@api.route('/api/symptom-check', methods=['GET', 'POST'])
+def symptom_check():
+    """Rank likely diseases for a set of symptoms using the local engine."""
+    try:
+        if request.method == 'POST':
+            data = request.get_json() or {}
+            symptoms = data.get('symptoms') or data.get('message', '')
+            top_k = data.get('top_k', 5)
+        else:
+            symptoms = request.args.get('symptoms', '')
+            top_k = request.args.get('top_k', 5)
+        
+        if not symptoms:
+            return jsonify({'error': 'symptoms is required'}), 400
+        
+        top_k = max(1, min(int(top_k), 20))
+        start = time.perf_counter()
+        matches = get_symptom_index().rank(symptoms, top_k=top_k)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        
+        return jsonify({
+            'matches': matches,
+            'elapsed_ms': round(elapsed_ms, 3)
+        }), 200
+        
+    except (TypeError, ValueError):
+        return jsonify({'error': 'top_k must be an integer'}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+def json_response(payload, status=200):
+    """Encode a payload with the fast serializer."""
+    return Response(dumps(payload), status=status, mimetype=JSON_MIMETYPE)
+
+def cached_json_response(namespace, build_payload, vary=None):
+    """Serve a JSON payload from the reference cache with a strong ETag.
+    
+    The payload is rebuilt only on a miss; clients sending a matching
+    If-None-Match get a bodyless 304. vary adds anything besides the path
+    and query string that the payload depends on to the cache key.
+    """
+    key = (request.path, tuple(sorted(request.args.items(multi=True))), vary)
+    version = reference_cache.version(namespace)
+    entry = reference_cache.get(namespace, version, key)
+    if entry is None:
+        body = dumps(build_payload())
+        entry = reference_cache.set(namespace, version, key, body)
+    etag, body = entry
+    
+    response = Response(body, mimetype=JSON_MIMETYPE)
+    response.set_etag(etag)
+    # Clients may keep the body but must revalidate before reusing it
+    response.headers['Cache-Control'] = 'no-cache'
+    return response.make_conditional(request)
+
+def build_diseases_payload():
+    fields = parse_fields(request.args.get('fields'), DISEASE_FIELDS)
+    rows = db.session.query(*columns(Disease, fields)).all()
+    return {'diseases': rows_to_dicts(fields, rows)}
+
+@api.route('/api/diseases', methods=['GET'])
+@reads_from_replica
 def get_diseases():
     try:
-        diseases = Disease.query.all()
-        disease_list = []
-        
-        for disease in diseases:
-            disease_list.append({
-                'id': disease.id,
-                'name': disease.name,
-                'symptoms': disease.symptoms,
-                'prevention': disease.prevention,
-                'treatment': disease.treatment,
-                'severity': disease.severity,
-                'category': disease.category
-            })
+        return cached_json_response('diseases', build_diseases_payload)
         
-        return jsonify({'diseases': disease_list}), 200
+    except InvalidQuery as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+def build_vaccination_payload():
+    age_group = request.args.get('age_group')
+    country = request.args.get('country', 'India')
+    fields = parse_fields(request.args.get('fields'), VACCINATION_FIELDS)
+    
+    query = db.session.query(*columns(VaccinationSchedule, fields)).filter_by(country=country)
+    if age_group:
+        query = query.filter_by(age_group=age_group)
+    
+    return {'schedules': rows_to_dicts(fields, query.all())}
+
+def build_disease_search_payload():
+    limit = parse_limit(request.args.get('limit'), default=20, maximum=100)
+    fields = parse_fields(request.args.get('fields'), DISEASE_FIELDS)
+    
+    after = None
+    cursor = request.args.get('cursor')
+    if cursor:
+        values = decode_cursor(cursor)
+        try:
+            after = (float(values[0]), int(values[1]))
+        except (IndexError, TypeError, ValueError):
+            raise InvalidQuery('Invalid cursor')
+    
+    rows = disease_search.search(
+        db.session,
+        request.args.get('q', ''),
+        fields,
+        category=request.args.get('category'),
+        severity=request.args.get('severity'),
+        limit=limit,
+        after=after
+    )
+    
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    results = []
+    for row in rows:
+        item = dict(zip(fields, row[2:]))
+        # Engines rank lower-is-better; report higher-is-better relevance
+        item['relevance'] = round(0.0 - row.score, 6)
+        results.append(item)
+    
+    next_cursor = None
+    if has_more:
+        next_cursor = encode_cursor([rows[-1].score, rows[-1].row_id])
+    
+    return {
+        'diseases': results,
+        'next_cursor': next_cursor,
+        'has_more': has_more,
+        'engine': disease_search.backend
+    }
+
+@api.route('/api/diseases/search', methods=['GET'])
+@reads_from_replica
+def search_diseases():
+    """Ranked full-text search over the disease catalog with cursor pagination."""
+    try:
+        return cached_json_response('diseases', build_disease_search_payload)
         
+    except InvalidQuery as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
-@app.route('/api/vaccination-schedule', methods=['GET'])
-def get_vaccination_schedule():
+def build_diseases_by_symptoms_payload():
+    requested = symptom_names(request.args.get('symptoms', ''))
+    if not requested:
+        raise InvalidQuery('symptoms is required (comma-separated)')
+    match = request.args.get('match', 'any')
+    if match not in ('any', 'all'):
+        raise InvalidQuery("match must be 'any' or 'all'")
+    fields = parse_fields(request.args.get('fields'), DISEASE_FIELDS)
+    limit = parse_limit(request.args.get('limit'), default=20, maximum=100)
+    
+    known = dict(db.session.query(Symptom.id, Symptom.name).filter(Symptom.name.in_(requested)).all())
+    unknown = [name for name in requested if name not in known.values()]
+    if not known or (match == 'all' and unknown):
+        return {'diseases': [], 'unknown_symptoms': unknown}
+    
+    matched = db.func.count(disease_symptom.c.symptom_id).label('matched_count')
+    query = db.session.query(Disease.id, matched, *columns(Disease, fields)).join(
+        disease_symptom, disease_symptom.c.disease_id == Disease.id
+    ).filter(
+        disease_symptom.c.symptom_id.in_(known.keys())
+    ).group_by(Disease.id)
+    if match == 'all':
+        query = query.having(matched == len(known))
+    rows = query.order_by(matched.desc(), Disease.id).limit(limit).all()
+    
+    matched_names = {}
+    if rows:
+        for disease_id, symptom_id in db.session.query(
+            disease_symptom.c.disease_id, disease_symptom.c.symptom_id
+        ).filter(
+            disease_symptom.c.disease_id.in_([row[0] for row in rows]),
+            disease_symptom.c.symptom_id.in_(known.keys())
+        ):
+            matched_names.setdefault(disease_id, []).append(known[symptom_id])
+    
+    results = []
+    for row in rows:
+        item = dict(zip(fields, row[2:]))
+        item['matched_symptoms'] = sorted(matched_names.get(row[0], []))
+        item['matched_count'] = row[1]
+        results.append(item)
+    
+    return {'diseases': results, 'unknown_symptoms': unknown}
+
+@api.route('/api/diseases/by-symptoms', methods=['GET'])
+@reads_from_replica
+def get_diseases_by_symptoms():
+    """Diseases linked to any (or all) of the given symptoms, most matches first."""
     try:
-        age_group = request.args.get('age_group')
-        country = request.args.get('country', 'India')
-        
-        query = VaccinationSchedule.query.filter_by(country=country)
-        if age_group:
-            query = query.filter_by(age_group=age_group)
-        
-        schedules = query.all()
-        schedule_list = []
-        
-        for schedule in schedules:
-            schedule_list.append({
-                'id': schedule.id,
-                'age_group': schedule.age_group,
-                'vaccine_name': schedule.vaccine_name,
-                'description': schedule.description,
-                'is_mandatory': schedule.is_mandatory
-            })
+        return cached_json_response('diseases', build_diseases_by_symptoms_payload)
         
-        return jsonify({'schedules': schedule_list}), 200
+    except InvalidQuery as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@api.route('/api/vaccination-schedule', methods=['GET'])
+@reads_from_replica
+def get_vaccination_schedule():
+    try:
+        return cached_json_response('vaccination', build_vaccination_payload)
         
+    except InvalidQuery as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
-@app.route('/api/outbreak-alerts', methods=['GET'])
+def build_alerts_payload(region=None):
+    fields = parse_fields(request.args.get('fields'), ALERT_FIELDS)
+    query = db.session.query(*columns(OutbreakAlert, fields)).filter_by(is_active=True)
+    
+    if region:
+        # Nationwide alerts are relevant everywhere
+        query = query.filter(OutbreakAlert.region_key.in_([region, NATIONWIDE_REGION]))
+    
+    min_severity = request.args.get('min_severity')
+    if min_severity:
+        allowed = severities_at_least(min_severity)
+        if allowed is None:
+            raise InvalidQuery('min_severity must be one of low, medium, high, critical')
+        query = query.filter(db.func.lower(OutbreakAlert.severity).in_(allowed))
+    
+    days = request.args.get('days')
+    if days:
+        try:
+            since = datetime.utcnow() - timedelta(days=int(days))
+        except (ValueError, OverflowError):
+            raise InvalidQuery('days must be an integer')
+        query = query.filter(OutbreakAlert.alert_date >= since)
+    
+    rows = query.order_by(OutbreakAlert.alert_date.desc()).all()
+    payload = {'alerts': rows_to_dicts(fields, rows)}
+    if region:
+        payload['region'] = region
+    return payload
+
+@api.route('/api/outbreak-alerts', methods=['GET'])
+@reads_from_replica
 def get_outbreak_alerts():
+    """Active alerts, optionally by location, minimum severity, age in days, or for_me=1."""
     try:
-        alerts = OutbreakAlert.query.filter_by(is_active=True).all()
-        alert_list = []
+        location = request.args.get('location')
+        if request.args.get('for_me') == '1':
+            try:
+                verify_jwt_in_request()
+            except Exception:
+                return jsonify({'error': 'Log in to see alerts for your location'}), 401
+            location = current_user.location
+            if not location:
+                return jsonify({'error': 'Set your location in your profile to filter alerts'}), 400
         
-        for alert in alerts:
-            alert_list.append({
-                'id': alert.id,
-                'disease_name': alert.disease_name,
-                'location': alert.location,
-                'severity': alert.severity,
-                'description': alert.description,
-                'alert_date': alert.alert_date.isoformat()
-            })
+        region = resolve_region(db.session.connection(), location) if location else None
+        return cached_json_response('alerts', lambda: build_alerts_payload(region), vary=region)
+        
+    except InvalidQuery as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@api.route('/api/outbreak-alerts/stream', methods=['GET'])
+def stream_outbreak_alerts():
+    """Server-Sent Events feed of alert changes, optionally for one location.
+    
+    Events: alert.created, alert.updated, alert.deactivated, alert.deleted,
+    and reset when missed events can't be replayed (refetch the list).
+    Changes made through any worker process arrive within about
+    ALERT_EVENT_POLL_INTERVAL; event ids are per process, so resuming on
+    another worker starts with a reset.
+    """
+    try:
+        alert_relay.start()
+        location = request.args.get('location')
+        region = resolve_region(db.session.connection(), location) if location else None
+        regions = {region, NATIONWIDE_REGION} if region else None
+        last_event_id = request.headers.get('Last-Event-ID') or request.args.get('last_event_id')
+        
+        subscription = alert_hub.subscribe(
+            last_event_id,
+            regions=regions,
+            heartbeat=current_app.config['ALERT_STREAM_HEARTBEAT'],
+            max_seconds=current_app.config['ALERT_STREAM_MAX_SECONDS']
+        )
         
-        return jsonify({'alerts': alert_list}), 200
+        # No request context is kept: the database session is released before streaming
+        def generate():
+            yield "retry: 3000\n\n"
+            for item in subscription:
+                if item is None:
+                    yield ": keepalive\n\n"
+                else:
+                    event_id, event_type, data = item
+                    yield f"id: {event_id}\n" + sse_event(event_type, data)
         
+        response = Response(
+            generate(),
+            mimetype='text/event-stream',
+            headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+        )
+        response.call_on_close(subscription.close)
+        return response
+        
+    except SubscriberLimitReached as e:
+        # EventSource gives up on a 503; the alerts page then falls back to polling
+        response = jsonify({'error': 'Too many live alert streams. Please try again shortly.'})
+        response.headers['Retry-After'] = str(e.retry_after)
+        return response, 503
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
-@app.route('/api/export-data', methods=['GET'])
+def query_chat_export_rows(user_id):
+    """Chat history rows for an export, read from the database in chunks."""
+    return db.session.query(
+        ChatHistory.timestamp, ChatHistory.message, ChatHistory.response, ChatHistory.language
+    ).filter(
+        ChatHistory.user_id == user_id
+    ).order_by(
+        ChatHistory.timestamp, ChatHistory.id
+    ).yield_per(current_app.config['EXPORT_CHUNK_ROWS'])
+
+@api.route('/api/export-data', methods=['GET'])
 @jwt_required()
 def export_data():
+    """Download the user's chat history as xlsx (default), csv or ndjson."""
     try:
-        user_id = get_jwt_identity()
-        user = User.query.get(user_id)
+        user_id = current_user.id
         
-        if not user:
-            return jsonify({'error': 'User not found'}), 404
+        fmt = request.args.get('format', 'xlsx')
+        if fmt not in EXPORT_FORMATS:
+            return jsonify({'error': f"format must be one of: {', '.join(EXPORT_FORMATS)}"}), 400
+        
+        filename = f'health_chat_history_{current_user.username}_{datetime.now().strftime("%Y%m%d")}.{fmt}'
+        
+        if request.args.get('async') == '1':
+            return start_export_job(user_id, fmt, filename)
         
-        # Get user's chat history
-        chat_history = ChatHistory.query.filter_by(user_id=user_id).all()
+        rows = query_chat_export_rows(user_id)
+        path = None
         
-        # Create Excel file
-        output = BytesIO()
-        workbook = xlsxwriter.Workbook(output)
-        worksheet = workbook.add_worksheet('Chat History')
+        if fmt == 'xlsx':
+            # Written in constant-memory mode to a temp file, removed once sent
+            path = build_xlsx_tempfile(rows, current_app.config['UPLOAD_FOLDER'])
+            body = iter_file(path)
+        elif fmt == 'csv':
+            body = stream_with_context(generate_csv(rows))
+        else:
+            body = stream_with_context(generate_ndjson(rows))
         
-        # Headers
-        headers = ['Timestamp', 'Message', 'Response', 'Language']
-        for col, header in enumerate(headers):
-            worksheet.write(0, col, header)
+        response = Response(
+            body,
+            mimetype=EXPORT_FORMATS[fmt],
+            headers={'Content-Disposition': f'attachment; filename="{secure_filename(filename)}"'}
+        )
+        if path:
+            response.call_on_close(lambda: remove_file(path))
+        return response
         
-        # Data
-        for row, chat in enumerate(chat_history, 1):
-            worksheet.write(row, 0, chat.timestamp.strftime('%Y-%m-%d %H:%M:%S'))
-            worksheet.write(row, 1, chat.message)
-            worksheet.write(row, 2, chat.response)
-            worksheet.write(row, 3, chat.language)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+def chat_history_fingerprint(user_id):
+    """Changes whenever ChatHistory rows are added or removed for the user."""
+    count, max_id = db.session.query(
+        db.func.count(ChatHistory.id), db.func.max(ChatHistory.id)
+    ).filter(ChatHistory.user_id == user_id).one()
+    return f"{count}-{max_id or 0}"
+
+def export_dir(settings):
+    """Where finished export artifacts are kept: UPLOAD_FOLDER/exports."""
+    return os.path.join(settings['UPLOAD_FOLDER'], 'exports')
+
+def run_export_job(flask_app, job_id, user_id, fmt, path):
+    """Write an export artifact off the request path."""
+    try:
+        with flask_app.app_context():
+            try:
+                export_jobs.update(job_id, status='running')
+                write_export_file(fmt, query_chat_export_rows(user_id), path)
+                export_jobs.complete(job_id, {'path': path})
+            except Exception as e:
+                print(f"Export job error: {e}")
+                export_jobs.fail(job_id, 'Export failed. Please try again.')
+    finally:
+        cleanup_artifacts(
+            export_dir(flask_app.config),
+            flask_app.config['EXPORT_ARTIFACT_MAX_AGE'],
+            flask_app.config['EXPORT_ARTIFACT_MAX_BYTES'],
+            keep=(path,)
+        )
+
+def start_export_job(user_id, fmt, filename):
+    """Queue an export, reusing the existing artifact if no new rows arrived."""
+    path = artifact_path(export_dir(current_app.config), user_id, fmt, chat_history_fingerprint(user_id))
+    job_id = export_jobs.create(user_id, filename=filename, format=fmt)
+    if job_id is None:
+        return too_many_requests(ExecutorSaturated(export_executor.retry_after(), export_executor.name))
+    
+    if os.path.exists(path):
+        # Refresh mtime so age-based cleanup counts from the last use
+        os.utime(path)
+        export_jobs.complete(job_id, {'path': path})
+    else:
+        try:
+            export_executor.submit(run_export_job, current_app._get_current_object(), job_id, user_id, fmt, path)
+        except ExecutorSaturated as e:
+            export_jobs.fail(job_id, str(e))
+            return too_many_requests(e)
+    
+    job = export_jobs.get(job_id, user_id)
+    return jsonify({
+        'job_id': job_id,
+        'status': job['status'],
+        'status_url': f'/api/export-data/jobs/{job_id}',
+        'download_url': f'/api/export-data/jobs/{job_id}/download'
+    }), 202
+
+@api.route('/api/export-data/jobs/<job_id>', methods=['GET'])
+@jwt_required()
+def get_export_job(job_id):
+    """Return the status of a background export job."""
+    try:
+        job = export_jobs.get(job_id, get_jwt_identity())
         
-        workbook.close()
-        output.seek(0)
+        if not job:
+            return jsonify({'error': 'Job not found'}), 404
         
-        # Convert to base64
-        excel_data = base64.b64encode(output.getvalue()).decode()
+        payload = {
+            'job_id': job['id'],
+            'status': job['status'],
+            'format': job.get('format'),
+            'filename': job.get('filename')
+        }
+        if job['status'] == 'completed':
+            payload['download_url'] = f'/api/export-data/jobs/{job_id}/download'
+        elif job['status'] == 'failed':
+            payload['error'] = job['error']
         
-        return jsonify({
-            'excel_data': excel_data,
-            'filename': f'health_chat_history_{user.username}_{datetime.now().strftime("%Y%m%d")}.xlsx'
-        }), 200
+        return jsonify(payload), 200
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
-@app.route('/api/user/profile', methods=['GET'])
+@api.route('/api/export-data/jobs/<job_id>/download', methods=['GET'])
 @jwt_required()
-def get_profile():
+def download_export(job_id):
+    """Serve the file produced by a finished export job."""
     try:
-        user_id = get_jwt_identity()
-        user = User.query.get(user_id)
+        job = export_jobs.get(job_id, get_jwt_identity())
         
-        if not user:
-            return jsonify({'error': 'User not found'}), 404
+        if not job:
+            return jsonify({'error': 'Job not found'}), 404
+        if job['status'] != 'completed':
+            return jsonify({'error': 'Export is not ready', 'status': job['status']}), 409
         
-        return jsonify({
-            'id': user.id,
-            'username': user.username,
-            'email': user.email,
-            'full_name': user.full_name,
-            'phone': user.phone,
-            'age': user.age,
-            'gender': user.gender,
-            'location': user.location,
-            'preferred_language': user.preferred_language,
-            'created_at': user.created_at.isoformat()
-        }), 200
+        path = job['result']['path']
+        if not os.path.exists(path):
+            return jsonify({'error': 'Export has expired. Please export again.'}), 410
+        
+        return send_file(
+            os.path.abspath(path),
+            mimetype=EXPORT_FORMATS[job['format']],
+            as_attachment=True,
+            download_name=secure_filename(job['filename']),
+            conditional=True
+        )
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
-@app.route('/api/user/profile', methods=['PUT'])
+@api.route('/api/user/profile', methods=['GET'])
+@jwt_required()
+def get_profile():
+    try:
+        fields = parse_fields(request.args.get('fields'), PROFILE_FIELDS)
+        return json_response({field: getattr(current_user, field) for field in fields})
+        
+    except InvalidQuery as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@api.route('/api/user/profile', methods=['PUT'])
 @jwt_required()
 def update_profile():
     try:
         user_id = get_jwt_identity()
-        user = User.query.get(user_id)
+        user = db.session.get(User, user_id)
         
         if not user:
             return jsonify({'error': 'User not found'}), 404
@@ -639,151 +1702,507 @@ def update_profile():
             user.preferred_language = data['preferred_language']
         
         db.session.commit()
+        user_cache.delete(user_id)
         
         return jsonify({'message': 'Profile updated successfully'}), 200
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
-@app.route('/api/admin/reset-database', methods=['POST'])
+@api.route('/api/admin/reset-database', methods=['POST'])
+@admin_required
 def reset_database():
-    """Reset and reinitialize database with comprehensive disease data."""
+    """Reset the catalog to the comprehensive disease data, changing only what differs."""
     try:
-        # Clear existing disease data
-        Disease.query.delete()
-        VaccinationSchedule.query.delete()
-        OutbreakAlert.query.delete()
-        
-        # Reinitialize with comprehensive data
-        initialize_database()
+        reports = reseed_catalog()
+        changes = {}
+        for kind, report in reports.items():
+            print(f"✅ Reseeded {kind}: {report.inserted} inserted, {report.updated} updated, "
+                  f"{report.deleted} deleted, {report.unchanged} unchanged")
+            changes[kind] = {
+                'inserted': report.inserted,
+                'updated': report.updated,
+                'deleted': report.deleted,
+                'unchanged': report.unchanged,
+                'rejected': report.rejected
+            }
         
         return jsonify({
             'message': 'Database reset successfully with comprehensive disease data',
             'diseases_count': len(disease_data),
+            'changes': changes,
             'status': 'success'
         }), 200
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@api.route('/api/admin/seed/<kind>', methods=['POST'])
+@admin_required
+def seed_catalog(kind):
+    """Bulk-load diseases, vaccinations or alerts from an uploaded JSON, NDJSON or CSV file."""
+    if kind not in SEED_SPECS:
+        return jsonify({'error': f"kind must be one of: {', '.join(SEED_SPECS)}"}), 400
+    upload = request.files.get('file')
+    if upload is None:
+        return jsonify({'error': "Upload the records as a 'file' form field"}), 400
+    
+    try:
+        fmt = detect_format(upload.filename, request.args.get('format'))
+        report = seed_from_file(
+            kind, text_stream(upload.stream), fmt,
+            batch_size=request.args.get('batch_size', type=int), progress=None
+        )
+        return jsonify(report.as_dict()), 200
+        
+    except SeedError as e:
+        # Batches before a malformed part of the file stay committed
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+@api.route('/api/admin/metrics', methods=['GET'])
+@admin_required
+def get_metrics():
+    """Report in-process cache and runtime counters."""
+    return jsonify({
+        'chat_cache': chat_cache.stats(),
+        'user_cache': user_cache.stats(),
+        'reference_cache': reference_cache.stats(),
+        'llm_executor': llm_executor.stats(),
+        'chat_jobs': chat_jobs.stats(),
+        'llm_breaker': llm_breaker.stats(),
+        'chat_write_behind': chat_writer.stats() if chat_writer else {'enabled': False},
+        'export_executor': export_executor.stats(),
+        'export_jobs': export_jobs.stats(),
+        'alert_hub': alert_hub.stats(),
+        'alert_relay': alert_relay.stats(),
+        'password_executor': password_executor.stats(),
+        'database': database_stats(db.engines)
+    }), 200
+
+@api.route('/api/admin/llm-breaker', methods=['GET'])
+@admin_required
+def get_llm_breaker():
+    """Report the state of the LLM circuit breaker."""
+    return jsonify(llm_breaker.stats()), 200
+
+def parse_alert_fields(data, partial=False):
+    """Validate an admin alert payload; returns the fields to set."""
+    if not isinstance(data, dict):
+        raise InvalidQuery('JSON body required')
+    fields = {}
+    for field in ('disease_name', 'location', 'severity', 'description'):
+        if field in data:
+            value = data[field]
+            if value is not None and not isinstance(value, str):
+                raise InvalidQuery(f'{field} must be a string')
+            fields[field] = value.strip() if value else value
+        elif not partial and field != 'description':
+            raise InvalidQuery(f'{field} is required')
+    for field in ('disease_name', 'location', 'severity'):
+        if field in fields and not fields[field]:
+            raise InvalidQuery(f'{field} must not be empty')
+    if 'severity' in fields:
+        if fields['severity'].lower() not in SEVERITY_LEVELS:
+            raise InvalidQuery('severity must be one of low, medium, high, critical')
+        fields['severity'] = fields['severity'].capitalize()
+    if 'is_active' in data:
+        fields['is_active'] = bool(data['is_active'])
+    return fields
+
+@api.route('/api/admin/alerts', methods=['POST'])
+@admin_required
+def create_alert():
+    """Create an outbreak alert and notify stream subscribers."""
+    try:
+        alert = OutbreakAlert(**parse_alert_fields(request.get_json(silent=True)))
+        db.session.add(alert)
+        db.session.commit()
+        return jsonify({'alert': alert_to_dict(alert)}), 201
+        
+    except InvalidQuery as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+@api.route('/api/admin/alerts/<int:alert_id>', methods=['PUT', 'PATCH'])
+@admin_required
+def update_alert(alert_id):
+    """Update fields of an outbreak alert."""
+    try:
+        alert = db.session.get(OutbreakAlert, alert_id)
+        if not alert:
+            return jsonify({'error': 'Alert not found'}), 404
+        
+        for field, value in parse_alert_fields(request.get_json(silent=True), partial=True).items():
+            setattr(alert, field, value)
+        db.session.commit()
+        return jsonify({'alert': alert_to_dict(alert)}), 200
+        
+    except InvalidQuery as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+@api.route('/api/admin/alerts/<int:alert_id>', methods=['DELETE'])
+@admin_required
+def deactivate_alert(alert_id):
+    """Deactivate an outbreak alert (it stays in the database)."""
+    try:
+        alert = db.session.get(OutbreakAlert, alert_id)
+        if not alert:
+            return jsonify({'error': 'Alert not found'}), 404
+        
+        alert.is_active = False
+        db.session.commit()
+        return jsonify({'alert': alert_to_dict(alert)}), 200
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+def link_disease_symptoms(diseases, symptom_ids):
+    """Insert symptom links for (id, symptoms) rows, adding unseen symptom names.
+
+    symptom_ids (name -> id) is updated in place; returns the link count.
+    """
+    names_by_disease = {disease_id: symptom_names(text) for disease_id, text in diseases}
+    
+    new_names = sorted({n for names in names_by_disease.values() for n in names} - symptom_ids.keys())
+    if new_names:
+        db.session.execute(Symptom.__table__.insert(), [{'name': name} for name in new_names])
+        symptom_ids.update(db.session.query(Symptom.name, Symptom.id).filter(Symptom.name.in_(new_names)).all())
+    
+    links = [
+        {'disease_id': disease_id, 'symptom_id': symptom_ids[name]}
+        for disease_id, names in names_by_disease.items()
+        for name in names
+    ]
+    if links:
+        db.session.execute(disease_symptom.insert(), links)
+    return len(links)
+
+def sync_disease_symptoms(after_id=None, chunk_size=1000):
+    """Rebuild the disease-symptom links from Disease.symptoms; returns the link count.
+
+    With after_id only diseases with a larger id (and no links yet) are linked.
+    Diseases are read in id order, chunk_size at a time.
+    """
+    if after_id is None:
+        db.session.execute(disease_symptom.delete())
+    symptom_ids = dict(db.session.query(Symptom.name, Symptom.id).all())
+    last_id = after_id or 0
+    link_count = 0
+    
+    while True:
+        diseases = db.session.query(Disease.id, Disease.symptoms).filter(
+            Disease.id > last_id
+        ).order_by(Disease.id).limit(chunk_size).all()
+        if not diseases:
+            break
+        last_id = diseases[-1].id
+        link_count += link_disease_symptoms(diseases, symptom_ids)
+    db.session.commit()
+    reference_cache.invalidate('diseases')
+    return link_count
+
 # Initialize database and comprehensive disease data
+def ensure_columns():
+    """Add nullable columns added to models after their tables already existed."""
+    inspector = inspect(db.engine)
+    for table in db.metadata.sorted_tables:
+        existing = {column['name'] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in existing or not column.nullable:
+                continue
+            column_type = column.type.compile(db.engine.dialect)
+            with db.engine.begin() as conn:
+                conn.execute(db.text(f'ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}'))
+            print(f"✅ Added column {table.name}.{column.name}")
+
+def ensure_indexes():
+    """Create indexes added to models after their tables already existed, and the search index."""
+    for table in db.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(db.engine, checkfirst=True)
+    disease_search.setup(db.engine)
+
+def seed_regions():
+    """Fill the region alias table and backfill alerts saved without a region."""
+    if not Region.query.first():
+        db.session.execute(Region.__table__.insert(), [
+            {'alias': alias, 'region_key': region_key} for alias, region_key in alias_rows()
+        ])
+        db.session.commit()
+    
+    alerts = OutbreakAlert.query.filter(OutbreakAlert.region_key.is_(None)).all()
+    if alerts:
+        connection = db.session.connection()
+        for alert in alerts:
+            alert.region_key = resolve_region(connection, alert.location)
+        db.session.commit()
+
+# Seed file record layouts: natural key, list-valued fields and allowed values
+SEED_SPECS = {
+    'diseases': SeedSpec(Disease.__table__, key=('name',), lists=('symptoms', 'prevention')),
+    'vaccinations': SeedSpec(VaccinationSchedule.__table__, key=('age_group', 'vaccine_name', 'country')),
+    'alerts': SeedSpec(
+        OutbreakAlert.__table__, key=('disease_name', 'location'),
+        exclude=('region_key',), choices={'severity': SEVERITY_LEVELS}
+    ),
+}
+
+SEED_CACHE_NAMESPACES = {'diseases': 'diseases', 'vaccinations': 'vaccination', 'alerts': 'alerts'}
+
+def resolve_alert_regions(connection, rows):
+    """Set region_key on bulk-inserted alert rows (the ORM listener doesn't see them)."""
+    regions = {}
+    for row in rows:
+        if row['location'] not in regions:
+            regions[row['location']] = resolve_region(connection, row['location'])
+        row['region_key'] = regions[row['location']]
+
+def print_seed_progress(report):
+    if report.batches % 10 == 0:
+        print(f"⏳ {report.kind}: {report.read:,} records read ({report.rows_per_second:,.0f} rows/s)")
+
+def seed_from_file(kind, source, fmt=None, batch_size=None, progress=print_seed_progress,
+                   refresh_indexes=True):
+    """Stream, validate and bulk-insert one kind of record; returns the SeedReport.
+
+    source is a file path, or a text stream read in format fmt. refresh_indexes
+    rebuilds this process's in-memory symptom index after new diseases.
+    """
+    spec = SEED_SPECS[kind]
+    records = iter_file_records(source, fmt) if isinstance(source, str) else iter_records(source, fmt)
+    
+    # Batches commit on their own connections; don't hold a write lock against them
+    db.session.commit()
+    last_disease_id = db.session.query(db.func.max(Disease.id)).scalar() if kind == 'diseases' else None
+    report = load_records(
+        db.engine, spec, records, kind=kind,
+        batch_size=batch_size or current_app.config['SEED_BATCH_SIZE'],
+        prepare_batch=resolve_alert_regions if kind == 'alerts' else None,
+        progress=progress
+    )
+    
+    if kind == 'diseases' and report.inserted:
+        sync_disease_symptoms(after_id=last_disease_id or 0)
+        if refresh_indexes:
+            refresh_catalog_indexes()
+        chat_cache.clear()
+    reference_cache.invalidate(SEED_CACHE_NAMESPACES[kind])
+    print(f"✅ Seeded {kind}: {report.inserted:,} inserted, {report.skipped:,} skipped, "
+          f"{report.rejected:,} rejected in {report.seconds:.2f}s ({report.rows_per_second:,.0f} rows/s)")
+    return report
+
+def reseed_catalog():
+    """Bring the catalog in line with the seed files in one transaction; returns the SeedReports.
+
+    Diseases and vaccination schedules are matched on their natural key and
+    compared by content hash: new ones are inserted, changed ones updated in
+    place and ones no longer in the files deleted, so an unchanged reseed
+    writes nothing. Sample alerts are only added when missing; live alerts
+    are never touched. Readers see the old catalog until the commit.
+    disease_data is reloaded from the seed file so the indexes built from it
+    match the new catalog.
+    """
+    global disease_data
+    last_disease_id = db.session.query(db.func.max(Disease.id)).scalar() or 0
+    reports = {}
+    try:
+        connection = db.session.connection()
+        for kind, filename in SEED_FILES.items():
+            reports[kind] = sync_records(
+                connection, SEED_SPECS[kind], iter_file_records(os.path.join(SEED_DATA_DIR, filename)),
+                kind=kind, batch_size=current_app.config['SEED_BATCH_SIZE'],
+                update=kind != 'alerts', delete=kind != 'alerts',
+                prepare_batch=resolve_alert_regions if kind == 'alerts' else None
+            )
+        
+        diseases = reports['diseases']
+        stale_links = diseases.updated_ids + diseases.deleted_ids
+        if stale_links:
+            db.session.execute(disease_symptom.delete().where(disease_symptom.c.disease_id.in_(stale_links)))
+        if diseases.inserted or diseases.updated:
+            relink = db.session.query(Disease.id, Disease.symptoms).filter(
+                or_(Disease.id.in_(diseases.updated_ids), Disease.id > last_disease_id)
+            ).all()
+            link_disease_symptoms(relink, dict(db.session.query(Symptom.name, Symptom.id).all()))
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+    
+    for kind, report in reports.items():
+        if report.changed:
+            reference_cache.invalidate(SEED_CACHE_NAMESPACES[kind])
+    new_disease_data = load_disease_data()
+    if reports['diseases'].changed or new_disease_data != disease_data:
+        disease_data = new_disease_data
+        refresh_catalog_indexes()
+        chat_cache.clear()
+    return reports
+
 def initialize_database():
     """Initialize database with comprehensive disease data."""
     try:
         db.create_all()
+        ensure_columns()
+        ensure_indexes()
+        seed_regions()
         
-        # Add comprehensive disease data
+        # Add comprehensive disease data, vaccination schedules and sample alerts
         if not Disease.query.first():
             print("📚 Adding comprehensive disease database...")
-            
-            # Add all diseases from the disease_data dictionary
-            for disease_name, disease_info in disease_data.items():
-                disease = Disease(
-                    name=disease_name,
-                    symptoms=", ".join(disease_info["symptoms"]),
-                    prevention=", ".join(disease_info["prevention"]),
-                    treatment=disease_info["treatment"],
-                    severity=disease_info["severity"],
-                    category=disease_info["category"]
-                )
-                db.session.add(disease)
-            
-            # Add comprehensive vaccination schedules
-            vaccination_schedules = [
-                # Birth to 2 months
-                VaccinationSchedule(age_group="Birth", vaccine_name="BCG", 
-                                  description="Protects against tuberculosis", is_mandatory=True, country="India"),
-                VaccinationSchedule(age_group="Birth", vaccine_name="Hepatitis B", 
-                                  description="Protects against hepatitis B", is_mandatory=True, country="India"),
-                VaccinationSchedule(age_group="6 weeks", vaccine_name="DPT-1", 
-                                  description="Diphtheria, Pertussis, Tetanus - First dose", is_mandatory=True, country="India"),
-                VaccinationSchedule(age_group="6 weeks", vaccine_name="OPV-1", 
-                                  description="Oral Polio Vaccine - First dose", is_mandatory=True, country="India"),
-                VaccinationSchedule(age_group="6 weeks", vaccine_name="Hib-1", 
-                                  description="Haemophilus influenzae type b - First dose", is_mandatory=True, country="India"),
-                
-                # 2-4 months
-                VaccinationSchedule(age_group="10 weeks", vaccine_name="DPT-2", 
-                                  description="Diphtheria, Pertussis, Tetanus - Second dose", is_mandatory=True, country="India"),
-                VaccinationSchedule(age_group="10 weeks", vaccine_name="OPV-2", 
-                                  description="Oral Polio Vaccine - Second dose", is_mandatory=True, country="India"),
-                VaccinationSchedule(age_group="10 weeks", vaccine_name="Hib-2", 
-                                  description="Haemophilus influenzae type b - Second dose", is_mandatory=True, country="India"),
-                
-                # 6-9 months
-                VaccinationSchedule(age_group="14 weeks", vaccine_name="DPT-3", 
-                                  description="Diphtheria, Pertussis, Tetanus - Third dose", is_mandatory=True, country="India"),
-                VaccinationSchedule(age_group="14 weeks", vaccine_name="OPV-3", 
-                                  description="Oral Polio Vaccine - Third dose", is_mandatory=True, country="India"),
-                VaccinationSchedule(age_group="14 weeks", vaccine_name="Hib-3", 
-                                  description="Haemophilus influenzae type b - Third dose", is_mandatory=True, country="India"),
-                VaccinationSchedule(age_group="9 months", vaccine_name="Measles", 
-                                  description="Protects against measles", is_mandatory=True, country="India"),
-                
-                # 12-15 months
-                VaccinationSchedule(age_group="12-15 months", vaccine_name="MMR", 
-                                  description="Measles, Mumps, Rubella", is_mandatory=True, country="India"),
-                VaccinationSchedule(age_group="12-15 months", vaccine_name="Chickenpox", 
-                                  description="Protects against chickenpox", is_mandatory=False, country="India"),
-                
-                # 16-24 months
-                VaccinationSchedule(age_group="16-24 months", vaccine_name="DPT Booster", 
-                                  description="Diphtheria, Pertussis, Tetanus Booster", is_mandatory=True, country="India"),
-                VaccinationSchedule(age_group="16-24 months", vaccine_name="OPV Booster", 
-                                  description="Oral Polio Vaccine Booster", is_mandatory=True, country="India"),
-                
-                # 5-6 years
-                VaccinationSchedule(age_group="5-6 years", vaccine_name="DPT Booster 2", 
-                                  description="Diphtheria, Pertussis, Tetanus Second Booster", is_mandatory=True, country="India"),
-                VaccinationSchedule(age_group="5-6 years", vaccine_name="OPV Booster 2", 
-                                  description="Oral Polio Vaccine Second Booster", is_mandatory=True, country="India"),
-                
-                # 10-12 years
-                VaccinationSchedule(age_group="10-12 years", vaccine_name="Tdap", 
-                                  description="Tetanus, Diphtheria, Pertussis", is_mandatory=True, country="India"),
-                VaccinationSchedule(age_group="10-12 years", vaccine_name="HPV", 
-                                  description="Human Papillomavirus (for girls)", is_mandatory=False, country="India"),
-                
-                # Adults
-                VaccinationSchedule(age_group="Adults", vaccine_name="Td Booster", 
-                                  description="Tetanus, Diphtheria (every 10 years)", is_mandatory=False, country="India"),
-                VaccinationSchedule(age_group="Adults", vaccine_name="Influenza", 
-                                  description="Annual flu vaccine", is_mandatory=False, country="India"),
-                VaccinationSchedule(age_group="Adults", vaccine_name="COVID-19", 
-                                  description="COVID-19 vaccine and boosters", is_mandatory=False, country="India"),
-                
-                # Elderly (65+)
-                VaccinationSchedule(age_group="65+ years", vaccine_name="Pneumococcal", 
-                                  description="Protects against pneumonia", is_mandatory=False, country="India"),
-                VaccinationSchedule(age_group="65+ years", vaccine_name="Shingles", 
-                                  description="Protects against shingles", is_mandatory=False, country="India")
-            ]
-            
-            for vaccine in vaccination_schedules:
-                db.session.add(vaccine)
-            
-            # Add sample outbreak alerts
-            outbreak_alerts = [
-                OutbreakAlert(disease_name="Dengue Fever", location="Mumbai", severity="High", 
-                             description="Increased cases reported in suburban areas. Use mosquito nets and repellents."),
-                OutbreakAlert(disease_name="Malaria", location="Rural Maharashtra", severity="Medium", 
-                             description="Seasonal increase in malaria cases. Ensure proper mosquito control measures."),
-                OutbreakAlert(disease_name="Chikungunya", location="Delhi", severity="Medium", 
-                             description="Rising cases in certain districts. Take preventive measures against mosquito bites.")
-            ]
-            
-            for alert in outbreak_alerts:
-                db.session.add(alert)
-            
-            db.session.commit()
-            print(f"✅ Added {len(disease_data)} diseases to database")
-            print(f"✅ Added {len(vaccination_schedules)} vaccination schedules")
-            print(f"✅ Added {len(outbreak_alerts)} outbreak alerts")
+            for kind, filename in SEED_FILES.items():
+                seed_from_file(kind, os.path.join(SEED_DATA_DIR, filename))
             print("✅ Comprehensive health database initialized successfully!")
+        
+        if not db.session.query(disease_symptom).first():
+            links = sync_disease_symptoms()
+            print(f"✅ Linked diseases to symptoms ({links} links)")
     except Exception as e:
         print(f"❌ Error initializing database: {e}")
 
+def register_migrate_commands(flask_app):
+    """`flask db ...` (Flask-Migrate), importing alembic only when the command runs."""
+    import click
+    from flask.cli import ScriptInfo
+    
+    @flask_app.cli.command('db', add_help_option=False, context_settings={
+        'ignore_unknown_options': True, 'allow_extra_args': True
+    })
+    @click.pass_context
+    def db_command(ctx):
+        """Perform database migrations (Flask-Migrate)."""
+        from flask_migrate import Migrate
+        from flask_migrate.cli import db as db_cli_group
+        
+        Migrate(flask_app, db)
+        db_cli_group.main(
+            args=ctx.args, prog_name=ctx.command_path,
+            obj=ctx.find_object(ScriptInfo), standalone_mode=False
+        )
+
+def app_engine(flask_app):
+    """Database engine of flask_app, for threads that run outside its app context."""
+    with flask_app.app_context():
+        return db.engine
+
+def init_services(flask_app):
+    """(Re)build the process-wide services from the settings of flask_app."""
+    global chat_cache, user_cache, reference_cache, llm_executor, llm_breaker
+    global export_executor, password_executor, alert_hub, alert_relay, chat_jobs, export_jobs, chat_writer
+    settings = flask_app.config
+    
+    # Cache of LLM answers keyed on (normalized message, language, prompt version)
+    chat_cache = TTLCache(settings['CHAT_CACHE_SIZE'], settings['CHAT_CACHE_TTL'])
+    
+    # User snapshots for JWT-protected endpoints; the TTL bounds staleness in other worker processes
+    user_cache = TTLCache(settings['USER_CACHE_SIZE'], settings['USER_CACHE_TTL'])
+    
+    # Serialized reference-data responses; the TTL bounds staleness in other worker processes
+    reference_cache = ResponseCache(settings['REFERENCE_CACHE_SIZE'], settings['REFERENCE_CACHE_TTL'])
+    
+    # Bounded pool for LLM calls
+    llm_executor = BoundedExecutor(
+        max_workers=settings['LLM_MAX_CONCURRENCY'],
+        max_queue=settings['LLM_MAX_QUEUE'],
+        timeout=settings['LLM_TIMEOUT'],
+        name='llm'
+    )
+    
+    # Stops calling the LLM while it is failing or too slow, probing for recovery
+    llm_breaker = CircuitBreaker(
+        window_seconds=settings['LLM_BREAKER_WINDOW'],
+        min_calls=settings['LLM_BREAKER_MIN_CALLS'],
+        failure_rate=settings['LLM_BREAKER_FAILURE_RATE'],
+        slow_call_seconds=settings['LLM_BREAKER_SLOW_CALL'],
+        open_seconds=settings['LLM_BREAKER_OPEN_SECONDS']
+    )
+    
+    # Pool for background export jobs; finished files live in UPLOAD_FOLDER/exports
+    export_executor = BoundedExecutor(
+        max_workers=settings['EXPORT_WORKERS'],
+        max_queue=settings['EXPORT_MAX_QUEUE'],
+        name='export'
+    )
+    
+    # bcrypt runs in its own processes so logins don't hold the GIL of web workers
+    password_executor = BoundedExecutor(
+        max_workers=settings['PASSWORD_HASH_WORKERS'],
+        max_queue=settings['PASSWORD_HASH_MAX_QUEUE'],
+        timeout=settings['PASSWORD_HASH_TIMEOUT'],
+        name='password',
+        processes=True
+    )
+    
+    # Outbreak alert changes pushed to /api/outbreak-alerts/stream subscribers; each
+    # open stream holds a request thread, so they are capped per process
+    alert_hub = AlertHub(settings['ALERT_STREAM_BUFFER'], settings['ALERT_STREAM_MAX_SUBSCRIBERS'])
+    
+    # Feeds alert changes committed by any worker process into this process's hub
+    alert_relay = AlertEventRelay(
+        alert_hub, AlertEvent.__table__, functools.partial(app_engine, flask_app),
+        poll_interval=settings['ALERT_EVENT_POLL_INTERVAL'], retention=settings['ALERT_EVENT_RETENTION']
+    )
+    
+    # Async chat jobs: any worker can answer a status poll for a job another one started
+    chat_jobs = DatabaseJobStore(
+        BackgroundJob.__table__, 'chat', lambda: db.engine,
+        ttl=settings['CHAT_JOB_TTL'], stale_after=settings['CHAT_JOB_TIMEOUT']
+    )
+    
+    # Background export jobs; the artifacts they point to are on disk in export_dir()
+    export_jobs = DatabaseJobStore(
+        BackgroundJob.__table__, 'export', lambda: db.engine,
+        ttl=settings['EXPORT_ARTIFACT_MAX_AGE'], stale_after=settings['EXPORT_JOB_TIMEOUT']
+    )
+    
+    # Optional write-behind queue so chat responses don't wait on the commit
+    if chat_writer is not None:
+        chat_writer.stop()
+    chat_writer = None
+    if settings['CHAT_WRITE_BEHIND']:
+        chat_writer = WriteBehindQueue(
+            functools.partial(write_chat_batch, flask_app),
+            batch_size=settings['CHAT_WRITE_BATCH_SIZE'],
+            flush_interval=settings['CHAT_WRITE_FLUSH_INTERVAL'],
+            max_pending=settings['CHAT_WRITE_MAX_PENDING']
+        )
+    
+    # Create upload directories
+    os.makedirs(settings['UPLOAD_FOLDER'], exist_ok=True)
+    os.makedirs(export_dir(settings), exist_ok=True)
+
+def create_app(overrides=None):
+    """Build the Flask application: settings, services, extensions and routes."""
+    flask_app = Flask(__name__)
+    flask_app.config.from_mapping(config)
+    if overrides:
+        flask_app.config.from_mapping(overrides)
+    apply_database_config(flask_app.config)
+    init_services(flask_app)
+    
+    db.init_app(flask_app)
+    with flask_app.app_context():
+        for engine in db.engines.values():
+            install_sqlite_pragmas(engine, flask_app.config)
+    jwt.init_app(flask_app)
+    CORS(flask_app, expose_headers=['Content-Disposition'])
+    register_migrate_commands(flask_app)
+    flask_app.register_blueprint(api)
+    return flask_app
+
+# The application served by gunicorn (app:app) and used by background workers
+app = create_app()
+
 if __name__ == '__main__':
     with app.app_context():
         initialize_database()
-    app.run(debug=True, host='0.0.0.0', port=int(os.getenv('PORT', 5000)))
+    app.run(debug=os.getenv('FLASK_ENV') == 'development', host='0.0.0.0', port=int(os.getenv('PORT', 5000)))
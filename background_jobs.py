@@ -0,0 +1,101 @@
+"""
+Registry of background jobs (async chat answers, exports).
+
+Jobs are kept in a database table rather than process memory, so with several
+worker processes any of them can report on a job another one started. The
+table is passed in, as with SeedSpec, and may hold several kinds of job: each
+store only sees, counts and purges the rows of its own kind.
+"""
+
+import json
+import uuid
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete, func, insert, select, update
+
+
+class DatabaseJobStore:
+    """Job registry in a table shared by every worker process.
+
+    The table needs the columns id, owner, kind, status, meta, result, error,
+    created_at and finished_at (meta and result hold JSON text). get_engine is
+    called for each operation, so the store follows the current app's database.
+    Every change is committed straight away on its own connection.
+
+    A job still unfinished after stale_after seconds is reported as failed:
+    the process running it has most likely exited.
+    """
+
+    def __init__(self, table, kind, get_engine, ttl=600, max_jobs=10000, stale_after=None):
+        self.table = table
+        self.kind = kind
+        self.get_engine = get_engine
+        self.ttl = ttl
+        self.max_jobs = max_jobs
+        self.stale_after = stale_after
+
+    def create(self, owner, **meta):
+        """Register a new pending job and return its id, or None when full."""
+        now = datetime.utcnow()
+        job_id = uuid.uuid4().hex
+        with self.get_engine().begin() as connection:
+            connection.execute(delete(self.table).where(
+                self.table.c.kind == self.kind,
+                self.table.c.finished_at < now - timedelta(seconds=self.ttl)
+            ))
+            count = connection.execute(
+                select(func.count()).select_from(self.table).where(self.table.c.kind == self.kind)
+            ).scalar()
+            if count >= self.max_jobs:
+                return None
+            connection.execute(insert(self.table).values(
+                id=job_id, owner=owner, kind=self.kind, status='pending',
+                meta=json.dumps(meta), created_at=now
+            ))
+        return job_id
+
+    def update(self, job_id, **fields):
+        with self.get_engine().begin() as connection:
+            connection.execute(update(self.table).where(
+                self.table.c.id == job_id, self.table.c.kind == self.kind
+            ).values(**fields))
+
+    def complete(self, job_id, result):
+        self.update(job_id, status='completed', result=json.dumps(result), finished_at=datetime.utcnow())
+
+    def fail(self, job_id, error):
+        self.update(job_id, status='failed', error=error, finished_at=datetime.utcnow())
+
+    def get(self, job_id, owner):
+        """Return the job as a dict if it exists and belongs to owner."""
+        with self.get_engine().connect() as connection:
+            row = connection.execute(select(self.table).where(
+                self.table.c.id == job_id, self.table.c.kind == self.kind
+            )).first()
+        if row is None or row.owner != owner:
+            return None
+
+        job = json.loads(row.meta or '{}')
+        job.update({
+            'id': row.id,
+            'owner': row.owner,
+            'kind': row.kind,
+            'status': row.status,
+            'result': json.loads(row.result) if row.result else None,
+            'error': row.error,
+            'created_at': row.created_at,
+            'finished_at': row.finished_at,
+        })
+        if (row.finished_at is None and self.stale_after
+                and datetime.utcnow() - row.created_at > timedelta(seconds=self.stale_after)):
+            job.update(status='failed', error='Job was interrupted. Please try again.')
+        return job
+
+    def stats(self):
+        with self.get_engine().connect() as connection:
+            counts = dict(connection.execute(
+                select(self.table.c.status, func.count())
+                .where(self.table.c.kind == self.kind)
+                .group_by(self.table.c.status)
+            ).all())
+        return {'total': sum(counts.values()), 'by_status': counts}
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Concurrent read/write throughput of the SQLite database under different settings.
+
+Writer threads commit one ChatHistory row per transaction (like /api/chat
+without write-behind) while reader threads page through chat history and
+the disease list (like /api/chat/history and /api/diseases). Each profile
+runs in a fresh process against a throwaway database:
+
+    stock - rollback journal, synchronous=FULL, no mmap (SQLite defaults)
+    tuned - the db_config defaults: WAL, synchronous=NORMAL, mmap, busy timeout
+
+Usage: python benchmarks/bench_db_concurrency.py [--writers 4] [--readers 8] [--seconds 5]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROFILES = {
+    'stock': {
+        'SQLITE_JOURNAL_MODE': 'delete',
+        'SQLITE_SYNCHRONOUS': 'full',
+        'SQLITE_MMAP_SIZE': '0',
+        'SQLITE_CACHE_SIZE': '-2000',
+    },
+    'tuned': {},
+}
+
+
+def run_workload(writers, readers, seconds):
+    """Child process: run the mixed workload and print one JSON result line."""
+    import threading
+    import time
+
+    from sqlalchemy.exc import OperationalError
+
+    sys.path.insert(0, ROOT)
+    from app import app, db, initialize_database, ChatHistory, Disease, User
+
+    with app.app_context():
+        initialize_database()
+        user = User(username='bench', email='bench@example.com', password_hash='x', full_name='Bench')
+        db.session.add(user)
+        db.session.commit()
+        user_id = user.id
+        journal_mode = db.session.execute(db.text('PRAGMA journal_mode')).scalar()
+
+    stop = threading.Event()
+    lock = threading.Lock()
+    results = {'write': [], 'read': [], 'errors': 0}
+
+    def record(kind, latency):
+        with lock:
+            results[kind].append(latency)
+
+    def writer():
+        with app.app_context():
+            while not stop.is_set():
+                start = time.perf_counter()
+                try:
+                    db.session.add(ChatHistory(
+                        user_id=user_id, message='How do I prevent dengue?',
+                        response='Use mosquito nets and remove standing water. ' * 20
+                    ))
+                    db.session.commit()
+                    record('write', time.perf_counter() - start)
+                except OperationalError:
+                    db.session.rollback()
+                    with lock:
+                        results['errors'] += 1
+
+    def reader():
+        with app.app_context():
+            while not stop.is_set():
+                start = time.perf_counter()
+                try:
+                    db.session.query(
+                        ChatHistory.id, ChatHistory.message, ChatHistory.response, ChatHistory.timestamp
+                    ).filter(ChatHistory.user_id == user_id).order_by(
+                        ChatHistory.timestamp.desc(), ChatHistory.id.desc()
+                    ).limit(20).all()
+                    db.session.query(Disease.id, Disease.name, Disease.symptoms).all()
+                    db.session.rollback()
+                    record('read', time.perf_counter() - start)
+                except OperationalError:
+                    db.session.rollback()
+                    with lock:
+                        results['errors'] += 1
+
+    threads = [threading.Thread(target=writer) for _ in range(writers)]
+    threads += [threading.Thread(target=reader) for _ in range(readers)]
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    def summary(latencies):
+        latencies.sort()
+        p95 = latencies[int(len(latencies) * 0.95)] if latencies else 0.0
+        return {'ops_per_second': len(latencies) / seconds, 'p95_ms': p95 * 1000}
+
+    print(json.dumps({
+        'journal_mode': journal_mode,
+        'write': summary(results['write']),
+        'read': summary(results['read']),
+        'errors': results['errors'],
+    }))
+
+
+def run_profile(name, args):
+    with tempfile.TemporaryDirectory(prefix='bench_db_') as tmp_dir:
+        env = dict(os.environ)
+        env.update(PROFILES[name])
+        env['DATABASE_URL'] = 'sqlite:///' + os.path.join(tmp_dir, 'bench.db')
+        env['UPLOAD_FOLDER'] = os.path.join(tmp_dir, 'uploads')
+        env.setdefault('JWT_SECRET_KEY', 'bench-secret-key-bench-secret-key')
+        env['LLM_BACKEND'] = 'stub'
+        env.pop('DATABASE_REPLICA_URL', None)
+        result = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), '--child',
+             '--writers', str(args.writers), '--readers', str(args.readers), '--seconds', str(args.seconds)],
+            cwd=ROOT, env=env, capture_output=True, text=True, check=True
+        )
+        return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--writers', type=int, default=4)
+    parser.add_argument('--readers', type=int, default=8)
+    parser.add_argument('--seconds', type=float, default=5)
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_workload(args.writers, args.readers, args.seconds)
+        return
+
+    print(f"📊 {args.writers} writers + {args.readers} readers for {args.seconds:g}s per profile")
+    results = {name: run_profile(name, args) for name in PROFILES}
+    for name, result in results.items():
+        print(f"  {name:<6} ({result['journal_mode']:<6}) "
+              f"writes {result['write']['ops_per_second']:8.0f}/s p95 {result['write']['p95_ms']:7.1f} ms   "
+              f"reads {result['read']['ops_per_second']:8.0f}/s p95 {result['read']['p95_ms']:7.1f} ms   "
+              f"errors {result['errors']}")
+    stock, tuned = results['stock'], results['tuned']
+    for kind in ('write', 'read'):
+        before = stock[kind]['ops_per_second']
+        after = tuned[kind]['ops_per_second']
+        print(f"  {kind}s: {after / before:.1f}x" if before else f"  {kind}s: n/a")
+
+
+if __name__ == '__main__':
+    main()
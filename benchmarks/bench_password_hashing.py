@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Benchmark: logins per second per core for bcrypt password verification.
+
+Measures check_password inline (one core) at several work factors, then
+through the password process pool with one worker per core, and finally
+end-to-end /api/login requests from concurrent client threads against a
+throwaway SQLite database.
+
+Usage: python benchmarks/bench_password_hashing.py [seconds_per_case]
+"""
+
+import os
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+_tmp_dir = tempfile.mkdtemp(prefix='bench_password_')
+os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.join(_tmp_dir, 'bench.db')
+os.environ.setdefault('JWT_SECRET_KEY', 'bench-secret-key-bench-secret-key')
+os.environ.setdefault('LLM_BACKEND', 'stub')
+
+from bounded_executor import BoundedExecutor  # noqa: E402
+from password_hashing import check_password, hash_password  # noqa: E402
+
+PASSWORD = 'correct horse battery staple'
+CORES = os.cpu_count() or 1
+
+
+def run_for(seconds, fn):
+    count = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        fn()
+        count += 1
+    return count / (time.perf_counter() - start)
+
+
+def bench_inline(seconds):
+    print("🔐 Inline check_password (1 core)")
+    for rounds in (10, 11, 12):
+        pw_hash = hash_password(PASSWORD, rounds)
+        rate = run_for(seconds, lambda: check_password(PASSWORD, pw_hash))
+        print(f"  cost {rounds}: {rate:8.1f} logins/s per core  ({1000 / rate:6.1f} ms each)")
+
+
+def bench_pool(seconds, rounds=12):
+    pool = BoundedExecutor(max_workers=CORES, max_queue=CORES * 4, timeout=60, name='bench', processes=True)
+    pw_hash = hash_password(PASSWORD, rounds)
+    pool.call(check_password, PASSWORD, pw_hash)  # start the worker processes
+
+    done = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        futures = [pool.submit(check_password, PASSWORD, pw_hash) for _ in range(CORES * 2)]
+        done += sum(1 for f in futures if f.result())
+    elapsed = time.perf_counter() - start
+    rate = done / elapsed
+    print(f"🔐 Process pool, cost {rounds}, {CORES} worker(s): "
+          f"{rate:8.1f} logins/s total, {rate / CORES:8.1f} per core")
+
+
+def bench_endpoint(seconds, threads=8):
+    from app import app, db, User
+
+    with app.app_context():
+        db.create_all()
+        if not User.query.filter_by(email='bench@example.com').first():
+            db.session.add(User(
+                username='bench', email='bench@example.com', full_name='Bench',
+                password_hash=hash_password(PASSWORD, app.config['BCRYPT_LOG_ROUNDS'])
+            ))
+            db.session.commit()
+
+    counts = [0] * threads
+    errors = [0] * threads
+    stop = time.perf_counter() + seconds
+
+    def worker(i):
+        client = app.test_client()
+        while time.perf_counter() < stop:
+            r = client.post('/api/login', json={'email': 'bench@example.com', 'password': PASSWORD})
+            if r.status_code == 200:
+                counts[i] += 1
+            else:
+                errors[i] += 1
+
+    workers = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    start = time.perf_counter()
+    for t in workers:
+        t.start()
+    for t in workers:
+        t.join()
+    rate = sum(counts) / (time.perf_counter() - start)
+    print(f"🌐 /api/login, cost {app.config['BCRYPT_LOG_ROUNDS']}, {threads} client threads: "
+          f"{rate:8.1f} logins/s, {rate / CORES:8.1f} per core, {sum(errors)} non-200")
+
+
+def main():
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 3
+    print(f"📊 {CORES} core(s), {seconds:.0f}s per case")
+    bench_inline(seconds)
+    bench_pool(seconds)
+    bench_endpoint(seconds)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: per-row cost of serializing the disease list.
+
+Compares the old path (full ORM objects, hand-built dicts, jsonify) with the
+serializers module (column-only rows, zip into dicts, orjson or json) and a
+sparse field set. Runs against a throwaway SQLite database.
+
+Usage: python benchmarks/bench_serialization.py [rows] [repeats]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+_tmp_dir = tempfile.mkdtemp(prefix='bench_serialization_')
+os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.join(_tmp_dir, 'bench.db')
+os.environ.setdefault('JWT_SECRET_KEY', 'bench-secret-key-bench-secret-key')
+os.environ.setdefault('LLM_BACKEND', 'stub')
+
+from flask import jsonify  # noqa: E402
+
+import serializers  # noqa: E402
+from app import app, db, Disease  # noqa: E402
+from serializers import DISEASE_FIELDS, columns, rows_to_dicts  # noqa: E402
+
+
+def seed(rows):
+    db.create_all()
+    db.session.query(Disease).delete()
+    db.session.bulk_insert_mappings(Disease, [
+        {
+            'name': f'Synthetic disease {i}',
+            'symptoms': 'fever, headache, body aches, fatigue, cough',
+            'prevention': 'Wash hands, vaccination, avoid close contact, rest',
+            'treatment': 'Rest, fluids, paracetamol for fever',
+            'severity': ('mild', 'moderate', 'severe')[i % 3],
+            'category': ('viral', 'bacterial', 'chronic')[i % 3],
+        }
+        for i in range(rows)
+    ])
+    db.session.commit()
+
+
+def orm_jsonify():
+    diseases = Disease.query.all()
+    disease_list = []
+    for disease in diseases:
+        disease_list.append({
+            'id': disease.id,
+            'name': disease.name,
+            'symptoms': disease.symptoms,
+            'prevention': disease.prevention,
+            'treatment': disease.treatment,
+            'severity': disease.severity,
+            'category': disease.category
+        })
+    body = jsonify({'diseases': disease_list}).get_data()
+    db.session.expunge_all()
+    return body
+
+
+def column_rows(fields):
+    def run():
+        rows = db.session.query(*columns(Disease, fields)).all()
+        return serializers.dumps({'diseases': rows_to_dicts(fields, rows)})
+    return run
+
+
+def stdlib_json(fields):
+    run = column_rows(fields)
+
+    def wrapped():
+        encoder, serializers.orjson = serializers.orjson, None
+        try:
+            return run()
+        finally:
+            serializers.orjson = encoder
+    return wrapped
+
+
+def measure(fn, repeats):
+    fn()  # warm up
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        body = fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings), len(body)
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+
+    cases = [
+        ('ORM objects + dict loop + jsonify', orm_jsonify),
+        (f'column rows + {serializers.encoder_name()}', column_rows(DISEASE_FIELDS)),
+        ('column rows + stdlib json', stdlib_json(DISEASE_FIELDS)),
+        ('column rows, fields=name,severity', column_rows(['name', 'severity'])),
+    ]
+
+    with app.app_context():
+        seed(rows)
+        print(f"📊 Serializing {rows} diseases (best of {repeats})")
+        baseline = None
+        for label, fn in cases:
+            best, size = measure(fn, repeats)
+            per_row_us = best / rows * 1e6
+            baseline = baseline or per_row_us
+            print(f"  {label:<38} {best * 1000:8.1f} ms  {per_row_us:6.2f} µs/row  "
+                  f"{baseline / per_row_us:5.1f}x  {size / 1024:8.0f} KiB")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Startup report: time to first request and per-module import cost of app.py.
+
+Each run is a fresh interpreter against a throwaway SQLite database:
+    - time to first request: process start until GET /healthz has been
+      answered through the test client (median of the runs)
+    - import cost: `python -X importtime -c "import app"`, listing the
+      modules app.py imports directly by cumulative time
+
+Pass --budget-ms to exit non-zero when the time to first request exceeds it,
+so a new eager import shows up in CI.
+
+Usage: python benchmarks/bench_startup.py [--runs 5] [--top 15] [--budget-ms N]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+FIRST_REQUEST = """
+import time
+start = float({start!r})
+import app
+response = app.app.test_client().get('/healthz')
+assert response.status_code == 200, response.status_code
+print(time.time() - start)
+"""
+
+
+def bench_env(tmp_dir):
+    env = dict(os.environ)
+    env['DATABASE_URL'] = 'sqlite:///' + os.path.join(tmp_dir, 'bench.db')
+    env['UPLOAD_FOLDER'] = os.path.join(tmp_dir, 'uploads')
+    env.setdefault('JWT_SECRET_KEY', 'bench-secret-key-bench-secret-key')
+    env['PYTHONDONTWRITEBYTECODE'] = '1'
+    return env
+
+
+def time_to_first_request(env):
+    start = time.time()
+    result = subprocess.run(
+        [sys.executable, '-c', FIRST_REQUEST.format(start=start)],
+        cwd=ROOT, env=env, capture_output=True, text=True, check=True
+    )
+    return float(result.stdout.strip().splitlines()[-1])
+
+
+def import_times(env):
+    """(module, self_us, cumulative_us, depth) for every import of app."""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'import app'],
+        cwd=ROOT, env=env, capture_output=True, text=True, check=True
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        depth = (len(name) - len(name.lstrip())) // 2
+        rows.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--top', type=int, default=15)
+    parser.add_argument('--budget-ms', type=float, help='fail if time to first request exceeds this')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix='bench_startup_') as tmp_dir:
+        env = bench_env(tmp_dir)
+        time_to_first_request(env)  # warm the OS file cache
+        timings = [time_to_first_request(env) for _ in range(args.runs)]
+        rows = import_times(env)
+
+    first_request_ms = statistics.median(timings) * 1000
+    app_row = next(row for row in rows if row[0] == 'app')
+    app_depth = app_row[3]
+    # Modules imported directly by app.py are one level below it
+    direct = sorted(
+        (row for row in rows if row[3] == app_depth + 1),
+        key=lambda row: row[2], reverse=True
+    )
+
+    print(f"🚀 Time to first request: {first_request_ms:.0f} ms "
+          f"(median of {args.runs}, min {min(timings) * 1000:.0f} ms)")
+    print(f"📦 import app: {app_row[2] / 1000:.0f} ms cumulative, "
+          f"{app_row[1] / 1000:.0f} ms in app.py itself")
+    print(f"\n  {'module':<32} {'cumulative':>10}  {'share':>5}")
+    for name, _, cumulative_us, _ in direct[:args.top]:
+        print(f"  {name:<32} {cumulative_us / 1000:8.1f} ms  {cumulative_us / app_row[2]:5.0%}")
+
+    if args.budget_ms and first_request_ms > args.budget_ms:
+        print(f"\n❌ Time to first request {first_request_ms:.0f} ms exceeds the "
+              f"{args.budget_ms:.0f} ms budget")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
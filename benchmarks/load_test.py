@@ -0,0 +1,418 @@
+#!/usr/bin/env python3
+"""
+Load test for the HealthBot API.
+
+Boots the app (`run.py serve`, or the dev server) on a free port against a
+throwaway SQLite database, with the stub LLM backend standing in for Gemini,
+then runs virtual users that each keep one HTTP connection and pick requests
+from a weighted mix:
+
+    register, login, chat, diseases, vaccination, alerts, export
+
+Throughput, errors and p50/p95/p99 latency are reported per endpoint and
+saved as JSON, with the split of chat answers by source (llm, cache,
+symptom_engine, fallback). The booted server has the chat cache and direct
+symptom-engine answers turned off so every chat goes through the LLM pool;
+pass --local-answers to keep them. Pass --compare with an earlier result to print the change
+per endpoint; the exit status is non-zero when any p95 regressed by more
+than --max-regression percent.
+
+Usage:
+    python benchmarks/load_test.py --concurrency 16 --duration 30
+    python benchmarks/load_test.py --mix chat=1 --llm-latency-ms 800
+    python benchmarks/load_test.py --url http://127.0.0.1:5000   # running server
+    python benchmarks/load_test.py --compare benchmarks/results/load-20240101-120000.json
+"""
+
+import argparse
+import http.client
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.parse
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(ROOT, 'benchmarks', 'results')
+
+DEFAULT_MIX = 'register=1,login=2,chat=3,diseases=4,vaccination=2,alerts=3,export=1'
+
+CHAT_MESSAGES = [
+    'I have fever, chills and muscle pain',
+    'I have runny nose, sneezing and sore throat',
+    'How can I prevent dengue during the monsoon?',
+    'What should I eat to manage diabetes?',
+    'My child has a cough and mild fever',
+    'Is it safe to exercise with high blood pressure?',
+    'How often should adults get a flu vaccine?',
+    'I feel tired all the time and my skin is pale',
+]
+
+ALERT_QUERIES = ['', '?location=Maharashtra', '?min_severity=high', '?days=30', '?for_me=1']
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def parse_mix(text):
+    mix = {}
+    for part in text.split(','):
+        name, _, weight = part.partition('=')
+        if name.strip() not in WORKLOADS:
+            raise SystemExit(f"Unknown workload '{name}' (use: {', '.join(WORKLOADS)})")
+        mix[name.strip()] = float(weight or 1)
+    return mix
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(int(round(fraction * len(sorted_values) + 0.5)) - 1, 0)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+
+class Client:
+    """One keep-alive HTTP connection with a bearer token."""
+
+    def __init__(self, base_url, timeout):
+        url = urllib.parse.urlsplit(base_url)
+        self.host, self.port = url.hostname, url.port or 80
+        self.timeout = timeout
+        self.token = None
+        self.connection = None
+
+    def request(self, method, path, body=None):
+        """Return (status, body bytes); reconnects once if the server closed the connection."""
+        headers = {'Content-Type': 'application/json'}
+        if self.token:
+            headers['Authorization'] = f'Bearer {self.token}'
+        payload = json.dumps(body).encode('utf-8') if body is not None else None
+        for attempt in (1, 2):
+            if self.connection is None:
+                self.connection = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+            try:
+                self.connection.request(method, path, body=payload, headers=headers)
+                response = self.connection.getresponse()
+                data = response.read()
+                if response.getheader('Connection', '').lower() == 'close':
+                    self.close()
+                return response.status, data
+            except (http.client.HTTPException, ConnectionError):
+                self.close()
+                if attempt == 2:
+                    raise
+
+    def close(self):
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+
+
+class VirtualUser:
+    """A registered account and its client; runs workload steps."""
+
+    counter = 0
+    counter_lock = threading.Lock()
+
+    def __init__(self, base_url, timeout, rng):
+        self.client = Client(base_url, timeout)
+        self.rng = rng
+        self.email = None
+        self.password = 'load-test-password'
+        # How the server produced the last chat answer (llm, cache, symptom_engine, fallback)
+        self.source = None
+
+    @classmethod
+    def next_id(cls):
+        with cls.counter_lock:
+            cls.counter += 1
+            return cls.counter
+
+    def register(self):
+        n = self.next_id()
+        email = f'load{n}-{os.getpid()}@example.com'
+        status, _ = self.client.request('POST', '/api/register', {
+            'username': f'load{n}_{os.getpid()}', 'email': email, 'password': self.password,
+            'full_name': f'Load User {n}', 'location': self.rng.choice(['Mumbai', 'Delhi', 'Chennai', 'Pune']),
+        })
+        if status == 201:
+            self.email = email
+        return status
+
+    def login(self):
+        status, data = self.client.request('POST', '/api/login', {'email': self.email, 'password': self.password})
+        if status == 200:
+            self.client.token = json.loads(data)['access_token']
+        return status
+
+    def chat(self):
+        status, data = self.client.request('POST', '/api/chat', {'message': self.rng.choice(CHAT_MESSAGES)})
+        if status == 200:
+            self.source = json.loads(data).get('source')
+        return status
+
+    def diseases(self):
+        return self.client.request('GET', '/api/diseases')[0]
+
+    def vaccination(self):
+        return self.client.request('GET', '/api/vaccination-schedule')[0]
+
+    def alerts(self):
+        return self.client.request('GET', '/api/outbreak-alerts' + self.rng.choice(ALERT_QUERIES))[0]
+
+    def export(self):
+        return self.client.request('GET', '/api/export-data?format=csv')[0]
+
+
+WORKLOADS = ('register', 'login', 'chat', 'diseases', 'vaccination', 'alerts', 'export')
+
+
+class Recorder:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies = {}
+        self.statuses = {}
+        self.sources = {}
+
+    def record(self, name, seconds, status, source=None):
+        with self.lock:
+            self.latencies.setdefault(name, []).append(seconds)
+            counts = self.statuses.setdefault(name, {})
+            counts[status] = counts.get(status, 0) + 1
+            if source is not None:
+                counts = self.sources.setdefault(name, {})
+                counts[source] = counts.get(source, 0) + 1
+
+    def summary(self, duration):
+        endpoints = {}
+        for name in sorted(self.latencies):
+            latencies = sorted(self.latencies[name])
+            statuses = self.statuses[name]
+            errors = sum(count for status, count in statuses.items() if status == 'error' or status >= 400)
+            endpoints[name] = {
+                'requests': len(latencies),
+                'errors': errors,
+                'throughput_rps': round(len(latencies) / duration, 2),
+                'p50_ms': round(percentile(latencies, 0.50) * 1000, 2),
+                'p95_ms': round(percentile(latencies, 0.95) * 1000, 2),
+                'p99_ms': round(percentile(latencies, 0.99) * 1000, 2),
+                'mean_ms': round(sum(latencies) / len(latencies) * 1000, 2),
+                'statuses': {str(status): count for status, count in sorted(statuses.items(), key=str)},
+            }
+            if name in self.sources:
+                endpoints[name]['sources'] = dict(sorted(self.sources[name].items()))
+        total = sum(endpoint['requests'] for endpoint in endpoints.values())
+        return {
+            'total_requests': total,
+            'total_errors': sum(endpoint['errors'] for endpoint in endpoints.values()),
+            'throughput_rps': round(total / duration, 2),
+            'endpoints': endpoints,
+        }
+
+
+def run_user(base_url, args, mix, recorder, deadline, seed):
+    rng = random.Random(seed)
+    user = VirtualUser(base_url, args.timeout, rng)
+    names = list(mix)
+    weights = [mix[name] for name in names]
+
+    def step(name):
+        user.source = None
+        start = time.perf_counter()
+        try:
+            status = getattr(user, name)()
+        except (OSError, http.client.HTTPException):
+            status = 'error'
+        recorder.record(name, time.perf_counter() - start, status, user.source)
+        return status
+
+    # Every user needs an account and a token before the mix starts
+    if step('register') != 201 or step('login') != 200:
+        return
+    while time.monotonic() < deadline:
+        name = rng.choices(names, weights)[0]
+        if name == 'register':
+            # Switch to a fresh account, then log in to it
+            if step('register') == 201:
+                step('login')
+        else:
+            step(name)
+    user.client.close()
+
+
+def boot_server(args, tmp_dir):
+    """Start the app on a free port; returns (process, base_url, log file)."""
+    port = free_port()
+    env = dict(os.environ)
+    env.update({
+        'DATABASE_URL': 'sqlite:///' + os.path.join(tmp_dir, 'load.db'),
+        'UPLOAD_FOLDER': os.path.join(tmp_dir, 'uploads'),
+        'JWT_SECRET_KEY': env.get('JWT_SECRET_KEY') or 'load-test-secret-key-load-test-secret',
+        'LLM_BACKEND': 'stub',
+        'LLM_STUB_LATENCY_MS': str(args.llm_latency_ms),
+        'BCRYPT_LOG_ROUNDS': str(args.bcrypt_rounds),
+        'PORT': str(port),
+    })
+    if not args.local_answers:
+        # Otherwise most chats are a cache hit or a symptom-engine answer, not an LLM call
+        env.update({'CHAT_CACHE_SIZE': '0', 'SYMPTOM_DIRECT_MIN_MATCHES': '0'})
+    env.pop('DATABASE_REPLICA_URL', None)
+    if args.server == 'gunicorn':
+        command = [sys.executable, 'run.py', 'serve', '--bind', f'127.0.0.1:{port}']
+        if args.workers:
+            command += ['--workers', str(args.workers)]
+        if args.threads:
+            command += ['--threads', str(args.threads)]
+    else:
+        command = [sys.executable, 'run.py', 'dev']
+    log = open(os.path.join(tmp_dir, 'server.log'), 'w')
+    process = subprocess.Popen(command, cwd=ROOT, env=env, stdout=log, stderr=subprocess.STDOUT)
+
+    base_url = f'http://127.0.0.1:{port}'
+    client = Client(base_url, timeout=5)
+    deadline = time.monotonic() + args.boot_timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            break
+        try:
+            if client.request('GET', '/readyz')[0] == 200:
+                client.close()
+                return process, base_url, log
+        except OSError:
+            pass
+        time.sleep(0.25)
+    process.terminate()
+    log.close()
+    with open(log.name) as f:
+        print(f.read()[-2000:])
+    raise SystemExit('❌ Server did not become ready')
+
+
+def compare(result, baseline_path, max_regression):
+    """Print per-endpoint changes against a saved result; returns True if p95 regressed."""
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    print(f"\n🔍 Compared with {baseline_path}")
+    regressed = False
+    for name, current in result['summary']['endpoints'].items():
+        before = baseline['summary']['endpoints'].get(name)
+        if not before:
+            print(f"  {name:<12} (new)")
+            continue
+        p95_change = (current['p95_ms'] / before['p95_ms'] - 1) * 100 if before['p95_ms'] else 0.0
+        rps_change = (current['throughput_rps'] / before['throughput_rps'] - 1) * 100 if before['throughput_rps'] else 0.0
+        flag = ''
+        if p95_change > max_regression:
+            flag = '  ❌ p95 regression'
+            regressed = True
+        print(f"  {name:<12} p95 {before['p95_ms']:8.1f} -> {current['p95_ms']:8.1f} ms ({p95_change:+6.1f}%)"
+              f"   rps {before['throughput_rps']:7.1f} -> {current['throughput_rps']:7.1f} ({rps_change:+6.1f}%){flag}")
+    return regressed
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description='HealthBot API load test')
+    parser.add_argument('--concurrency', type=int, default=8, help='virtual users')
+    parser.add_argument('--duration', type=float, default=20, help='seconds of load after warm-up')
+    parser.add_argument('--mix', default=DEFAULT_MIX, help=f'workload weights (default {DEFAULT_MIX})')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--timeout', type=float, default=60, help='per-request timeout in seconds')
+    parser.add_argument('--url', help='load an already running server instead of booting one')
+    parser.add_argument('--server', choices=('gunicorn', 'dev'), default='gunicorn')
+    parser.add_argument('--workers', type=int, help='gunicorn workers (default from run.py serve)')
+    parser.add_argument('--threads', type=int, help='gunicorn threads per worker')
+    parser.add_argument('--llm-latency-ms', type=float, default=300, help='stub LLM time to first token')
+    parser.add_argument('--local-answers', action='store_true',
+                        help='keep the chat cache and direct symptom-engine answers on')
+    parser.add_argument('--bcrypt-rounds', type=int, default=12)
+    parser.add_argument('--boot-timeout', type=float, default=120)
+    parser.add_argument('--output', help='result JSON path (default benchmarks/results/load-<time>.json)')
+    parser.add_argument('--compare', help='earlier result JSON to compare against')
+    parser.add_argument('--max-regression', type=float, default=20, help='allowed p95 increase in percent')
+    args = parser.parse_args()
+    mix = parse_mix(args.mix)
+
+    with tempfile.TemporaryDirectory(prefix='healthbot_load_') as tmp_dir:
+        process = log = None
+        base_url = args.url
+        if not base_url:
+            print(f"🚀 Booting {args.server} server against a temporary database...")
+            process, base_url, log = boot_server(args, tmp_dir)
+        try:
+            print(f"📊 {args.concurrency} users for {args.duration:g}s against {base_url} (mix {args.mix})")
+            recorder = Recorder()
+            deadline = time.monotonic() + args.duration
+            started = time.monotonic()
+            threads = [
+                threading.Thread(target=run_user, args=(base_url, args, mix, recorder, deadline, args.seed + i))
+                for i in range(args.concurrency)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            elapsed = time.monotonic() - started
+        finally:
+            if process is not None:
+                process.terminate()
+                process.wait(timeout=60)
+                log.close()
+
+    summary = recorder.summary(elapsed)
+    print(f"\n  {'endpoint':<12} {'requests':>8} {'errors':>6} {'rps':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for name, endpoint in summary['endpoints'].items():
+        print(f"  {name:<12} {endpoint['requests']:>8} {endpoint['errors']:>6} {endpoint['throughput_rps']:>8.1f} "
+              f"{endpoint['p50_ms']:>9.1f} {endpoint['p95_ms']:>9.1f} {endpoint['p99_ms']:>9.1f}")
+    print(f"  {'total':<12} {summary['total_requests']:>8} {summary['total_errors']:>6} {summary['throughput_rps']:>8.1f}")
+    for name, endpoint in summary['endpoints'].items():
+        if 'sources' in endpoint:
+            split = ', '.join(f"{source} {count}" for source, count in endpoint['sources'].items())
+            print(f"  {name} answers by source: {split}")
+
+    result = {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'revision': git_revision(),
+        'config': {
+            'concurrency': args.concurrency,
+            'duration_seconds': round(elapsed, 2),
+            'mix': mix,
+            'server': 'external' if args.url else args.server,
+            'workers': args.workers,
+            'threads': args.threads,
+            'llm_latency_ms': args.llm_latency_ms,
+            'local_answers': args.local_answers,
+            'bcrypt_rounds': args.bcrypt_rounds,
+            'seed': args.seed,
+        },
+        'summary': summary,
+    }
+    output = args.output or os.path.join(RESULTS_DIR, time.strftime('load-%Y%m%d-%H%M%S.json'))
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(result, f, indent=2)
+    print(f"\n💾 Saved {output}")
+
+    if args.compare and compare(result, args.compare, args.max_regression):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
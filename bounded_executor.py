@@ -0,0 +1,186 @@
+"""
+Bounded worker pools for work offloaded from request threads.
+
+Each pool (LLM calls, exports, password hashing) has a concurrency limit, a
+per-call deadline and a cap on queued work, so slow calls cannot pin every
+web worker. When a pool is saturated callers get ExecutorSaturated and
+should answer 429 with a Retry-After hint.
+
+Pools run threads by default; with processes=True a pool uses processes for
+CPU-bound functions, which
+must then be picklable module-level functions in modules that import cleanly
+without the app. Pool processes are started with forkserver (spawn where it
+is unavailable), never fork: forking a multi-threaded web worker can leave
+the child holding copies of locks taken by other threads, and deadlock.
+"""
+
+import math
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from concurrent.futures import BrokenExecutor, ProcessPoolExecutor, ThreadPoolExecutor, TimeoutError
+
+
+def process_context():
+    """multiprocessing context for process pools: forkserver, or spawn where unavailable."""
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+
+
+class ExecutorSaturated(Exception):
+    """Raised when a pool already has its maximum amount of work."""
+
+    def __init__(self, retry_after, name='worker'):
+        super().__init__(f"{name} pool is full, retry after {retry_after}s")
+        self.retry_after = retry_after
+
+
+class BoundedExecutor:
+    """Thread (or process) pool with a bounded queue and per-call deadlines."""
+
+    def __init__(self, max_workers=8, max_queue=16, timeout=30.0, name='worker', processes=False):
+        self.name = name
+        self.processes = processes
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._pool = None
+        self._pid = None
+        self._in_flight = 0
+        self._avg_latency = 1.0
+        self.submitted = 0
+        self.rejected = 0
+        self.timeouts = 0
+
+    def _get_pool(self):
+        # Created lazily and per process so forked workers get their own threads
+        if self._pool is None or self._pid != os.getpid():
+            if self.processes:
+                self._pool = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=process_context())
+            else:
+                self._pool = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix=self.name
+                )
+            if self._pid != os.getpid():
+                self._in_flight = 0
+                self._pid = os.getpid()
+        return self._pool
+
+    def retry_after(self):
+        """Rough seconds until a slot frees up, based on recent call latency."""
+        waves = max(self._in_flight - self.max_workers + 1, 1) / self.max_workers
+        return max(1, math.ceil(self._avg_latency * waves))
+
+    def submit(self, fn, *args, **kwargs):
+        """Schedule fn on the pool, raising ExecutorSaturated if it is full."""
+        with self._lock:
+            pool = self._get_pool()
+            if self._in_flight >= self.max_workers + self.max_queue:
+                self.rejected += 1
+                raise ExecutorSaturated(self.retry_after(), self.name)
+            self._in_flight += 1
+            self.submitted += 1
+
+        started = time.monotonic()
+
+        def done(future):
+            elapsed = time.monotonic() - started
+            with self._lock:
+                self._in_flight -= 1
+                self._avg_latency = 0.8 * self._avg_latency + 0.2 * elapsed
+
+        try:
+            try:
+                future = pool.submit(fn, *args, **kwargs)
+            except BrokenExecutor:
+                # A pool process died; start a fresh pool for this and later calls
+                with self._lock:
+                    if self._pool is pool:
+                        self._pool = None
+                    pool = self._get_pool()
+                future = pool.submit(fn, *args, **kwargs)
+        except Exception:
+            done(None)
+            raise
+        future.add_done_callback(done)
+        return future
+
+    def call(self, fn, *args, timeout=None, **kwargs):
+        """Run fn on the pool and wait for it, raising TimeoutError past the deadline.
+
+        A call that misses its deadline keeps its worker until upstream returns,
+        but its result is dropped.
+        """
+        future = self.submit(fn, *args, **kwargs)
+        try:
+            return future.result(timeout=self.timeout if timeout is None else timeout)
+        except TimeoutError:
+            with self._lock:
+                self.timeouts += 1
+            raise
+
+    def stream(self, fn, *args, timeout=None, first_item_timeout=None, **kwargs):
+        """Run the iterator fn(*args) on the pool and return a generator of its items.
+
+        Submission happens immediately, so ExecutorSaturated is raised here rather
+        than on first iteration. The first item must arrive within
+        first_item_timeout (if given) and the whole stream within the deadline;
+        TimeoutError is raised otherwise. Closing the generator cancels the producer.
+        """
+        items = queue.Queue()
+        cancelled = threading.Event()
+
+        def produce():
+            try:
+                for item in fn(*args, **kwargs):
+                    if cancelled.is_set():
+                        return
+                    items.put(('item', item))
+                items.put(('done', None))
+            except Exception as e:
+                items.put(('error', e))
+
+        self.submit(produce)
+        started = time.monotonic()
+        deadline = started + (self.timeout if timeout is None else timeout)
+        first_deadline = deadline
+        if first_item_timeout is not None:
+            first_deadline = min(deadline, started + first_item_timeout)
+
+        def consume():
+            current_deadline = first_deadline
+            try:
+                while True:
+                    try:
+                        kind, item = items.get(timeout=max(current_deadline - time.monotonic(), 0))
+                    except queue.Empty:
+                        with self._lock:
+                            self.timeouts += 1
+                        raise TimeoutError()
+                    if kind == 'done':
+                        return
+                    if kind == 'error':
+                        raise item
+                    current_deadline = deadline
+                    yield item
+            finally:
+                cancelled.set()
+
+        return consume()
+
+    def stats(self):
+        with self._lock:
+            return {
+                'kind': 'process' if self.processes else 'thread',
+                'max_workers': self.max_workers,
+                'max_queue': self.max_queue,
+                'timeout_seconds': self.timeout,
+                'in_flight': self._in_flight,
+                'submitted': self.submitted,
+                'rejected': self.rejected,
+                'timeouts': self.timeouts,
+                'avg_latency_seconds': round(self._avg_latency, 3),
+            }
@@ -0,0 +1,125 @@
+"""
+In-process caches shared by the API.
+"""
+
+import hashlib
+import re
+import threading
+import time
+from collections import OrderedDict
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_message(message):
+    """Normalize a chat message for use in a cache key."""
+    return _WHITESPACE_RE.sub(' ', message.lower()).strip(' ?!.,')
+
+
+class TTLCache:
+    """Thread-safe LRU cache with a size bound, per-entry TTL and hit/miss counters."""
+
+    def __init__(self, max_size=1024, ttl=3600):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self):
+        return self.max_size > 0
+
+    def get(self, key):
+        """Return the cached value or None, refreshing its LRU position on a hit."""
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > time.monotonic():
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._data[key]
+            self.misses += 1
+            return None
+
+    def set(self, key, value):
+        """Store a value, evicting the least recently used entries if full."""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        """Drop every entry (counters are kept)."""
+        with self._lock:
+            self._data.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._data),
+                'max_size': self.max_size,
+                'ttl_seconds': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+class ResponseCache:
+    """Serialized response bodies with strong ETags, invalidated by namespace.
+
+    Each namespace has a version number that is part of every key, so
+    invalidate() makes all earlier entries unreachable at once. A payload
+    built while an invalidation happens is stored under the version read
+    before the query, so it is never served after the bump.
+    """
+
+    def __init__(self, max_size=256, ttl=300):
+        self._entries = TTLCache(max_size, ttl)
+        self._versions = {}
+        self._lock = threading.Lock()
+        self.invalidations = 0
+
+    def version(self, namespace):
+        with self._lock:
+            return self._versions.get(namespace, 0)
+
+    def get(self, namespace, version, key):
+        """Return (etag, body) or None."""
+        return self._entries.get((namespace, version, key))
+
+    def set(self, namespace, version, key, body):
+        """Store a serialized body and return (etag, body)."""
+        entry = (hashlib.sha1(body).hexdigest(), body)
+        self._entries.set((namespace, version, key), entry)
+        return entry
+
+    def invalidate(self, *namespaces):
+        with self._lock:
+            for namespace in namespaces:
+                self._versions[namespace] = self._versions.get(namespace, 0) + 1
+            self.invalidations += 1
+
+    def stats(self):
+        stats = self._entries.stats()
+        with self._lock:
+            stats['versions'] = dict(self._versions)
+            stats['invalidations'] = self.invalidations
+        return stats
@@ -0,0 +1,115 @@
+"""
+Circuit breaker for the upstream LLM.
+
+Tracks the outcome and latency of recent calls in a sliding time window.
+When too many of them fail or are too slow the breaker opens and callers
+serve their fallback straight away. After a cool-down it goes half-open and
+lets a few probe calls through; their outcome closes or re-opens it.
+"""
+
+import threading
+import time
+from collections import deque
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class CircuitBreaker:
+    """Sliding-window failure-rate and slow-call-rate circuit breaker."""
+
+    def __init__(self, window_seconds=60, min_calls=5, failure_rate=0.5,
+                 slow_call_seconds=10.0, open_seconds=30, half_open_probes=1):
+        self.window_seconds = window_seconds
+        self.min_calls = min_calls
+        self.failure_rate = failure_rate
+        self.slow_call_seconds = slow_call_seconds
+        self.open_seconds = open_seconds
+        self.half_open_probes = half_open_probes
+        self._lock = threading.Lock()
+        self._calls = deque()
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._probes = deque()
+        self.short_circuited = 0
+        self.trips = 0
+
+    def _trim(self, now):
+        while self._calls and now - self._calls[0][0] > self.window_seconds:
+            self._calls.popleft()
+
+    def _open(self, now):
+        self._state = OPEN
+        self._opened_at = now
+        self._probes.clear()
+        self.trips += 1
+
+    def _current_state(self, now):
+        if self._state == OPEN and now - self._opened_at >= self.open_seconds:
+            self._state = HALF_OPEN
+            self._probes.clear()
+        return self._state
+
+    def allow(self):
+        """Whether a call may go upstream now (counts a probe when half-open)."""
+        now = time.monotonic()
+        with self._lock:
+            state = self._current_state(now)
+            if state == CLOSED:
+                return True
+            if state == HALF_OPEN:
+                # Probes that never reported back expire after open_seconds
+                while self._probes and now - self._probes[0] > self.open_seconds:
+                    self._probes.popleft()
+                if len(self._probes) < self.half_open_probes:
+                    self._probes.append(now)
+                    return True
+            self.short_circuited += 1
+            return False
+
+    def record(self, success, latency):
+        """Record the outcome of an upstream call; slow calls count as failures."""
+        now = time.monotonic()
+        failed = not success or latency >= self.slow_call_seconds
+        with self._lock:
+            state = self._current_state(now)
+            if state == HALF_OPEN:
+                if self._probes:
+                    self._probes.popleft()
+                if failed:
+                    self._open(now)
+                else:
+                    self._state = CLOSED
+                    self._calls.clear()
+                return
+            if state == OPEN:
+                return
+
+            self._calls.append((now, failed, latency))
+            self._trim(now)
+            if len(self._calls) >= self.min_calls:
+                failures = sum(1 for _, f, _ in self._calls if f)
+                if failures / len(self._calls) >= self.failure_rate:
+                    self._open(now)
+
+    def stats(self):
+        now = time.monotonic()
+        with self._lock:
+            state = self._current_state(now)
+            self._trim(now)
+            calls = len(self._calls)
+            failures = sum(1 for _, f, _ in self._calls if f)
+            latencies = sorted(latency for _, _, latency in self._calls)
+            return {
+                'state': state,
+                'window_seconds': self.window_seconds,
+                'calls_in_window': calls,
+                'failures_in_window': failures,
+                'failure_rate': round(failures / calls, 4) if calls else 0.0,
+                'p50_latency_seconds': round(latencies[calls // 2], 3) if calls else None,
+                'max_latency_seconds': round(latencies[-1], 3) if calls else None,
+                'open_for_seconds': round(now - self._opened_at, 1) if state == OPEN else 0,
+                'trips': self.trips,
+                'short_circuited': self.short_circuited,
+            }
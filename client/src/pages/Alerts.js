@@ -350,11 +350,57 @@ const Alerts = () => {
   const [filteredAlerts, setFilteredAlerts] = useState([]);
   const [searchTerm, setSearchTerm] = useState('');
   const [selectedSeverity, setSelectedSeverity] = useState('');
+  const [forMe, setForMe] = useState(false);
   const [loading, setLoading] = useState(true);
 
   useEffect(() => {
     fetchAlerts();
-  }, []);
+  }, [forMe]);
+
+  useEffect(() => {
+    // Apply pushed changes instead of polling; EventSource resumes with Last-Event-ID
+    const source = new EventSource(`${axios.defaults.baseURL}/outbreak-alerts/stream`);
+
+    const upsertAlert = (event) => {
+      if (forMe) {
+        // Region matching happens on the server
+        fetchAlerts();
+        return;
+      }
+      const alert = JSON.parse(event.data);
+      setAlerts(previous => (
+        previous.some(item => item.id === alert.id)
+          ? previous.map(item => (item.id === alert.id ? alert : item))
+          : [alert, ...previous]
+      ));
+    };
+    const removeAlert = (event) => {
+      const { id } = JSON.parse(event.data);
+      setAlerts(previous => previous.filter(item => item.id !== id));
+    };
+
+    source.addEventListener('alert.created', upsertAlert);
+    source.addEventListener('alert.updated', upsertAlert);
+    source.addEventListener('alert.deactivated', removeAlert);
+    source.addEventListener('alert.deleted', removeAlert);
+    source.addEventListener('reset', () => fetchAlerts());
+
+    // The server refuses streams when a worker has too many open (503);
+    // EventSource then stops retrying, so refresh the list periodically instead
+    let pollTimer = null;
+    source.onerror = () => {
+      if (source.readyState === EventSource.CLOSED && !pollTimer) {
+        pollTimer = setInterval(fetchAlerts, 60000);
+      }
+    };
+
+    return () => {
+      source.close();
+      if (pollTimer) {
+        clearInterval(pollTimer);
+      }
+    };
+  }, [forMe]);
 
   useEffect(() => {
     filterAlerts();
@@ -362,10 +408,17 @@ const Alerts = () => {
 
   const fetchAlerts = async () => {
     try {
-      const response = await axios.get('/outbreak-alerts');
+      const response = await axios.get('/outbreak-alerts', {
+        params: forMe ? { for_me: 1 } : {}
+      });
       setAlerts(response.data.alerts);
     } catch (error) {
       console.error('Error fetching alerts:', error);
+      if (forMe && error.response?.data?.error) {
+        toast.error(error.response.data.error);
+        setForMe(false);
+        return;
+      }
       toast.error('Failed to load health alerts');
     } finally {
       setLoading(false);
@@ -495,6 +548,13 @@ const Alerts = () => {
                 </option>
               ))}
             </FilterSelect>
+            <FilterSelect
+              value={forMe ? 'mine' : 'all'}
+              onChange={(e) => setForMe(e.target.value === 'mine')}
+            >
+              <option value="all">All Locations</option>
+              <option value="mine">Near My Location</option>
+            </FilterSelect>
           </SearchContainer>
         </SearchSection>
 
@@ -91,6 +91,86 @@ const MessageRenderer = ({ text, isUser }) => {
   return <div>{processedLines}</div>;
 };
 
+// Stream failure carrying the HTTP status and whether the server had started answering
+const streamError = (message, status, started) => {
+  const error = new Error(message);
+  error.status = status;
+  error.started = started;
+  return error;
+};
+
+// Read /chat/stream Server-Sent Events, calling onText with the text so far
+const streamChat = async (message, language, onText) => {
+  if (!window.fetch || !window.TextDecoder) {
+    throw new Error('Streaming not supported');
+  }
+
+  const response = await fetch(`${axios.defaults.baseURL}/chat/stream`, {
+    method: 'POST',
+    headers: {
+      'Content-Type': 'application/json',
+      Accept: 'text/event-stream',
+      Authorization: axios.defaults.headers.common['Authorization'] || ''
+    },
+    body: JSON.stringify({ message, language })
+  });
+
+  if (!response.ok || !response.body) {
+    throw streamError(`Stream request failed with status ${response.status}`, response.status, false);
+  }
+
+  const reader = response.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = '';
+  let text = '';
+  let done = false;
+  // Set by the meta event: from then on the server saves the answer itself
+  let started = false;
+
+  while (!done) {
+    let chunk;
+    try {
+      chunk = await reader.read();
+    } catch (error) {
+      throw streamError(error.message, response.status, started);
+    }
+    const { value, done: readerDone } = chunk;
+    if (readerDone) break;
+    buffer += decoder.decode(value, { stream: true });
+
+    let boundary = buffer.indexOf('\n\n');
+    while (boundary !== -1) {
+      const rawEvent = buffer.slice(0, boundary);
+      buffer = buffer.slice(boundary + 2);
+      boundary = buffer.indexOf('\n\n');
+
+      let eventName = 'message';
+      let data = '';
+      rawEvent.split('\n').forEach(line => {
+        if (line.startsWith('event: ')) eventName = line.slice(7);
+        if (line.startsWith('data: ')) data += line.slice(6);
+      });
+      const payload = data ? JSON.parse(data) : {};
+
+      if (eventName === 'meta') {
+        started = true;
+      } else if (eventName === 'chunk') {
+        text += payload.text;
+        onText(text);
+      } else if (eventName === 'reset') {
+        text = '';
+      } else if (eventName === 'done') {
+        done = true;
+      }
+    }
+  }
+
+  if (!done) {
+    throw streamError('Stream ended unexpectedly', response.status, started);
+  }
+  return text;
+};
+
 const ChatContainer = styled.div`
   min-height: 100vh;
   background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
@@ -513,34 +593,55 @@ const Chat = () => {
     setInputMessage('');
     setIsLoading(true);
 
-    try {
-      const response = await axios.post('/chat', {
-        message: inputMessage,
-        language: selectedLanguage
-      });
+    const botMessageId = Date.now() + 1;
+    let shownText = '';
 
-      const botMessage = {
-        id: Date.now() + 1,
-        text: response.data.response,
-        isUser: false,
-        timestamp: new Date(),
-        language: selectedLanguage
-      };
+    const updateBotMessage = (text) => {
+      shownText = text;
+      setIsLoading(false);
+      setMessages(prev => {
+        if (!prev.some(msg => msg.id === botMessageId)) {
+          return [...prev, {
+            id: botMessageId,
+            text,
+            isUser: false,
+            timestamp: new Date(),
+            language: selectedLanguage
+          }];
+        }
+        return prev.map(msg => (msg.id === botMessageId ? { ...msg, text } : msg));
+      });
+    };
 
-      setMessages(prev => [...prev, botMessage]);
-    } catch (error) {
-      console.error('Error sending message:', error);
-      toast.error('Failed to send message. Please try again.');
-      
-      const errorMessage = {
-        id: Date.now() + 1,
-        text: 'Sorry, I encountered an error. Please try again.',
-        isUser: false,
-        timestamp: new Date(),
-        language: selectedLanguage
-      };
-
-      setMessages(prev => [...prev, errorMessage]);
+    try {
+      await streamChat(inputMessage, selectedLanguage, updateBotMessage);
+    } catch (streamFailure) {
+      console.error('Error streaming message:', streamFailure);
+
+      if (streamFailure.started || streamFailure.status === 429) {
+        // Resending would add load when the server is busy, and once the stream
+        // has started the server is already saving this answer
+        toast.error(streamFailure.status === 429
+          ? 'The server is busy. Please try again shortly.'
+          : 'The answer was interrupted. Please try again.');
+        if (!shownText) {
+          updateBotMessage('Sorry, I encountered an error. Please try again.');
+        }
+        return;
+      }
+
+      try {
+        // Fall back to the non-streaming endpoint
+        const response = await axios.post('/chat', {
+          message: inputMessage,
+          language: selectedLanguage
+        });
+        updateBotMessage(response.data.response);
+      } catch (error) {
+        console.error('Error sending message:', error);
+        toast.error('Failed to send message. Please try again.');
+        updateBotMessage('Sorry, I encountered an error. Please try again.');
+      }
     } finally {
       setIsLoading(false);
     }
@@ -555,15 +656,23 @@ const Chat = () => {
 
   const handleExportChat = async () => {
     try {
-      const response = await axios.get('/export-data');
-      const { excel_data, filename } = response.data;
-      
+      const response = await axios.get('/export-data', {
+        params: { format: 'xlsx' },
+        responseType: 'blob'
+      });
+
+      const disposition = response.headers['content-disposition'] || '';
+      const match = disposition.match(/filename="?([^";]+)"?/);
+      const filename = match ? match[1] : 'health_chat_history.xlsx';
+
+      const url = window.URL.createObjectURL(response.data);
       const link = document.createElement('a');
-      link.href = `data:application/vnd.openxmlformats-officedocument.spreadsheetml.sheet;base64,${excel_data}`;
+      link.href = url;
       link.download = filename;
       document.body.appendChild(link);
       link.click();
       document.body.removeChild(link);
+      window.URL.revokeObjectURL(url);
       
       toast.success('Chat history exported successfully!');
     } catch (error) {
@@ -405,16 +405,24 @@ const Dashboard = () => {
 
   const handleExportData = async () => {
     try {
-      const response = await axios.get('/export-data');
-      const { excel_data, filename } = response.data;
-      
+      const response = await axios.get('/export-data', {
+        params: { format: 'xlsx' },
+        responseType: 'blob'
+      });
+
+      const disposition = response.headers['content-disposition'] || '';
+      const match = disposition.match(/filename="?([^";]+)"?/);
+      const filename = match ? match[1] : 'health_chat_history.xlsx';
+
       // Create download link
+      const url = window.URL.createObjectURL(response.data);
       const link = document.createElement('a');
-      link.href = `data:application/vnd.openxmlformats-officedocument.spreadsheetml.sheet;base64,${excel_data}`;
+      link.href = url;
       link.download = filename;
       document.body.appendChild(link);
       link.click();
       document.body.removeChild(link);
+      window.URL.revokeObjectURL(url);
     } catch (error) {
       console.error('Error exporting data:', error);
     }
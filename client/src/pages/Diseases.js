@@ -289,25 +289,67 @@ const EmptyDescription = styled.p`
   opacity: 0.8;
 `;
 
+const LoadMoreButton = styled.button`
+  display: block;
+  margin: 2rem auto 0;
+  padding: 1rem 2rem;
+  border: none;
+  border-radius: 15px;
+  background: white;
+  color: #667eea;
+  font-size: 1rem;
+  font-weight: 600;
+  cursor: pointer;
+
+  &:disabled {
+    opacity: 0.6;
+    cursor: default;
+  }
+`;
+
+const SEARCH_PAGE_SIZE = 30;
+
 const Diseases = () => {
-  const [diseases, setDiseases] = useState([]);
   const [filteredDiseases, setFilteredDiseases] = useState([]);
+  const [categories, setCategories] = useState([]);
   const [searchTerm, setSearchTerm] = useState('');
   const [selectedCategory, setSelectedCategory] = useState('');
+  const [nextCursor, setNextCursor] = useState(null);
   const [loading, setLoading] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(false);
 
   useEffect(() => {
-    fetchDiseases();
+    fetchCategories();
   }, []);
 
   useEffect(() => {
-    filterDiseases();
-  }, [diseases, searchTerm, selectedCategory]);
+    // Debounce typing so each keystroke doesn't hit the server
+    const timer = setTimeout(() => searchDiseases(), 250);
+    return () => clearTimeout(timer);
+  }, [searchTerm, selectedCategory]);
 
-  const fetchDiseases = async () => {
+  const fetchCategories = async () => {
     try {
-      const response = await axios.get('/diseases');
-      setDiseases(response.data.diseases);
+      const response = await axios.get('/diseases', { params: { fields: 'category' } });
+      setCategories([...new Set(response.data.diseases.map(disease => disease.category))].filter(Boolean));
+    } catch (error) {
+      console.error('Error fetching categories:', error);
+    }
+  };
+
+  const searchDiseases = async (cursor = null) => {
+    try {
+      const response = await axios.get('/diseases/search', {
+        params: {
+          q: searchTerm || undefined,
+          category: selectedCategory || undefined,
+          limit: SEARCH_PAGE_SIZE,
+          cursor: cursor || undefined
+        }
+      });
+      const { diseases, next_cursor } = response.data;
+      setFilteredDiseases(previous => (cursor ? [...previous, ...diseases] : diseases));
+      setNextCursor(next_cursor);
     } catch (error) {
       console.error('Error fetching diseases:', error);
       toast.error('Failed to load diseases');
@@ -316,28 +358,12 @@ const Diseases = () => {
     }
   };
 
-  const filterDiseases = () => {
-    let filtered = diseases;
-
-    if (searchTerm) {
-      filtered = filtered.filter(disease =>
-        disease.name.toLowerCase().includes(searchTerm.toLowerCase()) ||
-        disease.symptoms.toLowerCase().includes(searchTerm.toLowerCase()) ||
-        disease.prevention.toLowerCase().includes(searchTerm.toLowerCase())
-      );
-    }
-
-    if (selectedCategory) {
-      filtered = filtered.filter(disease =>
-        disease.category === selectedCategory
-      );
-    }
-
-    setFilteredDiseases(filtered);
+  const loadMore = async () => {
+    setLoadingMore(true);
+    await searchDiseases(nextCursor);
+    setLoadingMore(false);
   };
 
-  const categories = [...new Set(diseases.map(disease => disease.category))];
-
   if (loading) {
     return (
       <DiseasesContainer>
@@ -483,6 +509,12 @@ const Diseases = () => {
             ))}
           </DiseasesGrid>
         )}
+
+        {nextCursor && (
+          <LoadMoreButton onClick={loadMore} disabled={loadingMore}>
+            {loadingMore ? 'Loading...' : 'Load more'}
+          </LoadMoreButton>
+        )}
       </Container>
     </DiseasesContainer>
   );
@@ -0,0 +1,122 @@
+"""
+Database engine configuration.
+
+    SQLite   - WAL journal so readers don't block behind writers,
+               synchronous=NORMAL (durable at checkpoints, safe with WAL),
+               a busy timeout instead of immediate "database is locked"
+               errors, and memory-mapped reads
+    others   - connection pool size, overflow, timeout, recycling and
+               pre-ping, so dropped server connections are replaced
+               instead of failing a request
+
+Reads can optionally go to a replica: with DATABASE_REPLICA_URL set, views
+wrapped in reads_from_replica send their queries to the 'replica' bind. Any
+flush (a write) still goes to the primary. Replicas lag, so only wrap views
+that can serve slightly stale data.
+"""
+
+import contextvars
+import functools
+
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+
+REPLICA_BIND = 'replica'
+
+_use_replica = contextvars.ContextVar('use_replica', default=False)
+
+
+def is_sqlite_memory(url):
+    return url.get_backend_name() == 'sqlite' and url.database in (None, '', ':memory:')
+
+
+def engine_options(url, config):
+    """create_engine() options for a database URL from the DB_* / SQLITE_* settings."""
+    url = make_url(url)
+    if is_sqlite_memory(url):
+        # Flask-SQLAlchemy uses a single static connection
+        return {}
+
+    options = {
+        'pool_size': config['DB_POOL_SIZE'],
+        'max_overflow': config['DB_MAX_OVERFLOW'],
+        'pool_timeout': config['DB_POOL_TIMEOUT'],
+    }
+    if url.get_backend_name() == 'sqlite':
+        # pysqlite's own lock wait, matching the busy_timeout pragma
+        options['connect_args'] = {'timeout': config['SQLITE_BUSY_TIMEOUT_MS'] / 1000}
+    else:
+        options['pool_pre_ping'] = config['DB_POOL_PRE_PING']
+        options['pool_recycle'] = config['DB_POOL_RECYCLE']
+    return options
+
+
+def apply_database_config(config):
+    """Set SQLALCHEMY_ENGINE_OPTIONS, and the replica bind if configured, on a Flask config."""
+    config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_options(config['SQLALCHEMY_DATABASE_URI'], config)
+    replica_url = config.get('DATABASE_REPLICA_URL')
+    if replica_url:
+        binds = dict(config.get('SQLALCHEMY_BINDS') or {})
+        binds[REPLICA_BIND] = dict(engine_options(replica_url, config), url=replica_url)
+        config['SQLALCHEMY_BINDS'] = binds
+
+
+def install_sqlite_pragmas(engine, config):
+    """Run the SQLITE_* pragmas on every new connection of a file-backed SQLite engine."""
+    if engine.dialect.name != 'sqlite' or is_sqlite_memory(engine.url):
+        return False
+    pragmas = [
+        f"journal_mode={config['SQLITE_JOURNAL_MODE']}",
+        f"synchronous={config['SQLITE_SYNCHRONOUS']}",
+        f"busy_timeout={int(config['SQLITE_BUSY_TIMEOUT_MS'])}",
+        f"mmap_size={int(config['SQLITE_MMAP_SIZE'])}",
+        f"cache_size={int(config['SQLITE_CACHE_SIZE'])}",
+        "temp_store=MEMORY",
+    ]
+
+    @event.listens_for(engine, 'connect')
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for pragma in pragmas:
+            cursor.execute(f'PRAGMA {pragma}')
+        cursor.close()
+
+    return True
+
+
+def reads_from_replica(view):
+    """Route the queries a view makes to the read replica, when one is configured."""
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        token = _use_replica.set(True)
+        try:
+            return view(*args, **kwargs)
+        finally:
+            _use_replica.reset(token)
+    return wrapper
+
+
+class ReplicaRoutingSession(Session):
+    """Flask-SQLAlchemy session that reads from the replica inside reads_from_replica views."""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and _use_replica.get() and not self._flushing:
+            replica = self._db.engines.get(REPLICA_BIND)
+            if replica is not None:
+                return replica
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+def database_stats(engines):
+    """Pool state of each engine, keyed by bind name."""
+    stats = {}
+    for bind, engine in engines.items():
+        pool = engine.pool
+        stats[bind or 'primary'] = {
+            'dialect': engine.dialect.name,
+            'pool': type(pool).__name__,
+            'checked_out': pool.checkedout() if hasattr(pool, 'checkedout') else None,
+            'size': pool.size() if hasattr(pool, 'size') else None,
+        }
+    return stats
@@ -0,0 +1,166 @@
+"""
+Chat history export writers.
+
+Rows are read from the database in chunks and written out incrementally, so
+memory use stays flat however long the history is. CSV and NDJSON are
+generated directly as a byte stream; xlsx is written with xlsxwriter's
+constant_memory mode to a temporary file that is then streamed and removed
+(the format is a zip archive, so it cannot be produced front to back).
+"""
+
+import csv
+import io
+import json
+import os
+import tempfile
+import time
+
+EXPORT_FORMATS = {
+    'xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+    'csv': 'text/csv; charset=utf-8',
+    'ndjson': 'application/x-ndjson',
+}
+
+HEADERS = ['Timestamp', 'Message', 'Response', 'Language']
+
+CHUNK_SIZE = 64 * 1024
+
+
+def _format_timestamp(value):
+    return value.strftime('%Y-%m-%d %H:%M:%S') if value else ''
+
+
+def generate_csv(rows):
+    """Yield CSV bytes for (timestamp, message, response, language) rows."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(HEADERS)
+    for timestamp, message, response, language in rows:
+        writer.writerow([_format_timestamp(timestamp), message, response, language])
+        if buffer.tell() >= CHUNK_SIZE:
+            yield buffer.getvalue().encode('utf-8')
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue().encode('utf-8')
+
+
+def generate_ndjson(rows):
+    """Yield one JSON object per line for (timestamp, message, response, language) rows."""
+    parts = []
+    size = 0
+    for timestamp, message, response, language in rows:
+        line = json.dumps({
+            'timestamp': timestamp.isoformat() if timestamp else None,
+            'message': message,
+            'response': response,
+            'language': language,
+        }, ensure_ascii=False) + '\n'
+        parts.append(line)
+        size += len(line)
+        if size >= CHUNK_SIZE:
+            yield ''.join(parts).encode('utf-8')
+            parts = []
+            size = 0
+    yield ''.join(parts).encode('utf-8')
+
+
+def write_xlsx(rows, path):
+    """Write rows to an xlsx file at path using constant memory."""
+    # Imported here: only xlsx exports need it
+    import xlsxwriter
+
+    workbook = xlsxwriter.Workbook(path, {'constant_memory': True})
+    worksheet = workbook.add_worksheet('Chat History')
+    for col, header in enumerate(HEADERS):
+        worksheet.write(0, col, header)
+    for row, (timestamp, message, response, language) in enumerate(rows, 1):
+        worksheet.write(row, 0, _format_timestamp(timestamp))
+        worksheet.write(row, 1, message)
+        worksheet.write(row, 2, response)
+        worksheet.write(row, 3, language)
+    workbook.close()
+
+
+def iter_file(path):
+    """Yield a file's contents in chunks."""
+    with open(path, 'rb') as f:
+        while True:
+            chunk = f.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            yield chunk
+
+
+def remove_file(path):
+    """Delete a file if it still exists."""
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def build_xlsx_tempfile(rows, tmp_dir=None):
+    """Write an xlsx export to a temporary file and return its path."""
+    fd, path = tempfile.mkstemp(suffix='.xlsx', dir=tmp_dir)
+    os.close(fd)
+    try:
+        write_xlsx(rows, path)
+    except Exception:
+        os.remove(path)
+        raise
+    return path
+
+
+def write_export_file(fmt, rows, path):
+    """Write an export to path atomically (via a temp file in the same directory)."""
+    directory = os.path.dirname(path)
+    fd, tmp_path = tempfile.mkstemp(suffix='.' + fmt, dir=directory)
+    os.close(fd)
+    try:
+        if fmt == 'xlsx':
+            write_xlsx(rows, tmp_path)
+        else:
+            generate = generate_csv if fmt == 'csv' else generate_ndjson
+            with open(tmp_path, 'wb') as f:
+                for chunk in generate(rows):
+                    f.write(chunk)
+        os.replace(tmp_path, path)
+    except Exception:
+        remove_file(tmp_path)
+        raise
+
+
+def artifact_path(directory, user_id, fmt, fingerprint):
+    """Path of a cached export; the fingerprint changes when new rows arrive."""
+    return os.path.join(directory, f"chat_{user_id}_{fmt}_{fingerprint}.{fmt}")
+
+
+def cleanup_artifacts(directory, max_age, max_bytes, keep=()):
+    """Remove export artifacts older than max_age seconds, then the least
+    recently used ones until the directory is under max_bytes.
+
+    Returns the number of files removed.
+    """
+    now = time.time()
+    entries = []
+    removed = 0
+    for entry in os.scandir(directory):
+        if not entry.is_file() or not entry.name.startswith('chat_'):
+            continue
+        stat = entry.stat()
+        if entry.path not in keep and now - stat.st_mtime > max_age:
+            remove_file(entry.path)
+            removed += 1
+        else:
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        if path in keep:
+            continue
+        remove_file(path)
+        total -= size
+        removed += 1
+    return removed
@@ -0,0 +1,243 @@
+"""
+LLM backends used by the chat endpoints.
+
+The backend is chosen with LLM_BACKEND:
+    gemini - Google Gemini (default)
+    stub   - deterministic offline backend with configurable latency and
+             token rate, for load tests without a network or API key
+    http   - JSON-over-HTTP backend, e.g. pointing at a local mock server
+
+Run `python llm_backends.py [port]` to start a mock server that answers like
+the stub backend, for use with LLM_BACKEND=http.
+"""
+
+import itertools
+import json
+import math
+import os
+import random
+import time
+import zlib
+
+
+class LLMBackend:
+    """Interface every backend implements."""
+
+    name = 'base'
+
+    def generate(self, prompt):
+        """Return the full answer text for a prompt."""
+        raise NotImplementedError
+
+    def stream(self, prompt):
+        """Yield the answer text in chunks (single chunk by default)."""
+        yield self.generate(prompt)
+
+
+class GeminiBackend(LLMBackend):
+    """Google Gemini through google.generativeai."""
+
+    name = 'gemini'
+
+    def __init__(self, api_key, model_name='gemini-1.5-flash', timeout=30):
+        import google.generativeai as genai
+
+        genai.configure(api_key=api_key)
+        self.model = genai.GenerativeModel(model_name)
+        # Without a request timeout a hung upstream call holds its pool worker forever
+        self.request_options = {'timeout': timeout} if timeout else None
+
+    def generate(self, prompt):
+        return self.model.generate_content(prompt, request_options=self.request_options).text
+
+    def stream(self, prompt):
+        for part in self.model.generate_content(prompt, stream=True, request_options=self.request_options):
+            try:
+                text = part.text
+            except ValueError:
+                # Chunk without text (blocked by a safety filter, or only metadata): skip it
+                continue
+            if text:
+                yield text
+
+
+class StubBackend(LLMBackend):
+    """Offline backend with deterministic answers and simulated timing.
+
+    Time to first token is drawn from a log-normal distribution around
+    latency_ms; the rest of the answer arrives at tokens_per_second. The
+    draw is seeded from the prompt, so identical prompts behave identically.
+    """
+
+    name = 'stub'
+
+    def __init__(self, latency_ms=800, latency_sigma=0.5, tokens_per_second=50,
+                 response_tokens=120, error_rate=0.0, seed=0):
+        self.latency_ms = latency_ms
+        self.latency_sigma = latency_sigma
+        self.tokens_per_second = tokens_per_second
+        self.response_tokens = response_tokens
+        self.error_rate = error_rate
+        self.seed = seed
+
+    def _plan(self, prompt):
+        rng = random.Random(zlib.crc32(prompt.encode('utf-8')) ^ self.seed)
+        first_token = self.latency_ms / 1000 * math.exp(rng.gauss(0, self.latency_sigma))
+        failed = rng.random() < self.error_rate
+        return rng, first_token, failed
+
+    def _tokens(self, prompt, rng):
+        question = prompt.rsplit('User message:', 1)[-1].strip()[:200]
+        words = [
+            "rest", "fluids", "hygiene", "clinic", "doctor", "symptoms", "prevention",
+            "nutrition", "water", "sleep", "vaccination", "monitor", "fever", "care",
+        ]
+        tokens = ["## 🏥 Health Assistant Response\n\n", f"**Your Question:** \"{question}\"\n\n",
+                  "### 📋 Key Points\n"]
+        while len(tokens) < self.response_tokens:
+            tokens.append(f"• {' '.join(rng.choice(words) for _ in range(6))}\n")
+        tokens.append("\n**Note:** Simulated response from the stub backend.")
+        return tokens
+
+    def _token_delay(self):
+        return 1.0 / self.tokens_per_second if self.tokens_per_second > 0 else 0.0
+
+    def generate(self, prompt):
+        rng, first_token, failed = self._plan(prompt)
+        tokens = self._tokens(prompt, rng)
+        time.sleep(first_token + len(tokens) * self._token_delay())
+        if failed:
+            raise RuntimeError("Stub backend simulated upstream error")
+        return ''.join(tokens)
+
+    def stream(self, prompt, tokens_per_chunk=8):
+        rng, first_token, failed = self._plan(prompt)
+        tokens = self._tokens(prompt, rng)
+        time.sleep(first_token)
+        if failed:
+            raise RuntimeError("Stub backend simulated upstream error")
+        for i in range(0, len(tokens), tokens_per_chunk):
+            chunk = tokens[i:i + tokens_per_chunk]
+            time.sleep(len(chunk) * self._token_delay())
+            yield ''.join(chunk)
+
+
+class HTTPBackend(LLMBackend):
+    """Backend speaking a minimal JSON protocol over HTTP.
+
+    POST {url} with {"prompt": ..., "stream": false} returns {"text": ...};
+    with "stream": true the server answers one JSON object per line.
+    """
+
+    name = 'http'
+
+    def __init__(self, url, timeout=30):
+        import requests
+
+        self.url = url
+        self.timeout = timeout
+        self.session = requests.Session()
+
+    def generate(self, prompt):
+        response = self.session.post(
+            self.url, json={'prompt': prompt, 'stream': False}, timeout=self.timeout
+        )
+        response.raise_for_status()
+        return response.json()['text']
+
+    def stream(self, prompt):
+        with self.session.post(
+            self.url, json={'prompt': prompt, 'stream': True}, timeout=self.timeout, stream=True
+        ) as response:
+            response.raise_for_status()
+            for line in response.iter_lines():
+                if line:
+                    text = json.loads(line).get('text')
+                    if text:
+                        yield text
+
+
+def create_llm_backend(config):
+    """Create the backend selected by config['LLM_BACKEND'], or None if it fails."""
+    backend = config.get('LLM_BACKEND', 'gemini')
+    try:
+        if backend == 'gemini':
+            llm = GeminiBackend(
+                api_key=config.get('GEMINI_API_KEY'),
+                model_name=config.get('GEMINI_MODEL', 'gemini-1.5-flash'),
+                timeout=config.get('LLM_TIMEOUT', 30)
+            )
+        elif backend == 'stub':
+            llm = StubBackend(
+                latency_ms=config.get('LLM_STUB_LATENCY_MS', 800),
+                latency_sigma=config.get('LLM_STUB_LATENCY_SIGMA', 0.5),
+                tokens_per_second=config.get('LLM_STUB_TOKENS_PER_SECOND', 50),
+                response_tokens=config.get('LLM_STUB_RESPONSE_TOKENS', 120),
+                error_rate=config.get('LLM_STUB_ERROR_RATE', 0.0),
+                seed=config.get('LLM_STUB_SEED', 0)
+            )
+        elif backend == 'http':
+            llm = HTTPBackend(config['LLM_HTTP_URL'], timeout=config.get('LLM_TIMEOUT', 30))
+        else:
+            raise ValueError(f"Unknown LLM_BACKEND '{backend}'")
+        print(f"✅ LLM backend '{llm.name}' configured successfully")
+        return llm
+    except Exception as e:
+        print(f"❌ Error configuring LLM backend '{backend}': {e}")
+        return None
+
+
+def run_mock_server(port=8085, backend=None):
+    """Serve the HTTPBackend protocol locally, answering with a stub backend."""
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    backend = backend or StubBackend()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))))
+            try:
+                if body.get('stream'):
+                    # Pull the first chunk before the headers so upstream errors can still be a 502
+                    chunks = backend.stream(body['prompt'])
+                    first = next(chunks, None)
+                    self.send_response(200)
+                    self.send_header('Content-Type', 'application/x-ndjson')
+                    self.send_header('Transfer-Encoding', 'chunked')
+                    self.end_headers()
+                    for text in itertools.chain([first] if first is not None else [], chunks):
+                        line = (json.dumps({'text': text}) + '\n').encode('utf-8')
+                        self.wfile.write(b'%x\r\n%s\r\n' % (len(line), line))
+                    self.wfile.write(b'0\r\n\r\n')
+                else:
+                    payload = json.dumps({'text': backend.generate(body['prompt'])}).encode('utf-8')
+                    self.send_response(200)
+                    self.send_header('Content-Type', 'application/json')
+                    self.send_header('Content-Length', str(len(payload)))
+                    self.end_headers()
+                    self.wfile.write(payload)
+            except RuntimeError as e:
+                payload = json.dumps({'error': str(e)}).encode('utf-8')
+                self.send_response(502)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', port), Handler)
+    print(f"🧪 Mock LLM server listening on http://127.0.0.1:{port}/")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    import sys
+
+    run_mock_server(int(sys.argv[1]) if len(sys.argv) > 1 else int(os.getenv('PORT', 8085)))
@@ -0,0 +1,49 @@
+"""
+Helpers for keyset (cursor) pagination and sparse field selection.
+"""
+
+import base64
+import json
+
+
+class InvalidQuery(ValueError):
+    """Raised for malformed pagination or field parameters (answer 400)."""
+
+
+def encode_cursor(values):
+    """Encode the sort key of the last row on a page as an opaque cursor."""
+    raw = json.dumps(values, separators=(',', ':'), default=str).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor):
+    """Decode a cursor produced by encode_cursor."""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+    except (ValueError, TypeError):
+        raise InvalidQuery('Invalid cursor')
+    if not isinstance(values, list):
+        raise InvalidQuery('Invalid cursor')
+    return values
+
+
+def parse_limit(value, default=50, maximum=200):
+    """Parse a page size query parameter, clamped to [1, maximum]."""
+    if value in (None, ''):
+        return default
+    try:
+        return max(1, min(int(value), maximum))
+    except ValueError:
+        raise InvalidQuery('limit must be an integer')
+
+
+def parse_fields(value, allowed, default=None):
+    """Parse a comma-separated field list, keeping the order of allowed."""
+    if not value:
+        return list(default or allowed)
+    requested = {f.strip() for f in value.split(',') if f.strip()}
+    unknown = requested - set(allowed)
+    if unknown:
+        raise InvalidQuery(f"Unknown fields: {', '.join(sorted(unknown))}")
+    return [f for f in allowed if f in requested]
@@ -0,0 +1,43 @@
+"""
+bcrypt password hashing, run off the request thread.
+
+These functions are executed in a process pool (see BoundedExecutor with
+processes=True), so they must stay module-level and import nothing from the
+Flask app. Hashes are standard "$2b$<cost>$..." strings, compatible with the
+ones Flask-Bcrypt produced before.
+"""
+
+import bcrypt
+
+# bcrypt only uses the first 72 bytes; older versions truncated silently
+MAX_PASSWORD_BYTES = 72
+
+
+def _encode(password):
+    return password.encode('utf-8')[:MAX_PASSWORD_BYTES]
+
+
+def hash_password(password, rounds=12):
+    """Return a new bcrypt hash of password with the given work factor."""
+    return bcrypt.hashpw(_encode(password), bcrypt.gensalt(rounds)).decode('utf-8')
+
+
+def check_password(password, password_hash):
+    """Whether password matches password_hash (False for malformed hashes)."""
+    try:
+        return bcrypt.checkpw(_encode(password), password_hash.encode('utf-8'))
+    except ValueError:
+        return False
+
+
+def hash_cost(password_hash):
+    """Work factor encoded in a bcrypt hash, or None if it can't be read."""
+    parts = (password_hash or '').split('$')
+    if len(parts) < 4 or not parts[2].isdigit():
+        return None
+    return int(parts[2])
+
+
+def needs_rehash(password_hash, rounds):
+    """Whether a stored hash was made with a different work factor."""
+    return hash_cost(password_hash) != rounds
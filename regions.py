@@ -0,0 +1,86 @@
+"""
+Location normalization for outbreak alert relevance.
+
+Free-text locations ("Mumbai", "Rural Maharashtra", "Pune, MH") are reduced
+to a region key - the lower-case state or union territory name - through an
+alias table seeded from REGION_ALIASES. Alerts store the key of their
+location and users are matched by the key of theirs.
+"""
+
+import re
+
+NATIONWIDE_REGION = 'india'
+
+# Region key -> names that resolve to it (the key itself always does)
+REGION_ALIASES = {
+    'andhra pradesh': ['visakhapatnam', 'vijayawada', 'guntur', 'tirupati', 'nellore', 'ap'],
+    'assam': ['guwahati', 'dibrugarh', 'silchar', 'jorhat'],
+    'bihar': ['patna', 'gaya', 'bhagalpur', 'muzaffarpur'],
+    'chhattisgarh': ['raipur', 'bhilai', 'bilaspur'],
+    'delhi': ['new delhi', 'ncr', 'nct of delhi'],
+    'goa': ['panaji', 'margao', 'vasco da gama'],
+    'gujarat': ['ahmedabad', 'surat', 'vadodara', 'rajkot', 'gandhinagar', 'gj'],
+    'haryana': ['gurugram', 'gurgaon', 'faridabad', 'panipat', 'ambala', 'hr'],
+    'himachal pradesh': ['shimla', 'manali', 'dharamshala', 'hp'],
+    'jammu and kashmir': ['srinagar', 'jammu', 'j&k'],
+    'jharkhand': ['ranchi', 'jamshedpur', 'dhanbad', 'bokaro'],
+    'karnataka': ['bengaluru', 'bangalore', 'mysuru', 'mysore', 'mangaluru', 'hubli', 'ka'],
+    'kerala': ['thiruvananthapuram', 'trivandrum', 'kochi', 'cochin', 'kozhikode', 'thrissur', 'kl'],
+    'madhya pradesh': ['bhopal', 'indore', 'gwalior', 'jabalpur', 'ujjain', 'mp'],
+    'maharashtra': ['mumbai', 'bombay', 'pune', 'nagpur', 'nashik', 'thane', 'aurangabad', 'mh'],
+    'odisha': ['bhubaneswar', 'cuttack', 'rourkela', 'puri', 'orissa'],
+    'punjab': ['ludhiana', 'amritsar', 'jalandhar', 'patiala', 'pb'],
+    'rajasthan': ['jaipur', 'jodhpur', 'udaipur', 'kota', 'ajmer', 'bikaner', 'rj'],
+    'tamil nadu': ['chennai', 'madras', 'coimbatore', 'madurai', 'tiruchirappalli', 'salem', 'tn'],
+    'telangana': ['hyderabad', 'warangal', 'secunderabad'],
+    'uttar pradesh': ['lucknow', 'kanpur', 'noida', 'agra', 'varanasi', 'prayagraj', 'ghaziabad', 'up'],
+    'uttarakhand': ['dehradun', 'haridwar', 'rishikesh', 'nainital'],
+    'west bengal': ['kolkata', 'calcutta', 'howrah', 'siliguri', 'durgapur', 'wb'],
+    NATIONWIDE_REGION: ['nationwide', 'all india', 'pan india', 'national'],
+}
+
+SEVERITY_LEVELS = ['low', 'medium', 'high', 'critical']
+
+_NON_WORD_RE = re.compile(r"[^\w&]+", re.UNICODE)
+
+
+def normalize_location(value):
+    """Lower-case a location and collapse punctuation and whitespace."""
+    return ' '.join(_NON_WORD_RE.sub(' ', (value or '').lower()).split())
+
+
+def alias_rows():
+    """(alias, region_key) pairs for seeding the alias table."""
+    rows = []
+    for region_key, aliases in REGION_ALIASES.items():
+        for alias in [region_key] + aliases:
+            rows.append((normalize_location(alias), region_key))
+    return rows
+
+
+def location_candidates(value):
+    """Aliases to try for a location, most specific first.
+
+    Each comma-separated part is tried whole, then as word bigrams and
+    single words, so "Rural Maharashtra" still resolves to maharashtra.
+    """
+    candidates = []
+    for part in (value or '').split(','):
+        words = normalize_location(part).split()
+        if not words:
+            continue
+        grams = [' '.join(words)]
+        grams += [' '.join(words[i:i + 2]) for i in range(len(words) - 1)]
+        grams += words
+        for gram in grams:
+            if gram not in candidates:
+                candidates.append(gram)
+    return candidates
+
+
+def severities_at_least(minimum):
+    """Severity names at or above minimum, or None if minimum is unknown."""
+    minimum = (minimum or '').strip().lower()
+    if minimum not in SEVERITY_LEVELS:
+        return None
+    return SEVERITY_LEVELS[SEVERITY_LEVELS.index(minimum):]
@@ -0,0 +1,110 @@
+"""
+Retrieval of disease catalog snippets for LLM prompts.
+
+Each disease is serialized once into a compact JSON snippet when the index is
+built. At request time only the top-k snippets relevant to the message are
+selected, within a character budget, so prompt size stays bounded no matter
+how large the catalog grows.
+"""
+
+import json
+import math
+
+import numpy as np
+
+from symptom_engine import extract_terms
+
+# Relative weight of a term depending on the field it came from
+FIELD_WEIGHTS = {
+    'name': 3.0,
+    'symptoms': 1.5,
+    'category': 1.0,
+    'prevention': 0.75,
+    'treatment': 0.5,
+}
+
+
+def _field_text(value):
+    if isinstance(value, (list, tuple)):
+        return ', '.join(str(v) for v in value)
+    return str(value or '')
+
+
+class DiseaseRetriever:
+    """Term index over the catalog returning pre-serialized prompt snippets."""
+
+    def __init__(self, catalog):
+        """Build snippets and postings from a {disease name: info dict} catalog."""
+        self.names = list(catalog.keys())
+        self.positions = {name: i for i, name in enumerate(self.names)}
+        self.snippets = [
+            json.dumps({name: catalog[name]}, separators=(',', ':'), ensure_ascii=False)
+            for name in self.names
+        ]
+
+        postings = {}
+        for doc_id, name in enumerate(self.names):
+            info = catalog[name]
+            doc_weights = {}
+            fields = dict(info, name=name)
+            for field, field_weight in FIELD_WEIGHTS.items():
+                for term in extract_terms(_field_text(fields.get(field))):
+                    doc_weights[term] = max(doc_weights.get(term, 0.0), field_weight)
+            for term, weight in doc_weights.items():
+                postings.setdefault(term, ([], []))
+                postings[term][0].append(doc_id)
+                postings[term][1].append(weight)
+
+        n_docs = max(len(self.names), 1)
+        self.postings = {}
+        for term, (doc_ids, weights) in postings.items():
+            idf = math.log(1.0 + n_docs / len(doc_ids))
+            self.postings[term] = (
+                np.asarray(doc_ids, dtype=np.int32),
+                np.asarray(weights, dtype=np.float64) * idf,
+            )
+
+    def __len__(self):
+        return len(self.names)
+
+    def search(self, text, top_k):
+        """Return catalog positions of the top_k diseases relevant to the text."""
+        hits = [self.postings[t] for t in extract_terms(text) if t in self.postings]
+        if not hits or top_k <= 0:
+            return []
+
+        doc_ids = np.concatenate([h[0] for h in hits])
+        weights = np.concatenate([h[1] for h in hits])
+        scores = np.bincount(doc_ids, weights=weights, minlength=len(self.names))
+
+        candidates = np.flatnonzero(scores)
+        if candidates.size > top_k:
+            candidates = candidates[np.argpartition(-scores[candidates], top_k - 1)[:top_k]]
+        return [int(i) for i in candidates[np.argsort(-scores[candidates], kind='stable')]]
+
+    def build_context(self, text, top_k, max_chars, priority_names=()):
+        """Join the relevant snippets into a compact JSON object within max_chars.
+
+        Diseases named in priority_names (e.g. symptom engine matches) come first.
+        """
+        selected = []
+        for name in priority_names:
+            position = self.positions.get(name)
+            if position is not None and position not in selected:
+                selected.append(position)
+        for position in self.search(text, top_k):
+            if len(selected) >= top_k:
+                break
+            if position not in selected:
+                selected.append(position)
+
+        parts = []
+        used = 2  # enclosing braces
+        for position in selected[:top_k]:
+            snippet = self.snippets[position][1:-1]
+            cost = len(snippet) + (1 if parts else 0)
+            if used + cost > max_chars:
+                break
+            parts.append(snippet)
+            used += cost
+        return '{' + ','.join(parts) + '}'
@@ -2,25 +2,47 @@
 """
 HealthBot Application Launcher
 This script initializes the database and starts the Flask application.
+
+    python run.py          development server (Werkzeug, single process)
+    python run.py serve    production server (gunicorn, preloaded, multi-worker)
+    python run.py seed diseases catalog.csv
+                           bulk-load a JSON, NDJSON or CSV catalog file
+
+The app is imported inside each command so `serve --worker-class gevent` can
+monkey-patch the standard library before anything else is loaded.
 """
 
+import argparse
 import os
+import signal
 import sys
-from app import app, db
 
-def create_tables():
-    """Create database tables if they don't exist."""
+from dotenv import load_dotenv
+
+load_dotenv()
+
+WORKER_CLASSES = ('gthread', 'gevent', 'sync')
+
+# Default ALERT_STREAM_MAX_SUBSCRIBERS per worker: an open stream holds a request
+# thread under gthread and sync, but only an idle greenlet under gevent
+ALERT_STREAMS_PER_WORKER = {'gthread': 16, 'sync': 16, 'gevent': 5000}
+
+def setup_database():
+    """Create database tables and seed the catalog, as `serve` does."""
+    from app import app, initialize_database
     try:
         with app.app_context():
-            db.create_all()
-            print("✅ Database tables created successfully!")
+            initialize_database()
+            print("✅ Database ready!")
     except Exception as e:
-        print(f"❌ Error creating database tables: {e}")
+        print(f"❌ Error setting up the database: {e}")
         sys.exit(1)
 
 def check_environment():
     """Check if required environment variables are set."""
-    required_vars = ['GEMINI_API_KEY', 'JWT_SECRET_KEY']
+    required_vars = ['JWT_SECRET_KEY']
+    if os.getenv('LLM_BACKEND', 'gemini') == 'gemini':
+        required_vars.insert(0, 'GEMINI_API_KEY')
     missing_vars = []
     
     for var in required_vars:
@@ -45,10 +67,11 @@ def main():
     # Check environment
     check_environment()
     
-    # Create database tables
-    create_tables()
+    # Create database tables and seed the catalog
+    setup_database()
     
     # Start the application
+    from app import app
     port = int(os.getenv('PORT', 5000))
     debug = os.getenv('FLASK_ENV') == 'development'
     
@@ -68,5 +91,170 @@ def main():
         print(f"❌ Error starting application: {e}")
         sys.exit(1)
 
+def blocking_slots(settings):
+    """Request threads one worker can have parked on long waits.
+
+    Synchronous chat requests wait on the LLM pool (running plus queued calls)
+    and every open alert stream holds its thread until it ends.
+    """
+    return (
+        settings['LLM_MAX_CONCURRENCY'] + settings['LLM_MAX_QUEUE']
+        + settings['ALERT_STREAM_MAX_SUBSCRIBERS']
+    )
+
+def server_options(args, settings):
+    """gunicorn settings sized from the CPU count, overridable by flags and env."""
+    cpus = os.cpu_count() or 1
+    worker_class = args.worker_class or os.getenv('GUNICORN_WORKER_CLASS', 'gthread')
+    if worker_class not in WORKER_CLASSES:
+        print(f"❌ Unknown worker class '{worker_class}' (use one of: {', '.join(WORKER_CLASSES)})")
+        sys.exit(1)
+    
+    if worker_class == 'sync':
+        default_workers = 2 * cpus + 1
+    else:
+        # Requests mostly wait on the LLM, so concurrency comes from threads/greenlets
+        default_workers = max(2, cpus)
+    workers = args.workers or int(os.getenv('WEB_CONCURRENCY', default_workers))
+    # Threads for short requests on top of the ones LLM waits and alert streams can hold
+    reserve = min(32, max(8, 4 * cpus))
+    threads = args.threads or int(os.getenv('GUNICORN_THREADS', blocking_slots(settings) + reserve))
+    if worker_class == 'gthread' and threads <= blocking_slots(settings):
+        print(f"⚠️ {threads} threads per worker: slow chats and alert streams can hold up to "
+              f"{blocking_slots(settings)} of them and starve other requests. Raise --threads or lower "
+              f"LLM_MAX_CONCURRENCY, LLM_MAX_QUEUE and ALERT_STREAM_MAX_SUBSCRIBERS.")
+    
+    options = {
+        'bind': args.bind or f"0.0.0.0:{os.getenv('PORT', 5000)}",
+        'workers': workers,
+        'worker_class': worker_class,
+        # Import the app (catalog, indexes, templates) once in the master; workers share it copy-on-write
+        'preload_app': True,
+        'timeout': int(os.getenv('GUNICORN_TIMEOUT', int(settings['LLM_TIMEOUT']) + 30)),
+        'graceful_timeout': int(os.getenv('GUNICORN_GRACEFUL_TIMEOUT', 30)),
+        'keepalive': int(os.getenv('GUNICORN_KEEPALIVE', 5)),
+        'max_requests': int(os.getenv('GUNICORN_MAX_REQUESTS', 2000)),
+        'max_requests_jitter': int(os.getenv('GUNICORN_MAX_REQUESTS_JITTER', 200)),
+        'accesslog': os.getenv('GUNICORN_ACCESS_LOG', '-'),
+        'errorlog': '-',
+    }
+    if worker_class == 'gthread':
+        options['threads'] = threads
+    elif worker_class == 'gevent':
+        # Mostly idle SSE subscribers and LLM waits; room for every open alert stream
+        # plus 1000 connections for everything else
+        options['worker_connections'] = int(os.getenv(
+            'GUNICORN_WORKER_CONNECTIONS', settings['ALERT_STREAM_MAX_SUBSCRIBERS'] + 1000
+        ))
+    return options
+
+def serve(args):
+    """Run the app under gunicorn with a preloaded, multi-worker setup."""
+    print("🏥 Starting HealthBot Application (production)...")
+    print("=" * 50)
+    check_environment()
+    
+    worker_class = args.worker_class or os.getenv('GUNICORN_WORKER_CLASS', 'gthread')
+    if worker_class == 'gevent':
+        try:
+            from gevent import monkey
+        except ImportError:
+            print("❌ The gevent worker class needs gevent: pip install -r requirements.txt")
+            sys.exit(1)
+        monkey.patch_all()
+    os.environ.setdefault('ALERT_STREAM_MAX_SUBSCRIBERS', str(ALERT_STREAMS_PER_WORKER.get(worker_class, 16)))
+    
+    from gunicorn.app.base import BaseApplication
+    import app as app_module
+    
+    flask_app = app_module.app
+    options = server_options(args, flask_app.config)
+    
+    with flask_app.app_context():
+        app_module.initialize_database()
+        app_module.refresh_catalog_indexes()
+        # Workers must open their own connections, not inherit the master's
+        app_module.db.engine.dispose()
+    
+    def post_worker_init(worker):
+        # gunicorn has no hook for a graceful SIGTERM, so wrap the worker's own
+        # handler: /readyz reports not ready while the worker drains
+        stop_worker = signal.getsignal(signal.SIGTERM)
+        
+        def handle_term(signum, frame):
+            app_module.begin_shutdown()
+            stop_worker(signum, frame)
+        
+        signal.signal(signal.SIGTERM, handle_term)
+    
+    def worker_exit(server, worker):
+        # Flush queued chat history before the worker process goes away
+        app_module.shutdown_background_work()
+    
+    class HealthBotServer(BaseApplication):
+        def load_config(self):
+            for key, value in options.items():
+                self.cfg.set(key, value)
+            self.cfg.set('post_worker_init', post_worker_init)
+            self.cfg.set('worker_exit', worker_exit)
+        
+        def load(self):
+            return flask_app
+    
+    print(f"🚀 Serving on {options['bind']} with {options['workers']} {options['worker_class']} worker(s)"
+          + (f" x {options['threads']} threads" if 'threads' in options else ''))
+    print("=" * 50)
+    HealthBotServer().run()
+
+def seed(args):
+    """Bulk-load a catalog file into the database."""
+    from app import app, initialize_database, seed_from_file
+    from seeding import SeedError
+    
+    print(f"🌱 Seeding {args.kind} from {args.file}...")
+    try:
+        with app.app_context():
+            initialize_database()
+            # Servers build their symptom index from the database when they start
+            report = seed_from_file(
+                args.kind, args.file, args.format,
+                batch_size=args.batch_size, refresh_indexes=False
+            )
+    except (OSError, SeedError) as e:
+        print(f"❌ Seeding failed: {e}")
+        sys.exit(1)
+    
+    for error in report.errors:
+        print(f"   ⚠️ {error}")
+    if report.rejected > len(report.errors):
+        print(f"   ... and {report.rejected - len(report.errors)} more rejected records")
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='HealthBot launcher')
+    commands = parser.add_subparsers(dest='command')
+    
+    commands.add_parser('dev', help='Werkzeug development server (default)')
+    
+    serve_parser = commands.add_parser('serve', help='production server (gunicorn)')
+    serve_parser.add_argument('--bind', help='address to listen on (default 0.0.0.0:$PORT)')
+    serve_parser.add_argument('--workers', type=int, help='worker processes (default from CPU count)')
+    serve_parser.add_argument('--threads', type=int, help='threads per gthread worker')
+    serve_parser.add_argument('--worker-class', choices=WORKER_CLASSES,
+                              help='gthread (default), gevent, or sync')
+    
+    seed_parser = commands.add_parser('seed', help='bulk-load diseases, vaccinations or alerts from a file')
+    seed_parser.add_argument('kind', choices=('diseases', 'vaccinations', 'alerts'))
+    seed_parser.add_argument('file', help='JSON array, NDJSON or CSV file')
+    seed_parser.add_argument('--format', choices=('json', 'ndjson', 'csv'),
+                             help='file format (default from the extension)')
+    seed_parser.add_argument('--batch-size', type=int, help='rows per insert transaction (default $SEED_BATCH_SIZE)')
+    return parser.parse_args(argv)
+
 if __name__ == '__main__':
-    main()
+    args = parse_args()
+    if args.command == 'serve':
+        serve(args)
+    elif args.command == 'seed':
+        seed(args)
+    else:
+        main()
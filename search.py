@@ -0,0 +1,186 @@
+"""
+Full-text search over the disease catalog.
+
+The engine is picked from the database dialect:
+    sqlite     - FTS5 external-content table kept in sync by triggers,
+                 ranked with bm25()
+    postgresql - generated, weighted tsvector column with a GIN index,
+                 ranked with ts_rank_cd()
+    anything else (or SQLite built without FTS5) - LIKE over the same
+                 columns, ranking name matches first
+
+Results are ordered by (score, id) with lower scores being better, which
+is what the keyset cursor encodes.
+"""
+
+import re
+import threading
+
+from sqlalchemy import text
+
+SEARCH_FIELDS = ('name', 'symptoms', 'prevention', 'treatment')
+
+_TERM_RE = re.compile(r"\w+", re.UNICODE)
+
+_SQLITE_SETUP = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS disease_fts USING fts5(
+        name, symptoms, prevention, treatment,
+        content='disease', content_rowid='id', tokenize='porter unicode61'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS disease_fts_insert AFTER INSERT ON disease BEGIN
+        INSERT INTO disease_fts(rowid, name, symptoms, prevention, treatment)
+        VALUES (new.id, new.name, new.symptoms, new.prevention, new.treatment);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS disease_fts_delete AFTER DELETE ON disease BEGIN
+        INSERT INTO disease_fts(disease_fts, rowid, name, symptoms, prevention, treatment)
+        VALUES ('delete', old.id, old.name, old.symptoms, old.prevention, old.treatment);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS disease_fts_update AFTER UPDATE ON disease BEGIN
+        INSERT INTO disease_fts(disease_fts, rowid, name, symptoms, prevention, treatment)
+        VALUES ('delete', old.id, old.name, old.symptoms, old.prevention, old.treatment);
+        INSERT INTO disease_fts(rowid, name, symptoms, prevention, treatment)
+        VALUES (new.id, new.name, new.symptoms, new.prevention, new.treatment);
+    END""",
+]
+
+_POSTGRES_SETUP = [
+    """ALTER TABLE disease ADD COLUMN IF NOT EXISTS search_vector tsvector
+        GENERATED ALWAYS AS (
+            setweight(to_tsvector('english', coalesce(name, '')), 'A') ||
+            setweight(to_tsvector('english', coalesce(symptoms, '')), 'B') ||
+            setweight(to_tsvector('english', coalesce(prevention, '')), 'C') ||
+            setweight(to_tsvector('english', coalesce(treatment, '')), 'D')
+        ) STORED""",
+    "CREATE INDEX IF NOT EXISTS ix_disease_search_vector ON disease USING GIN (search_vector)",
+]
+
+
+def search_terms(query):
+    """Split a user query into lower-case word terms."""
+    return _TERM_RE.findall(query.lower())
+
+
+def fts5_query(terms):
+    """Build an FTS5 MATCH expression: every term, each as a prefix."""
+    return ' '.join('"%s"*' % term.replace('"', '') for term in terms)
+
+
+class DiseaseSearch:
+    """Creates the search index (setup) and runs ranked, paginated queries.
+
+    setup() runs when the database is initialized. Queries never change the
+    schema, so they can run on a read replica: a process that didn't run
+    setup() picks the backend from the index structures that exist.
+    """
+
+    def __init__(self):
+        self.backend = None
+        self._lock = threading.Lock()
+
+    def setup(self, engine):
+        """Create the index structures if missing; returns the backend name."""
+        with self._lock:
+            dialect = engine.dialect.name
+            if dialect == 'sqlite':
+                self.backend = self._setup_sqlite(engine)
+            elif dialect == 'postgresql':
+                with engine.begin() as conn:
+                    for statement in _POSTGRES_SETUP:
+                        conn.execute(text(statement))
+                self.backend = 'postgresql'
+            else:
+                self.backend = 'like'
+            return self.backend
+
+    def detect(self, session):
+        """Pick the backend from the existing schema, without creating anything."""
+        dialect = session.get_bind().dialect.name
+        if dialect == 'sqlite':
+            found = session.execute(text(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'disease_fts'"
+            )).first()
+            self.backend = 'fts5' if found else 'like'
+        elif dialect == 'postgresql':
+            found = session.execute(text(
+                "SELECT 1 FROM information_schema.columns"
+                " WHERE table_name = 'disease' AND column_name = 'search_vector'"
+            )).first()
+            self.backend = 'postgresql' if found else 'like'
+        else:
+            self.backend = 'like'
+        return self.backend
+
+    def _setup_sqlite(self, engine):
+        try:
+            with engine.begin() as conn:
+                exists = conn.execute(text(
+                    "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'disease_fts'"
+                )).first()
+                for statement in _SQLITE_SETUP:
+                    conn.execute(text(statement))
+                if not exists:
+                    # Index rows that were inserted before the triggers existed
+                    conn.execute(text("INSERT INTO disease_fts(disease_fts) VALUES ('rebuild')"))
+            return 'fts5'
+        except Exception as e:
+            print(f"⚠️ SQLite FTS5 unavailable, disease search falls back to LIKE: {e}")
+            return 'like'
+
+    def search(self, session, query, fields, category=None, severity=None,
+               limit=20, after=None):
+        """Return up to limit + 1 rows of (score, row_id, *fields) for the query.
+
+        after is the (score, id) of the last row on the previous page.
+        """
+        if self.backend is None:
+            self.detect(session)
+
+        terms = search_terms(query or '')
+        params = {'limit': limit + 1}
+        where = []
+        columns = ', '.join(f'd.{field}' for field in fields)
+
+        if not terms:
+            score = '0.0'
+            source = 'disease d'
+        elif self.backend == 'fts5':
+            # Column weights: name, symptoms, prevention, treatment
+            score = 'bm25(disease_fts, 10.0, 5.0, 2.0, 1.0)'
+            source = 'disease_fts JOIN disease d ON d.id = disease_fts.rowid'
+            where.append('disease_fts MATCH :match')
+            params['match'] = fts5_query(terms)
+        elif self.backend == 'postgresql':
+            score = "-ts_rank_cd(d.search_vector, websearch_to_tsquery('english', :match))"
+            source = 'disease d'
+            where.append("d.search_vector @@ websearch_to_tsquery('english', :match)")
+            params['match'] = query
+        else:
+            # Lower is better: -1 when a term is in the name, 0 otherwise
+            name_hits = []
+            for i, term in enumerate(terms):
+                params[f'term{i}'] = f'%{term}%'
+                where.append('(' + ' OR '.join(
+                    f'lower(d.{field}) LIKE :term{i}' for field in SEARCH_FIELDS
+                ) + ')')
+                name_hits.append(f'lower(d.name) LIKE :term{i}')
+            score = f"CASE WHEN {' OR '.join(name_hits)} THEN -1.0 ELSE 0.0 END"
+            source = 'disease d'
+
+        if category:
+            where.append('lower(d.category) = :category')
+            params['category'] = category.lower()
+        if severity:
+            where.append('lower(d.severity) = :severity')
+            params['severity'] = severity.lower()
+
+        # Score in a subquery so the cursor can compare against it
+        inner = f"SELECT {score} AS score, d.id AS row_id, {columns} FROM {source}"
+        if where:
+            inner += ' WHERE ' + ' AND '.join(where)
+        sql = f"SELECT * FROM ({inner}) AS ranked"
+        if after is not None:
+            sql += ' WHERE score > :after_score OR (score = :after_score AND row_id > :after_id)'
+            params['after_score'], params['after_id'] = after
+        sql += ' ORDER BY score, row_id LIMIT :limit'
+
+        return session.execute(text(sql), params).all()
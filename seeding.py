@@ -0,0 +1,435 @@
+"""
+Bulk loading of catalog records from JSON, NDJSON and CSV files.
+
+Records are streamed one at a time (a JSON array is decoded incrementally,
+never read whole), validated against a SeedSpec derived from the table, and
+inserted with executemany in batches, one transaction per batch. At most one
+batch is held in memory, so memory use stays flat whatever the file size.
+
+Records whose natural key is already in the table - or earlier in the same
+file, since earlier batches are committed by then - are skipped, so loading
+a file twice does not duplicate rows.
+
+sync_records instead brings a table in line with a file inside the caller's
+transaction: rows are matched on their natural key and compared by a hash
+of their content, so only real differences are written.
+"""
+
+import csv
+import hashlib
+import io
+import json
+import os
+import re
+import time
+from datetime import date, datetime
+
+from sqlalchemy import bindparam, select, tuple_
+
+SEED_FORMATS = ('json', 'ndjson', 'csv')
+
+# File extension -> format
+FORMAT_EXTENSIONS = {'.json': 'json', '.ndjson': 'ndjson', '.jsonl': 'ndjson', '.csv': 'csv'}
+
+CHUNK_SIZE = 64 * 1024
+
+# Rejected records reported individually; the rest are only counted
+MAX_REPORTED_ERRORS = 20
+
+_LIST_SPLIT_RE = re.compile(r'\s*[,;|]\s*')
+
+_TRUE = {'true', 't', 'yes', 'y', '1'}
+_FALSE = {'false', 'f', 'no', 'n', '0'}
+
+
+class SeedError(ValueError):
+    """A file or record that cannot be loaded."""
+
+
+def detect_format(filename, fmt=None):
+    """Seed format from an explicit name or the file extension."""
+    fmt = (fmt or FORMAT_EXTENSIONS.get(os.path.splitext(filename or '')[1].lower(), '')).lower()
+    if fmt not in SEED_FORMATS:
+        raise SeedError(f"Unknown seed format for '{filename}' (use one of: {', '.join(SEED_FORMATS)})")
+    return fmt
+
+
+def iter_json_array(stream, chunk_size=CHUNK_SIZE):
+    """Yield the elements of a top-level JSON array, reading chunk_size characters at a time."""
+    decoder = json.JSONDecoder()
+    buffer = ''
+    pos = 0
+    eof = False
+    state = 'start'
+    while True:
+        while pos < len(buffer) and buffer[pos].isspace():
+            pos += 1
+        if pos == len(buffer):
+            if eof:
+                raise SeedError('Unexpected end of JSON file (expected a closing ])')
+            chunk = stream.read(chunk_size)
+            eof = not chunk
+            buffer, pos = buffer[pos:] + chunk, 0
+            continue
+
+        char = buffer[pos]
+        if state == 'start':
+            if char != '[':
+                raise SeedError('A JSON seed file must contain an array of records')
+            pos += 1
+            state = 'value'
+        elif state == 'separator':
+            if char == ']':
+                return
+            if char != ',':
+                raise SeedError(f"Expected ',' or ']' in JSON array, got {char!r}")
+            pos += 1
+            state = 'value'
+        elif char == ']':
+            return
+        else:
+            try:
+                value, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError as e:
+                if eof:
+                    raise SeedError(f'Invalid JSON: {e}')
+                value, end = None, None
+            if end is None or (end == len(buffer) and not eof):
+                # The value may continue in the next chunk
+                chunk = stream.read(chunk_size)
+                eof = not chunk
+                buffer, pos = buffer[pos:] + chunk, 0
+                continue
+            yield value
+            pos = end
+            state = 'separator'
+
+
+def iter_ndjson(stream):
+    """Yield one record per non-blank line."""
+    for line_number, line in enumerate(stream, 1):
+        if not line.strip():
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError as e:
+            raise SeedError(f'Invalid JSON on line {line_number}: {e}')
+
+
+def iter_csv(stream):
+    """Yield one dict per CSV row, keyed by the header row; empty cells are missing."""
+    for row in csv.DictReader(stream):
+        yield {key: value for key, value in row.items() if key and value not in (None, '')}
+
+
+def iter_records(stream, fmt):
+    """Yield raw records from a text stream in the given seed format."""
+    if fmt == 'json':
+        return iter_json_array(stream)
+    if fmt == 'ndjson':
+        return iter_ndjson(stream)
+    return iter_csv(stream)
+
+
+def iter_file_records(path, fmt=None):
+    """Yield raw records from a seed file, detecting the format from its extension."""
+    fmt = detect_format(path, fmt)
+    with open(path, encoding='utf-8-sig', newline='') as stream:
+        yield from iter_records(stream, fmt)
+
+
+def text_stream(binary):
+    """Wrap a binary file object (e.g. an upload) for iter_records."""
+    return io.TextIOWrapper(binary, encoding='utf-8-sig', newline='')
+
+
+class SeedSpec:
+    """How records map onto a table: fields, natural key and validation rules.
+
+    Fields, required fields, maximum lengths, value types and defaults are
+    read from the table's columns; lists names text columns that may be given
+    as a list (stored comma-separated) and choices restricts values
+    (compared case-insensitively).
+    """
+
+    def __init__(self, table, key, lists=(), exclude=(), choices=None):
+        self.table = table
+        self.key = tuple(key)
+        self.lists = set(lists)
+        self.choices = {field: {c.lower() for c in values} for field, values in (choices or {}).items()}
+        self.columns = [
+            column for column in table.columns
+            if not column.primary_key and column.name not in exclude
+        ]
+        self.fields = [column.name for column in self.columns]
+        self.required = {
+            column.name for column in self.columns
+            if not column.nullable and column.default is None
+        }
+        # Fields compared by sync_records; callable defaults (timestamps) differ on every load
+        self.compared = [
+            column.name for column in self.columns
+            if column.default is None or not column.default.is_callable
+        ]
+
+    def clean(self, record):
+        """Validate a raw record and return the row to insert; raises SeedError."""
+        if not isinstance(record, dict):
+            raise SeedError('record is not an object')
+        row = {}
+        for column in self.columns:
+            name = column.name
+            value = record.get(name)
+            if isinstance(value, str):
+                value = value.strip()
+            if value is None or value == '' or value == []:
+                if name in self.required:
+                    raise SeedError(f"'{name}' is required")
+                row[name] = self._default(column)
+                continue
+            row[name] = self._convert(column, value)
+        return row
+
+    def _default(self, column):
+        default = column.default
+        if default is None:
+            return None
+        if default.is_callable:
+            return default.arg(None)
+        return default.arg
+
+    def _convert(self, column, value):
+        name = column.name
+        python_type = column.type.python_type
+        if name in self.lists:
+            items = value if isinstance(value, list) else _LIST_SPLIT_RE.split(str(value))
+            value = ', '.join(str(item).strip() for item in items if str(item).strip())
+        elif python_type is bool:
+            if not isinstance(value, bool):
+                text = str(value).lower()
+                if text not in _TRUE | _FALSE:
+                    raise SeedError(f"'{name}' must be true or false")
+                value = text in _TRUE
+        elif python_type is datetime:
+            if not isinstance(value, datetime):
+                try:
+                    value = datetime.fromisoformat(str(value))
+                except ValueError:
+                    raise SeedError(f"'{name}' must be an ISO date or datetime")
+        elif python_type is date:
+            try:
+                value = date.fromisoformat(str(value))
+            except ValueError:
+                raise SeedError(f"'{name}' must be an ISO date")
+        elif python_type is int:
+            try:
+                value = int(value)
+            except (TypeError, ValueError):
+                raise SeedError(f"'{name}' must be an integer")
+        else:
+            value = str(value)
+
+        if name in self.choices and str(value).lower() not in self.choices[name]:
+            raise SeedError(f"'{name}' must be one of: {', '.join(sorted(self.choices[name]))}")
+        length = getattr(column.type, 'length', None)
+        if length and isinstance(value, str) and len(value) > length:
+            raise SeedError(f"'{name}' is longer than {length} characters")
+        return value
+
+    def row_key(self, row):
+        return tuple(row[field] for field in self.key)
+
+    def content_hash(self, row):
+        """Stable hash of the compared fields of a row."""
+        values = json.dumps([row[field] for field in self.compared], default=str, ensure_ascii=False)
+        return hashlib.sha1(values.encode('utf-8')).hexdigest()
+
+    def existing_keys(self, connection, keys):
+        """Which of keys are already in the table."""
+        key_columns = [self.table.c[field] for field in self.key]
+        # One IN per column lets the database seek the natural-key index; the
+        # tuple IN on its own is answered with a scan (SQLite)
+        conditions = [
+            column.in_(list({key[i] for key in keys})) for i, column in enumerate(key_columns)
+        ]
+        if len(key_columns) > 1:
+            conditions.append(tuple_(*key_columns).in_(keys))
+        return {tuple(row) for row in connection.execute(select(*key_columns).where(*conditions))}
+
+
+class SeedReport:
+    """Counters for one load."""
+
+    def __init__(self, kind):
+        self.kind = kind
+        self.read = 0
+        self.inserted = 0
+        self.skipped = 0
+        self.rejected = 0
+        self.updated = 0
+        self.deleted = 0
+        self.unchanged = 0
+        self.updated_ids = []
+        self.deleted_ids = []
+        self.batches = 0
+        self.errors = []
+        self.started = time.monotonic()
+        self.seconds = 0.0
+
+    def reject(self, record_number, error):
+        self.rejected += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append(f'record {record_number}: {error}')
+
+    @property
+    def changed(self):
+        return self.inserted + self.updated + self.deleted
+
+    @property
+    def rows_per_second(self):
+        elapsed = self.seconds or (time.monotonic() - self.started)
+        return self.read / elapsed if elapsed > 0 else 0.0
+
+    def as_dict(self):
+        return {
+            'kind': self.kind,
+            'read': self.read,
+            'inserted': self.inserted,
+            'updated': self.updated,
+            'deleted': self.deleted,
+            'unchanged': self.unchanged,
+            'skipped': self.skipped,
+            'rejected': self.rejected,
+            'batches': self.batches,
+            'seconds': round(self.seconds, 3),
+            'rows_per_second': round(self.rows_per_second, 1),
+            'errors': self.errors,
+        }
+
+
+def load_records(engine, spec, records, kind=None, batch_size=1000,
+                 prepare_batch=None, progress=None):
+    """Validate and bulk-insert records in batches; returns a SeedReport.
+
+    prepare_batch(connection, rows) may fill computed columns before each
+    insert; progress(report) is called after every committed batch.
+    """
+    report = SeedReport(kind or spec.table.name)
+    batch = {}
+
+    def flush():
+        with engine.begin() as connection:
+            existing = spec.existing_keys(connection, list(batch))
+            rows = [row for key, row in batch.items() if key not in existing]
+            report.skipped += len(batch) - len(rows)
+            if rows:
+                if prepare_batch:
+                    prepare_batch(connection, rows)
+                connection.execute(spec.table.insert(), rows)
+        report.inserted += len(rows)
+        report.batches += 1
+        batch.clear()
+        if progress:
+            progress(report)
+
+    for record_number, record in enumerate(records, 1):
+        report.read += 1
+        try:
+            row = spec.clean(record)
+        except SeedError as e:
+            report.reject(record_number, e)
+            continue
+        key = spec.row_key(row)
+        if key in batch:
+            report.skipped += 1
+            continue
+        batch[key] = row
+        if len(batch) >= batch_size:
+            flush()
+    if batch:
+        flush()
+
+    report.seconds = time.monotonic() - report.started
+    return report
+
+
+def sync_records(connection, spec, records, kind=None, batch_size=1000,
+                 update=True, delete=True, prepare_batch=None):
+    """Make the table match records within the caller's transaction; returns a SeedReport.
+
+    Records are matched to rows by natural key. New keys are inserted, rows
+    whose content hash differs are updated in place (keeping their id) when
+    update is set, and rows missing from records are deleted when delete is
+    set. Unchanged rows are not written. Only one key -> (id, hash) entry per
+    existing row is kept in memory, not the rows themselves.
+    """
+    report = SeedReport(kind or spec.table.name)
+    table = spec.table
+    id_column = table.primary_key.columns[0]
+
+    existing = {}
+    for row in connection.execute(select(id_column, *(table.c[f] for f in spec.fields))):
+        values = row._mapping
+        existing[spec.row_key(values)] = (values[id_column.name], spec.content_hash(values))
+
+    seen = set()
+    inserts, updates = [], []
+    update_statement = table.update().where(id_column == bindparam('_id')).values(
+        {field: bindparam(field) for field in spec.compared}
+    )
+
+    def flush_inserts():
+        if prepare_batch:
+            prepare_batch(connection, inserts)
+        connection.execute(table.insert(), inserts)
+        report.batches += 1
+        inserts.clear()
+
+    def flush_updates():
+        connection.execute(update_statement, updates)
+        report.batches += 1
+        updates.clear()
+
+    for record_number, record in enumerate(records, 1):
+        report.read += 1
+        try:
+            row = spec.clean(record)
+        except SeedError as e:
+            report.reject(record_number, e)
+            continue
+        key = spec.row_key(row)
+        if key in seen:
+            report.skipped += 1
+            continue
+        seen.add(key)
+
+        if key not in existing:
+            # Inserted before any delete, so new ids stay above the current maximum
+            inserts.append(row)
+            report.inserted += 1
+            if len(inserts) >= batch_size:
+                flush_inserts()
+            continue
+        row_id, row_hash = existing[key]
+        if not update or spec.content_hash(row) == row_hash:
+            report.unchanged += 1
+            continue
+        updates.append(dict({field: row[field] for field in spec.compared}, _id=row_id))
+        report.updated += 1
+        report.updated_ids.append(row_id)
+        if len(updates) >= batch_size:
+            flush_updates()
+    if inserts:
+        flush_inserts()
+    if updates:
+        flush_updates()
+
+    if delete:
+        report.deleted_ids = [row_id for key, (row_id, _) in existing.items() if key not in seen]
+        for i in range(0, len(report.deleted_ids), batch_size):
+            connection.execute(table.delete().where(id_column.in_(report.deleted_ids[i:i + batch_size])))
+            report.batches += 1
+        report.deleted = len(report.deleted_ids)
+
+    report.seconds = time.monotonic() - report.started
+    return report
@@ -0,0 +1,54 @@
+"""
+Column-only serialization for API responses.
+
+Endpoints select just the columns they return (SQLAlchemy Row tuples, no
+ORM identity-map bookkeeping), zip them with the field names and encode the
+result in one call. orjson is used when installed; otherwise the standard
+library encoder produces the same JSON, with datetimes as ISO 8601 strings.
+"""
+
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+JSON_MIMETYPE = 'application/json'
+
+DISEASE_FIELDS = ('id', 'name', 'symptoms', 'prevention', 'treatment', 'severity', 'category')
+VACCINATION_FIELDS = ('id', 'age_group', 'vaccine_name', 'description', 'is_mandatory')
+ALERT_FIELDS = ('id', 'disease_name', 'location', 'severity', 'description', 'alert_date')
+PROFILE_FIELDS = (
+    'id', 'username', 'email', 'full_name', 'phone', 'age', 'gender',
+    'location', 'preferred_language', 'created_at',
+)
+LOGIN_USER_FIELDS = ('id', 'username', 'email', 'full_name', 'preferred_language')
+
+
+def _default(value):
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(payload):
+    """Encode a payload as compact UTF-8 JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload, separators=(',', ':'), ensure_ascii=False, default=_default).encode('utf-8')
+
+
+def columns(model, fields):
+    """Model columns for the given field names, in order."""
+    return [getattr(model, field) for field in fields]
+
+
+def rows_to_dicts(fields, rows):
+    """Turn column-only result rows into dicts keyed by field name."""
+    fields = tuple(fields)
+    return [dict(zip(fields, row)) for row in rows]
+
+
+def encoder_name():
+    return 'orjson' if orjson is not None else 'json'
@@ -0,0 +1,172 @@
+"""
+Local symptom-matching engine.
+
+Builds an inverted index (symptom term -> diseases) over the disease catalog
+and ranks candidate diseases with a vectorized, IDF-weighted overlap score.
+Used by /api/symptom-check and by chat() so common symptom questions can be
+answered without an LLM round-trip.
+"""
+
+import math
+import re
+
+import numpy as np
+
+TOKEN_RE = re.compile(r"[a-z]+")
+
+STOPWORDS = frozenset("""
+a an and are as at be been but by can do does feel feeling for from get got had has have having
+he her his i im in is it its me my of on or our she since so some than that the their them there
+these they this to too very was we were what when which with you your also am bit lot much
+""".split())
+
+
+def _stem(word):
+    """Very small suffix stripper so 'headaches'/'headache' and 'coughing'/'cough' meet."""
+    if len(word) > 5 and word.endswith('ing'):
+        return word[:-3]
+    if len(word) > 3 and word.endswith('s') and not word.endswith('ss'):
+        return word[:-1]
+    return word
+
+
+def tokenize(text):
+    """Lowercase, split and stem text, dropping stopwords (order is preserved)."""
+    return [_stem(w) for w in TOKEN_RE.findall(text.lower()) if w not in STOPWORDS]
+
+
+def extract_terms(text):
+    """Return the unigram and adjacent-bigram terms of a piece of text."""
+    tokens = tokenize(text)
+    terms = set(tokens)
+    terms.update(f"{a} {b}" for a, b in zip(tokens, tokens[1:]))
+    return terms
+
+
+def _split_list(value):
+    if isinstance(value, (list, tuple)):
+        return [str(v).strip() for v in value if str(v).strip()]
+    return [v.strip() for v in (value or '').split(',') if v.strip()]
+
+
+def normalize_symptom(name):
+    """Canonical form of a symptom name, as stored in the Symptom table."""
+    return ' '.join(name.lower().split())
+
+
+def symptom_names(value):
+    """Distinct normalized symptom names from a list or comma-joined string."""
+    names = []
+    for phrase in _split_list(value):
+        name = normalize_symptom(phrase)
+        if name not in names:
+            names.append(name)
+    return names
+
+
+class SymptomIndex:
+    """Inverted index over disease symptoms with NumPy-based scoring."""
+
+    BIGRAM_BOOST = 1.5
+
+    def __init__(self, catalog):
+        """Build the index from a {disease name: info dict} catalog."""
+        self.names = list(catalog.keys())
+        self.info = [catalog[name] for name in self.names]
+        self.phrases = []
+        self.vocab = {}
+
+        doc_terms = []
+        postings = {}
+        for doc_id, info in enumerate(self.info):
+            phrases = []
+            terms = set()
+            for phrase in _split_list(info.get('symptoms')):
+                phrase_tokens = tokenize(phrase)
+                if not phrase_tokens:
+                    continue
+                phrase_terms = extract_terms(phrase)
+                phrases.append((phrase, frozenset(phrase_tokens), frozenset(phrase_terms)))
+                terms.update(phrase_terms)
+            self.phrases.append(phrases)
+            doc_terms.append(terms)
+            for term in terms:
+                postings.setdefault(term, []).append(doc_id)
+
+        n_docs = max(len(self.names), 1)
+        self.vocab = {term: i for i, term in enumerate(sorted(postings))}
+        self.postings = [np.asarray(postings[term], dtype=np.int32) for term in sorted(postings)]
+        self.weights = np.empty(len(self.vocab), dtype=np.float64)
+        for term, term_id in self.vocab.items():
+            idf = math.log(1.0 + n_docs / len(self.postings[term_id]))
+            self.weights[term_id] = idf * (self.BIGRAM_BOOST if ' ' in term else 1.0)
+
+        # Per-disease vector norms for cosine normalisation
+        self.doc_norms = np.zeros(len(self.names), dtype=np.float64)
+        for doc_id, terms in enumerate(doc_terms):
+            ids = [self.vocab[t] for t in terms]
+            self.doc_norms[doc_id] = math.sqrt(float(np.square(self.weights[ids]).sum())) if ids else 1.0
+
+    def __len__(self):
+        return len(self.names)
+
+    def match_terms(self, text):
+        """Return the indexed term ids present in the text."""
+        return [self.vocab[t] for t in extract_terms(text) if t in self.vocab]
+
+    def rank(self, text, top_k=5, min_score=0.0):
+        """Rank diseases against free text or a list of symptoms."""
+        if isinstance(text, (list, tuple)):
+            text = ', '.join(str(t) for t in text)
+
+        term_ids = self.match_terms(text)
+        if not term_ids:
+            return []
+
+        weights = self.weights[term_ids]
+        doc_ids = np.concatenate([self.postings[t] for t in term_ids])
+        doc_weights = np.repeat(np.square(weights), [len(self.postings[t]) for t in term_ids])
+        overlap = np.bincount(doc_ids, weights=doc_weights, minlength=len(self.names))
+        scores = overlap / (self.doc_norms * math.sqrt(float(np.square(weights).sum())))
+
+        candidates = np.flatnonzero(scores > min_score)
+        if candidates.size == 0:
+            return []
+        top_k = min(top_k, candidates.size)
+        order = candidates[np.argsort(-scores[candidates], kind='stable')][:top_k]
+
+        query_tokens = set(tokenize(text))
+        query_terms = extract_terms(text)
+        results = []
+        for doc_id in order:
+            info = self.info[doc_id]
+            matched = [
+                phrase for phrase, tokens, terms in self.phrases[doc_id]
+                if tokens <= query_tokens or any(' ' in t and t in query_terms for t in terms)
+            ]
+            results.append({
+                'disease': self.names[doc_id],
+                'score': round(float(scores[doc_id]), 4),
+                'matched_symptoms': matched,
+                'severity': info.get('severity'),
+                'category': info.get('category'),
+                'prevention': _split_list(info.get('prevention')),
+                'treatment': info.get('treatment'),
+            })
+        return results
+
+
+def build_catalog(disease_data, disease_rows=()):
+    """Merge the built-in disease_data dict with rows from the Disease table."""
+    catalog = {name: dict(info) for name, info in disease_data.items()}
+    for row in disease_rows:
+        if row.name in catalog:
+            continue
+        catalog[row.name] = {
+            'symptoms': _split_list(row.symptoms),
+            'prevention': _split_list(row.prevention),
+            'treatment': row.treatment,
+            'severity': row.severity,
+            'category': row.category,
+        }
+    return catalog
@@ -25,7 +25,7 @@ def test_required_packages():
     required_packages = [
         'flask', 'flask_cors', 'flask_sqlalchemy', 'flask_migrate',
         'flask_jwt_extended', 'flask_bcrypt', 'google.generativeai',
-        'pandas', 'openpyxl', 'python_dotenv', 'requests', 'nltk',
+        'openpyxl', 'xlsxwriter', 'python_dotenv', 'requests', 'nltk',
         'scikit_learn', 'numpy', 'gunicorn'
     ]
     
@@ -0,0 +1,140 @@
+"""
+Write-behind queue for ChatHistory rows.
+
+Chat responses no longer wait on their own database commit: rows are queued
+in memory and a background thread group-commits them in batches, flushing
+when a batch fills up or the flush interval passes. The queue is bounded;
+when it is full, put() returns False and the caller writes synchronously,
+so rows are never dropped. Pending rows are flushed at interpreter shutdown.
+"""
+
+import atexit
+import os
+import threading
+import time
+from collections import deque
+
+
+class WriteBehindQueue:
+    """Bounded in-memory queue flushed in batches by a background thread."""
+
+    def __init__(self, flush_fn, batch_size=100, flush_interval=0.5,
+                 max_pending=10000, max_attempts=3):
+        self.flush_fn = flush_fn
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.max_attempts = max_attempts
+        self._pending = deque()
+        self._cond = threading.Condition()
+        self._flush_lock = threading.Lock()
+        self._thread = None
+        self._pid = None
+        self._stopping = False
+        self.enqueued = 0
+        self.written = 0
+        self.failed = 0
+        self.rejected = 0
+        self.batches = 0
+        self.last_flush_ms = 0.0
+        self.max_flush_ms = 0.0
+        self.last_error = None
+        atexit.register(self.stop)
+
+    def _ensure_thread(self):
+        # Started lazily and per process so forked workers get their own flusher
+        if self._thread is None or self._pid != os.getpid() or not self._thread.is_alive():
+            self._pid = os.getpid()
+            self._stopping = False
+            self._thread = threading.Thread(
+                target=self._run, name='chat-write-behind', daemon=True
+            )
+            self._thread.start()
+
+    def put(self, row):
+        """Queue a row; returns False when the queue is full."""
+        with self._cond:
+            if len(self._pending) >= self.max_pending:
+                self.rejected += 1
+                return False
+            self._ensure_thread()
+            self._pending.append((time.monotonic(), row, 0))
+            self.enqueued += 1
+            if len(self._pending) >= self.batch_size:
+                self._cond.notify()
+            return True
+
+    def _run(self):
+        while True:
+            with self._cond:
+                if not self._pending and not self._stopping:
+                    self._cond.wait(self.flush_interval)
+                elif len(self._pending) < self.batch_size and not self._stopping:
+                    oldest = self._pending[0][0]
+                    remaining = self.flush_interval - (time.monotonic() - oldest)
+                    if remaining > 0:
+                        self._cond.wait(remaining)
+                if self._stopping and not self._pending:
+                    return
+            if self.flush(max_batches=1) == 0 and self._pending:
+                # The batch failed and was requeued; back off before retrying
+                time.sleep(self.flush_interval)
+
+    def flush(self, max_batches=None):
+        """Write queued rows now, one batch per transaction."""
+        batches = 0
+        with self._flush_lock:
+            while max_batches is None or batches < max_batches:
+                with self._cond:
+                    if not self._pending:
+                        break
+                    count = min(self.batch_size, len(self._pending))
+                    batch = [self._pending.popleft() for _ in range(count)]
+
+                start = time.perf_counter()
+                try:
+                    self.flush_fn([row for _, row, _ in batch])
+                except Exception as e:
+                    self.last_error = str(e)
+                    print(f"❌ Chat history batch write failed: {e}")
+                    retry = [(ts, row, attempts + 1) for ts, row, attempts in batch
+                             if attempts + 1 < self.max_attempts]
+                    self.failed += len(batch) - len(retry)
+                    with self._cond:
+                        self._pending.extendleft(reversed(retry))
+                    break
+                elapsed_ms = (time.perf_counter() - start) * 1000
+                self.written += len(batch)
+                self.batches += 1
+                self.last_flush_ms = elapsed_ms
+                self.max_flush_ms = max(self.max_flush_ms, elapsed_ms)
+                batches += 1
+        return batches
+
+    def stop(self):
+        """Flush everything still pending and stop the background thread."""
+        with self._cond:
+            self._stopping = True
+            self._cond.notify()
+        if self._thread is not None and self._pid == os.getpid():
+            self._thread.join(timeout=10)
+        self.flush()
+
+    def stats(self):
+        with self._cond:
+            oldest = self._pending[0][0] if self._pending else None
+            return {
+                'pending': len(self._pending),
+                'max_pending': self.max_pending,
+                'batch_size': self.batch_size,
+                'flush_interval_seconds': self.flush_interval,
+                'enqueued': self.enqueued,
+                'written': self.written,
+                'failed': self.failed,
+                'rejected_to_sync': self.rejected,
+                'batches': self.batches,
+                'last_flush_ms': round(self.last_flush_ms, 3),
+                'max_flush_ms': round(self.max_flush_ms, 3),
+                'oldest_pending_age_seconds': round(time.monotonic() - oldest, 3) if oldest else 0.0,
+                'last_error': self.last_error,
+            }